@@ -1,5 +1,4 @@
 import logging
-import json
 
 from pydantic import Field
 
@@ -8,13 +7,18 @@ from nat.builder.function_info import FunctionInfo
 from nat.cli.register_workflow import register_function
 from nat.data_models.function import FunctionBaseConfig
 
+from wof_shared import codec
+from wof_shared.profiling import ProfilingConfig, profiled_from
+from ai_player.pipeline import append_history, end_turn, passthrough_updates
+
 logger = logging.getLogger(__name__)
 
 
-def choose_vowel_heuristic(masked: str, remaining):
+def choose_vowel_heuristic(masked: str, remaining, theme=None):
     """
     Pattern-aware vowel chooser used when buying a vowel.
-    - Uses English frequency priors.
+    - Uses English frequency priors, or the precomputed per-theme letter
+      frequencies when `theme` is given (see wof_shared.theme_stats).
     - Adds bonuses for simple masked-puzzle patterns.
     - Restricts to remaining (unguessed) vowels.
     Returns best uppercase vowel or None.
@@ -29,6 +33,17 @@ def choose_vowel_heuristic(masked: str, remaining):
 
     # Frequency priors (rough English/puzzle heuristic)
     priors = {"E": 12.0, "A": 9.0, "O": 8.0, "I": 7.0, "U": 3.0}
+    theme_endings = []
+    if theme:
+        try:
+            from wof_shared.theme_stats import letter_frequencies, common_endings
+            freqs = letter_frequencies(theme)
+            if freqs:
+                # Same scale as the English priors (percent of letters)
+                priors = {v: freqs.get(v, 0.0) * 100.0 for v in priors}
+                theme_endings = common_endings(theme)
+        except Exception:
+            pass
 
     # Initialize scores from priors, but only for remaining vowels
     scores = {v.upper(): priors.get(v.upper(), 0.0) for v in remaining}
@@ -73,6 +88,17 @@ def choose_vowel_heuristic(masked: str, remaining):
     except Exception:
         pass
 
+    # 5) Theme word endings: a masked word tail that fits a common ending (e.g. '_R' ~ 'ER')
+    try:
+        tails = [w.replace(" ", "") for w in norm.split("*")]
+        for ending in theme_endings:
+            for v in [c for c in ending if c in scores]:
+                pattern = "".join("_" if c == v else c for c in ending)
+                if any(t.endswith(pattern) for t in tails):
+                    scores[v] += 1.0
+    except Exception:
+        pass
+
     # Deterministic tie-breaker using common preference order
     pref = ["E", "A", "O", "I", "U"]
     pref = [v for v in pref if v in scores]
@@ -89,7 +115,7 @@ def choose_vowel_heuristic(masked: str, remaining):
     return best_vowel
 
 
-class BuyVowelIfEnoughMoneyConfig(FunctionBaseConfig, name="buy_vowel_if_enough_money"):
+class BuyVowelIfEnoughMoneyConfig(FunctionBaseConfig, ProfilingConfig, name="buy_vowel_if_enough_money"):
     vowel_strategy: str = Field(
         default="heuristic",
         description="Strategy to choose vowel: 'heuristic' (default) or 'random'",
@@ -98,6 +124,14 @@ class BuyVowelIfEnoughMoneyConfig(FunctionBaseConfig, name="buy_vowel_if_enough_
         default=False,
         description="If true, when multiple vowels tie at top score, pick randomly among them.",
     )
+    history_limit: int = Field(
+        default=0,
+        description="Max step summaries carried in 'history' between tools; 0 omits history.",
+    )
+    theme_priors: bool = Field(
+        default=False,
+        description="If true, the heuristic uses precomputed per-theme letter frequencies instead of English priors.",
+    )
 
 @register_function(config_type=BuyVowelIfEnoughMoneyConfig)
 async def buy_vowel_if_enough_money(
@@ -106,17 +140,11 @@ async def buy_vowel_if_enough_money(
     # Implement your function logic here
     async def _buy_vowel_if_enough_money(solve_output: str) -> str:
         # Accept a single text input, parse JSON if present, and check funds from Redis
-        from wof_shared.state import (
-            get_unguessed_vowels,
-            get_field,
-            add_guessed_letter,
-            reveal_letter,
-            update_score,
-            get_player_score,
-        )
+        from wof_shared.turn_state import TurnState
 
+        player_name = None
         try:
-            data = json.loads(solve_output) if solve_output else {}
+            data = codec.loads(solve_output) if solve_output else {}
             player_name = data.get("player")
         except Exception:
             data = {}
@@ -124,7 +152,8 @@ async def buy_vowel_if_enough_money(
         # Respect next_action from solve step
         next_action = (data.get("next_action") or "").strip().lower() if isinstance(data, dict) else None
 
-        # Sequential skip: if the solve step already succeeded (or asked to skip next), no-op
+        # Sequential skip: if the solve step already succeeded (or asked to skip next), no-op.
+        # Skipped steps only echo the upstream snapshot; no Redis or LLM work.
         try:
             if bool(data.get("skip_next")) or (data.get("action") == "solve" and bool(data.get("success"))):
                 skipped_output = {
@@ -134,22 +163,13 @@ async def buy_vowel_if_enough_money(
                     "details": "Skipped because puzzle solution was attempted.",
                     "player": player_name,
                     "next_action": next_action or "",
-                    "updates": {
-                        "player": player_name,
-                        "puzzle": get_field("puzzle"),
-                        "scores": get_field("scores"),
-                    },
+                    "updates": passthrough_updates(data, player_name),
+                    "state": data.get("state"),
                     # Propagate skip so spin is also skipped
                     "skip_next": True,
                 }
-                # History aggregation
-                try:
-                    hist = data.get("history") or []
-                    hist.append({k: v for k, v in skipped_output.items() if k != "history"})
-                    skipped_output["history"] = hist
-                except Exception:
-                    pass
-                return json.dumps(skipped_output)
+                append_history(data, skipped_output, config.history_limit)
+                return codec.dumps(skipped_output)
             # If the agent chose to spin, skip buying a vowel but let spin proceed (skip_next False)
             if next_action == "spin":
                 skipped_output = {
@@ -159,25 +179,20 @@ async def buy_vowel_if_enough_money(
                     "details": "Skipped because agent chose to spin.",
                     "player": player_name,
                     "next_action": next_action,
-                    "updates": {
-                        "player": player_name,
-                        "puzzle": get_field("puzzle"),
-                        "scores": get_field("scores"),
-                    },
+                    "updates": passthrough_updates(data, player_name),
+                    "state": data.get("state"),
                     # Do not skip next so spin can run
                     "skip_next": False,
                 }
-                return json.dumps(skipped_output)
+                return codec.dumps(skipped_output)
         except Exception:
             pass
 
-        current_money = get_player_score(player_name)
+        # Snapshot carried from the solve step (no Redis reads)
+        turn = TurnState.from_input(data)
+        current_money = turn.score(player_name)
         cost = 250
-        remaining_vowels = []
-        try:
-            remaining_vowels = get_unguessed_vowels()
-        except Exception as e:
-            logger.warning("Failed to load remaining vowels: %s", e)
+        remaining_vowels = turn.remaining_vowels()
 
         if current_money < cost:
             output = {
@@ -189,36 +204,20 @@ async def buy_vowel_if_enough_money(
                 "next_action": next_action or "buy_vowel",
                 "updates": {
                     "player": player_name,
-                    "puzzle": get_field("puzzle"),
+                    "puzzle": turn.get("puzzle"),
                     "remaining_vowels": remaining_vowels,
                 },
+                "state": turn.payload(),
             }
-            # History aggregation
-            try:
-                hist = data.get("history") or []
-                hist.append({k: v for k, v in output.items() if k != "history"})
-                output["history"] = hist
-            except Exception:
-                pass
-            # History aggregation
-            try:
-                hist = data.get("history") or []
-                hist.append({k: v for k, v in output.items() if k != "history"})
-                output["history"] = hist
-            except Exception:
-                pass
-            return json.dumps(output)
+            append_history(data, output, config.history_limit)
+            return codec.dumps(output)
 
         # Load current masked puzzle
         try:
             masked_puzzle = data.get("puzzle") if isinstance(data, dict) else None
         except Exception:
             masked_puzzle = None
-        if not masked_puzzle:
-            try:
-                masked_puzzle = get_field("puzzle")
-            except Exception:
-                masked_puzzle = None
+        masked_puzzle = masked_puzzle or turn.get("puzzle")
 
         # Choose a vowel to buy according to configured strategy
         remaining_upper = [v.upper() for v in (remaining_vowels or [])]
@@ -227,7 +226,11 @@ async def buy_vowel_if_enough_money(
             chosen_vowel = _random.choice(remaining_upper) if remaining_upper else None
         else:
             # Heuristic strategy (default)
-            chosen_vowel = choose_vowel_heuristic(masked_puzzle or "", remaining_upper)
+            theme = None
+            if config.theme_priors:
+                theme = data.get("theme") if isinstance(data, dict) else None
+                theme = theme or turn.get("theme")
+            chosen_vowel = choose_vowel_heuristic(masked_puzzle or "", remaining_upper, theme=theme)
 
         # Compose details
         details = (
@@ -240,23 +243,16 @@ async def buy_vowel_if_enough_money(
         if chosen_vowel is not None:
             try:
                 # Deduct cost (Wheel rules: vowels cost money and typically do not add winnings)
-                update_score(player_name, -cost)
-                # Reveal vowel occurrences and record guess
-                occurrences = reveal_letter(chosen_vowel)
-                add_guessed_letter(chosen_vowel, is_vowel=True)
+                turn.add_score(player_name, -cost)
+                # Reveal vowel occurrences and record guess, then write all three in one transaction
+                occurrences = turn.reveal(chosen_vowel)
+                turn.add_guess(chosen_vowel, is_vowel=True)
+                turn.log("buy_vowel", player_name, letter=chosen_vowel, occurrences=occurrences, cost=cost, end_turn=occurrences == 0)
+                turn.commit()
             except Exception as e:
                 logger.warning("Failed to apply vowel purchase updates: %s", e)
 
-        # Attempt to provide updated snapshots for puzzle and scores
-        try:
-            import json as _json
-            scores_snapshot = get_field("scores")
-            try:
-                scores_snapshot = _json.loads(scores_snapshot) if scores_snapshot else {}
-            except Exception:
-                pass
-        except Exception:
-            scores_snapshot = None
+        scores_snapshot = codec.scores_of(turn.get("scores")) or {}
 
         # Compose final answer to copy verbatim
         if chosen_vowel is not None:
@@ -277,25 +273,23 @@ async def buy_vowel_if_enough_money(
                 "occurrences": occurrences,
                 "remaining_vowels": remaining_vowels,
                 "money": current_money - cost if chosen_vowel is not None else current_money,
-                "puzzle": get_field("puzzle"),
+                "puzzle": turn.get("puzzle"),
                 "scores": scores_snapshot,
             },
+            "state": turn.payload(),
             # If the purchase succeeded, skip spinning
             "skip_next": bool(chosen_vowel is not None),
             "final_answer": fa,
         }
-        # History aggregation
-        try:
-            hist = data.get("history") or []
-            hist.append({k: v for k, v in buy_vowel_output.items() if k != "history"})
-            buy_vowel_output["history"] = hist
-        except Exception:
-            pass
-        return json.dumps(buy_vowel_output)
+        append_history(data, buy_vowel_output, config.history_limit)
+        # A completed purchase ends the turn: exit before spin runs
+        if buy_vowel_output["skip_next"]:
+            return end_turn(buy_vowel_output)
+        return codec.dumps(buy_vowel_output)
 
     try:
         yield FunctionInfo.from_fn(
-            _buy_vowel_if_enough_money,
+            profiled_from(config, _buy_vowel_if_enough_money, "buy_vowel_if_enough_money"),
             description=(
                 "If the player has enough money, propose and buy a vowel; returns structured JSON with choice, occurrences, and updated state. "
                 "Outputs include 'success', 'skipped', and 'skip_next' to support sequential execution."
@@ -0,0 +1,148 @@
+"""Local stand-in LLM for load tests and offline runs (`_type: fake_llm`).
+
+Registered as a NAT LLM provider with a LangChain client, so a config only
+swaps the `llms:` entry (see ai_player/configs/load_test.yml) and every tool
+runs unchanged. Replies arrive after a sampled latency (lognormal around
+`latency_ms`) and are either canned (`replies`, cycled) or strategy-driven:
+
+- solve prompts: solve when exactly one corpus answer fits the board and at
+  least `solve_revealed` of its letters are showing, else buy a vowel when
+  affordable, else spin
+- consonant prompts: the allowed consonant revealing the most cells across the
+  fitting corpus answers (preference order when numpy is unavailable)
+
+Both verbose and compact prompt variants are understood; replies follow the
+format the prompt asked for.
+"""
+import asyncio
+import logging
+import random
+import re
+from typing import Any, List, Optional
+
+from pydantic import Field
+
+from nat.builder.builder import Builder
+from nat.builder.framework_enum import LLMFrameworkEnum
+from nat.builder.llm import LLMProviderInfo
+from nat.cli.register_workflow import register_llm_client, register_llm_provider
+from nat.data_models.llm import LLMBaseConfig
+
+from ai_player import prompts
+
+logger = logging.getLogger(__name__)
+
+
+class FakeLLMConfig(LLMBaseConfig, name="fake_llm"):
+    latency_ms: float = Field(default=50.0, description="Median reply latency in milliseconds.")
+    latency_sigma: float = Field(default=0.5, description="Lognormal sigma of the latency; 0 makes it constant.")
+    replies: List[str] = Field(default_factory=list, description="Canned replies, cycled; empty uses the built-in strategy.")
+    solve_revealed: float = Field(
+        default=0.6,
+        description="Strategy replies solve only once this share of letter cells is revealed (keeps games realistic).",
+    )
+    corpus_path: Optional[str] = Field(default=None, description="Puzzle CSV for strategy replies (defaults to the bundled corpus).")
+    seed: Optional[int] = Field(default=None, description="Seed for latency sampling.")
+
+
+def _field(text: str, name: str) -> Optional[str]:
+    match = re.search(rf"^{name}:[ \t]?(.*)$", text, re.M)
+    return match.group(1) if match else None
+
+
+def board_from_prompt(text: str) -> Optional[str]:
+    """Recover the state mask ("_ E _ * _") from either prompt variant."""
+    compact = _field(text, "Board")
+    if compact is not None:
+        return " ".join("*" if ch == "/" else ch for ch in compact.strip())
+    verbose = _field(text, "Masked Puzzle")
+    if verbose is None:
+        return None
+    # Verbose prompts show word breaks as three spaces (the '*' became a space)
+    return " * ".join(" ".join(word.split()) for word in verbose.strip().split("   "))
+
+
+class FakeChatModel:
+    """Minimal async chat model: `ainvoke` / `abatch` like a LangChain client."""
+
+    def __init__(self, config: FakeLLMConfig):
+        self.config = config
+        self.calls = 0
+        self._rng = random.Random(config.seed)
+
+    def _latency(self) -> float:
+        base = max(0.0, self.config.latency_ms) / 1000.0
+        if self.config.latency_sigma <= 0:
+            return base
+        return base * self._rng.lognormvariate(0.0, self.config.latency_sigma)
+
+    def _index(self):
+        try:
+            from wof_shared.candidates import load_candidate_index
+            return load_candidate_index(self.config.corpus_path)
+        except ImportError:
+            return None
+
+    def reply(self, prompt: Any) -> str:
+        text = prompts.prompt_text(prompt)
+        if self.config.replies:
+            return self.config.replies[(self.calls - 1) % len(self.config.replies)]
+        compact = _field(text, "Board") is not None
+        masked = board_from_prompt(text) or ""
+        allowed = _field(text, "Allowed")
+        if allowed is None:
+            listed = _field(text, "Remaining Consonants (valid choices only)")
+            allowed = "".join((listed or "").replace("|", " ").split()) if listed is not None else None
+
+        guessed = [ch for ch in masked.split() if len(ch) == 1 and ch.isalpha()]
+        if allowed is not None:
+            letter = self._pick_consonant(masked, guessed, list(allowed))
+            return f'{{"letter":"{letter}"}}' if compact else f"Letter: {letter}"
+
+        cells = [ch for ch in masked.split() if ch == "_" or ch.isalpha()]
+        shown = sum(ch != "_" for ch in cells) / (len(cells) or 1)
+        guessed += list((_field(text, "Guessed") or "").replace("-", ""))
+        answer = self._single_candidate(masked, guessed) if shown >= self.config.solve_revealed else None
+        if answer:
+            return f'{{"action":"solve","answer":"{answer}"}}' if compact else f"Solution: {answer}"
+        if _field(text, "Vowel") == "yes" or "have enough money to buy a vowel" in text:
+            return '{"action":"vowel"}' if compact else "I would like to buy a vowel"
+        return '{"action":"spin"}' if compact else "I would like to spin"
+
+    def _pick_consonant(self, masked: str, guessed, allowed: List[str]) -> str:
+        index = self._index()
+        if index is not None:
+            best = index.best_letter(masked, guessed, allowed)
+            if best:
+                return best
+        from ai_player.spin import preferred_consonant
+        return preferred_consonant(allowed) or "T"
+
+    def _single_candidate(self, masked: str, guessed) -> Optional[str]:
+        index = self._index()
+        if index is None:
+            return None
+        group, rows = index.candidates(masked, guessed)
+        if group is None or rows.size != 1:
+            return None
+        return group["answers"][rows[0]]
+
+    async def ainvoke(self, prompt: Any, *args, **kwargs):
+        from langchain_core.messages import AIMessage
+
+        self.calls += 1
+        await asyncio.sleep(self._latency())
+        return AIMessage(content=self.reply(prompt))
+
+    async def abatch(self, inputs: List[Any], *args, return_exceptions: bool = False, **kwargs):
+        return await asyncio.gather(*(self.ainvoke(p) for p in inputs), return_exceptions=return_exceptions)
+
+
+@register_llm_provider(config_type=FakeLLMConfig)
+async def fake_llm(config: FakeLLMConfig, _builder: Builder):
+    yield LLMProviderInfo(config=config, description="Local fake LLM with simulated latency (load tests).")
+
+
+@register_llm_client(config_type=FakeLLMConfig, wrapper_type=LLMFrameworkEnum.LANGCHAIN)
+async def fake_llm_langchain(config: FakeLLMConfig, _builder: Builder):
+    yield FakeChatModel(config)
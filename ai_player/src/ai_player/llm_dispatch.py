@@ -0,0 +1,281 @@
+"""Process-wide dispatch layer for the AI tools' LLM calls.
+
+With many games in one worker, every turn used to call `llm.ainvoke` on its
+own. All calls now go through one dispatcher that:
+
+- coalesces identical in-flight prompts (same LLM, same text) into one call
+  whose reply is shared by every waiter;
+- optionally batches distinct prompts arriving within a short window into one
+  `llm.abatch` call (LangChain chat models support it);
+- caps concurrent provider calls with a global semaphore;
+- bounds each call by an optional latency budget (callers fall back to their
+  local strategy on `asyncio.TimeoutError`) and can hedge: once a call runs
+  past the observed p95 latency a second identical request is sent and the
+  first reply wins;
+- keeps counters, latency percentiles and queue depths for monitoring (`stats()`).
+
+Configured from the environment, like the Redis pool:
+    LLM_MAX_CONCURRENCY   concurrent provider calls (default 8)
+    LLM_BATCH_WINDOW_MS   batching window; 0 disables batching (default 0)
+    LLM_MAX_BATCH         prompts per abatch call (default 16)
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from wof_shared import metrics
+
+# Latency samples kept for the hedging percentile; hedging waits for this many first
+MIN_HEDGE_SAMPLES = 20
+
+
+class LLMCallConfig(BaseModel):
+    """LLM call settings shared by the tools that prompt the model (solve, spin)."""
+
+    prompt_mode: str = Field(
+        default="verbose",
+        description="LLM prompt variant: 'verbose' (full rules every call) or 'compact' (cached system message, short mask, guessed letters, JSON reply).",
+    )
+    llm_timeout_s: float = Field(
+        default=15.0,
+        description="Latency budget for the tool's LLM call; past it the turn continues with the local strategy (solve: spin, spin: consonant preference order). 0 disables.",
+    )
+    llm_hedge: bool = Field(
+        default=False,
+        description="Send a second identical LLM request once the first runs past the observed p95 latency.",
+    )
+
+
+class LLMDispatcher:
+    def __init__(self, max_concurrency: int = 8, batch_window_ms: float = 0.0, max_batch: int = 16):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.batch_window = max(0.0, float(batch_window_ms)) / 1000.0
+        self.max_batch = max(1, int(max_batch))
+        self.counters = {
+            "requests": 0,
+            "calls": 0,
+            "coalesced": 0,
+            "batches": 0,
+            "batched_prompts": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "fallbacks": 0,
+        }
+        self._latencies = deque(maxlen=500)
+        self._loop = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Entries are keyed by id(llm) (models need not be hashable) and hold the
+        # LLM itself, so its id cannot be reused by another model while they live
+        self._inflight: Dict[Tuple[int, str], Tuple[Any, asyncio.Future]] = {}
+        self._pending: Dict[int, Tuple[Any, List[Tuple[str, asyncio.Future]]]] = {}
+        self._waiting = 0
+        self._active = 0
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        # Futures and the semaphore belong to one event loop; start fresh on a new one
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._reset()
+        return loop
+
+    async def invoke(self, llm: Any, prompt: Any, timeout: Optional[float] = None, hedge: bool = False) -> Any:
+        """Return `llm`'s reply to `prompt`, sharing the call with identical in-flight prompts.
+
+        `timeout` (seconds, None/0 = unbounded) raises asyncio.TimeoutError when the
+        budget runs out; the underlying call keeps running for other waiters.
+        """
+        loop = self._bind_loop()
+        self.counters["requests"] += 1
+        # Message-list prompts (compact mode) are keyed by their text form
+        key = (id(llm), prompt if isinstance(prompt, str) else repr(prompt))
+        entry = self._inflight.get(key)
+        if entry is not None:
+            future = entry[1]
+            self.counters["coalesced"] += 1
+        else:
+            future = loop.create_future()
+            self._inflight[key] = (llm, future)
+            future.add_done_callback(lambda _f: self._inflight.pop(key, None))
+            if self.batch_window > 0 and hasattr(llm, "abatch"):
+                self._enqueue(llm, prompt, future)
+            else:
+                loop.create_task(self._call_one(llm, prompt, future))
+            if hedge:
+                loop.create_task(self._hedge(llm, prompt, future))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout or None)
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise
+
+    async def _hedge(self, llm: Any, prompt: str, future: asyncio.Future) -> None:
+        delay = self.latency_percentile(95)
+        if delay is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(future), delay)
+            return
+        except asyncio.TimeoutError:
+            pass
+        except Exception:
+            return
+        self.counters["hedges"] += 1
+        backup = self._loop.create_future()
+        await self._call_one(llm, prompt, backup)
+        # A failed hedge leaves the primary call to finish (or fail) on its own
+        if backup.exception() is None and not future.done():
+            self.counters["hedge_wins"] += 1
+            future.set_result(backup.result())
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        """Observed call latency (seconds) at `pct`; None until enough samples exist."""
+        if len(self._latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def _record_latency(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+        metrics.LLM_CALL_SECONDS.observe(seconds)
+
+    def record_fallback(self) -> None:
+        """Count a turn step that used its local strategy instead of the LLM."""
+        self.counters["fallbacks"] += 1
+
+    async def _call_one(self, llm: Any, prompt: str, future: asyncio.Future) -> None:
+        try:
+            async with self._slot():
+                self.counters["calls"] += 1
+                started = time.perf_counter()
+                result = await llm.ainvoke(prompt)
+                self._record_latency(time.perf_counter() - started)
+            if not future.done():
+                future.set_result(result)
+        except asyncio.CancelledError:
+            # Shutdown or worker stop: release the waiters instead of leaving them hanging
+            if not future.done():
+                future.cancel()
+            raise
+        except Exception as e:
+            self.counters["errors"] += 1
+            if not future.done():
+                future.set_exception(e)
+
+    def _enqueue(self, llm: Any, prompt: str, future: asyncio.Future) -> None:
+        _, pending = self._pending.setdefault(id(llm), (llm, []))
+        pending.append((prompt, future))
+        if len(pending) == 1:
+            self._loop.call_later(self.batch_window, self._flush, llm)
+        elif len(pending) >= self.max_batch:
+            self._flush(llm)
+
+    def _flush(self, llm: Any) -> None:
+        _, batch = self._pending.pop(id(llm), (llm, []))
+        if batch:
+            self._loop.create_task(self._call_batch(llm, batch))
+
+    async def _call_batch(self, llm: Any, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        if len(batch) == 1:
+            await self._call_one(llm, *batch[0])
+            return
+        try:
+            async with self._slot():
+                self.counters["calls"] += 1
+                self.counters["batches"] += 1
+                self.counters["batched_prompts"] += len(batch)
+                started = time.perf_counter()
+                results = await llm.abatch([prompt for prompt, _ in batch], return_exceptions=True)
+                self._record_latency(time.perf_counter() - started)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            raise
+        except Exception as e:
+            self.counters["errors"] += 1
+            results = [e] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    @asynccontextmanager
+    async def _slot(self):
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, latency percentiles and current queue depths (waiting for a slot, batching, in flight)."""
+        p50, p95 = (self.latency_percentile(p) for p in (50, 95))
+        return {
+            **self.counters,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "max_concurrency": self.max_concurrency,
+            "active": self._active,
+            "waiting": self._waiting,
+            "pending_batch": sum(len(p) for _, p in self._pending.values()),
+            "in_flight_prompts": len(self._inflight),
+        }
+
+
+@lru_cache(maxsize=1)
+def get_dispatcher() -> LLMDispatcher:
+    """Return the process-wide dispatcher built from LLM_* settings."""
+    dispatcher = LLMDispatcher(
+        max_concurrency=int(os.environ.get("LLM_MAX_CONCURRENCY", "8")),
+        batch_window_ms=float(os.environ.get("LLM_BATCH_WINDOW_MS", "0")),
+        max_batch=int(os.environ.get("LLM_MAX_BATCH", "16")),
+    )
+    metrics.register_collector(lambda: _collect(dispatcher))
+    return dispatcher
+
+
+def _collect(dispatcher: LLMDispatcher):
+    stats = dispatcher.stats()
+    yield (
+        "wof_llm_dispatch_events_total",
+        "counter",
+        "LLM dispatcher requests, provider calls, coalescing, batching, errors, timeouts, hedges and fallbacks.",
+        [({"event": event}, dispatcher.counters[event]) for event in dispatcher.counters],
+    )
+    yield (
+        "wof_llm_dispatch_queue",
+        "gauge",
+        "LLM calls running, waiting for a slot, or waiting in a batch.",
+        [({"state": state}, stats[field]) for state, field in
+         (("active", "active"), ("waiting", "waiting"), ("batching", "pending_batch"))],
+    )
+
+
+async def invoke(llm: Any, prompt: Any, timeout: Optional[float] = None, hedge: bool = False) -> Any:
+    """`llm.ainvoke(prompt)` routed through the process-wide dispatcher."""
+    return await get_dispatcher().invoke(llm, prompt, timeout=timeout, hedge=hedge)
+
+
+def record_fallback() -> None:
+    get_dispatcher().record_fallback()
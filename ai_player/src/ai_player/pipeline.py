@@ -0,0 +1,56 @@
+"""Helpers shared by the sequential AI tools (solve -> buy_vowel -> spin).
+
+A tool that ends the turn calls `end_turn(output)`: on NAT releases whose
+sequential_executor supports early exit this stops the chain immediately and
+returns `output` as the workflow result, so downstream tools never run. On
+older releases it returns the JSON and downstream tools take their skip path,
+which only echoes upstream state (`passthrough_updates`) without touching
+Redis or the LLM.
+"""
+import logging
+from typing import Any, Dict, List
+
+from wof_shared import codec
+
+logger = logging.getLogger(__name__)
+
+try:
+    from nat.plugins.langchain.control_flow.sequential_executor import SequentialExecutorExit
+except Exception:  # pragma: no cover - older NAT without early exit support
+    SequentialExecutorExit = None
+
+
+def end_turn(output: Dict[str, Any]) -> str:
+    """Serialize `output`; exit the sequential pipeline early when supported."""
+    payload = codec.dumps(output)
+    if SequentialExecutorExit is not None:
+        raise SequentialExecutorExit(payload)
+    return payload
+
+
+def passthrough_updates(data: Dict[str, Any], player_name: str) -> Dict[str, Any]:
+    """Snapshot carried forward from the upstream tool's output (no Redis reads)."""
+    upstream = data.get("updates") if isinstance(data, dict) else None
+    upstream = upstream if isinstance(upstream, dict) else {}
+    return {
+        "player": player_name,
+        "puzzle": upstream.get("puzzle", data.get("puzzle") if isinstance(data, dict) else None),
+        "scores": codec.scores_of(upstream.get("scores", data.get("scores") if isinstance(data, dict) else None)),
+    }
+
+
+def append_history(data: Dict[str, Any], output: Dict[str, Any], limit: int) -> None:
+    """Attach at most `limit` compact step summaries to `output['history']`.
+
+    `limit <= 0` omits history entirely so the payload stays constant per turn.
+    Summaries drop nested 'updates'/'history' to keep each entry small.
+    """
+    if limit <= 0:
+        return
+    upstream: List[Dict[str, Any]] = []
+    try:
+        upstream = list(data.get("history") or [])
+    except Exception:
+        upstream = []
+    entry = {k: v for k, v in output.items() if k not in ("history", "updates")}
+    output["history"] = (upstream + [entry])[-limit:]
@@ -0,0 +1,225 @@
+"""Prompt variants for the AI tools' LLM calls.
+
+"verbose" is the original wording: the full rules preamble and the spaced-out
+mask ("_ E _ * _ _") in one user string on every call.
+
+"compact" sends a fixed system message (identical on every call, so provider
+prefix caching can reuse it) plus a short user message with the mask as one
+word per token ("_E_/__"), the theme and the letters already guessed, and asks
+for a one-line JSON reply. Parsers accept both reply styles, so a model that
+ignores the format still works.
+
+`count_tokens()` uses tiktoken when its encoding is available locally and a
+~4 characters/token estimate otherwise; `token_report()` compares variants.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from wof_shared import codec
+
+PROMPT_MODES = ("verbose", "compact")
+
+Prompt = Union[str, List[Tuple[str, str]]]
+
+SOLVE_SYSTEM = (
+    "You play Wheel of Fortune. Board: '_' hidden letter, '/' word break. "
+    "Pick ONE action. Solve only if confident. "
+    'Reply with one line of JSON: {"action":"solve","answer":"<UPPERCASE ANSWER>"} '
+    'or {"action":"vowel"} (only if vowel=yes) or {"action":"spin"}.'
+)
+CONSONANT_SYSTEM = (
+    "You play Wheel of Fortune and must guess a consonant. Board: '_' hidden letter, '/' word break. "
+    'Pick ONE letter from the allowed list. Reply with one line of JSON: {"letter":"<LETTER>"}.'
+)
+
+
+def compact_mask(masked: Optional[str]) -> str:
+    """State mask "_ E _ * _ _" -> "_E_/__" (one character per cell, '/' between words)."""
+    tokens = (masked or "").split(" ")
+    return "".join("/" if t == "*" else t for t in tokens if t)
+
+
+def _letters(values: Iterable[str]) -> str:
+    return "".join(sorted({str(v).upper() for v in (values or []) if v})) or "-"
+
+
+def solve_prompt(
+    mode: str,
+    masked: Optional[str],
+    theme: Optional[str],
+    can_buy_vowel: bool,
+    guessed: Iterable[str] = (),
+) -> Prompt:
+    """Prompt for the solve step's solve / buy a vowel / spin decision."""
+    if mode == "compact":
+        user = (
+            f"Board: {compact_mask(masked)}\n"
+            f"Theme: {theme}\n"
+            f"Guessed: {_letters(guessed)}\n"
+            f"Vowel: {'yes' if can_buy_vowel else 'no'}"
+        )
+        return [("system", SOLVE_SYSTEM), ("human", user)]
+
+    if can_buy_vowel:
+        system_preamble = (
+            "You are playing Wheel of Fortune and have enough money to buy a vowel IF it makes sense to do so. Decide exactly ONE of the following and reply accordingly:\n"
+            "1) Highest priority is to solve the puzzle but only if you are confident that you can solve the puzzle, reply: 'Solution: <ANSWER>' (UPPERCASE letters and spaces only).\n"
+            "2) If you want to buy a vowel and it makes sense to do so, reply exactly: 'I would like to buy a vowel'.\n"
+            "3) If you want to spin, reply exactly: 'I would like to spin'.\n"
+            "Do not add any extra commentary."
+        )
+    else:
+        system_preamble = (
+            "You are playing Wheel of Fortune and do not have enough money to buy a vowel. Decide exactly ONE of the following and reply accordingly:\n"
+            "1) Highest priority is to solve the puzzle but only if you are confident that you can solve the puzzle, reply: 'Solution: <ANSWER>' (UPPERCASE letters and spaces only).\n"
+            "2) If you want to spin, reply exactly: 'I would like to spin'.\n"
+            "Do not add any extra commentary."
+        )
+    # Replace '*' with spaces to reduce ambiguity for the model
+    masked_for_prompt = (masked or "").replace("*", " ")
+    return (
+        f"{system_preamble}\n"
+        f"Masked Puzzle: {masked_for_prompt}\n"
+        f"Theme: {theme}\n"
+        f"Constraints: If choosing Solution, return 'Solution: ' followed by only UPPERCASE letters and spaces."
+    )
+
+
+def consonant_prompt(
+    mode: str,
+    masked: Optional[str],
+    remaining: Iterable[str],
+    theme: Optional[str] = None,
+    guessed: Iterable[str] = (),
+) -> Prompt:
+    """Prompt for picking a consonant after a money spin."""
+    remaining_upper = [str(c).upper() for c in (remaining or [])]
+    if mode == "compact":
+        user = (
+            f"Board: {compact_mask(masked)}\n"
+            f"Theme: {theme}\n"
+            f"Guessed: {_letters(guessed)}\n"
+            f"Allowed: {''.join(remaining_upper)}"
+        )
+        return [("system", CONSONANT_SYSTEM), ("human", user)]
+
+    masked_for_prompt = (masked or "").replace("*", " ")
+    valid_choices_str = " | ".join(remaining_upper)
+    system_preamble = (
+        "You are playing Wheel of Fortune and have just completed your spin. You did not bankrupt or lose turn so it is time to guess a consonant.\n"
+        "Given the masked puzzle and the remaining consonants, choose the best consonant.\n"
+        "YOU MUST follow these rules strictly:\n"
+        "- Choose EXACTLY ONE letter from the list of valid choices.\n"
+        "- Do NOT choose any letter that is not in the list of valid choices.\n"
+        "- Respond in this exact format: 'Letter: <LETTER>' where <LETTER> is one of the valid choices.\n"
+        "- No extra words or punctuation."
+    )
+    return (
+        f"{system_preamble}\n\n"
+        f"Masked Puzzle: {masked_for_prompt}\n"
+        f"Remaining Consonants (valid choices only): {valid_choices_str}\n\n"
+        f"Examples:\n"
+        f"- If you choose S, respond: 'Letter: S'\n"
+        f"- If you choose M, respond: 'Letter: M'\n\n"
+        f"Return only one line with the exact format."
+    )
+
+
+def reply_text(llm_output: Any) -> str:
+    try:
+        return getattr(llm_output, "content", None) or (
+            llm_output if isinstance(llm_output, str) else str(llm_output)
+        )
+    except Exception:
+        return str(llm_output)
+
+
+def _json_reply(raw: str) -> Optional[Dict[str, Any]]:
+    match = re.search(r"\{.*\}", raw or "", re.S)
+    if not match:
+        return None
+    try:
+        data = codec.loads(match.group(0))
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _clean_answer(text: str) -> str:
+    return re.sub(r"[^A-Za-z ]+", "", text or "").upper().strip()
+
+
+def parse_solve_reply(raw: str) -> Tuple[Optional[str], Optional[str]]:
+    """(next_action, guess) from a JSON or legacy free-text reply."""
+    data = _json_reply(raw)
+    if data is not None:
+        action = str(data.get("action") or "").strip().lower()
+        answer = _clean_answer(str(data.get("answer") or ""))
+        if action == "solve" and answer:
+            return "solve", answer
+        if action in ("vowel", "buy_vowel"):
+            return "buy_vowel", None
+        # A JSON reply is never a guess itself: an empty answer or unknown action spins
+        return "spin", None
+
+    raw_lower = (raw or "").strip().lower()
+    if raw_lower.startswith("solution:"):
+        _ans = raw.split(":", 1)[1] if ":" in (raw or "") else raw
+        return "solve", _clean_answer(_ans)
+    if "buy a vowel" in raw_lower:
+        return "buy_vowel", None
+    if "spin" in raw_lower:
+        return "spin", None
+    # Fallback: treat as a direct guess answer
+    return "solve", _clean_answer(raw)
+
+
+def parse_letter_reply(raw: str) -> Optional[str]:
+    """Single uppercase letter from '{"letter":"X"}' or 'Letter: X'."""
+    data = _json_reply(raw)
+    if data is not None and data.get("letter"):
+        text = str(data["letter"]).upper()
+    else:
+        part = (raw or "").strip().split(":", 1)
+        if len(part) != 2:
+            return None
+        text = part[1].strip().upper()
+    # Keep only the first A-Z char in case the model adds junk
+    match = re.search(r"[A-Z]", text)
+    return match.group(0) if match else None
+
+
+def prompt_text(prompt: Prompt) -> str:
+    if isinstance(prompt, str):
+        return prompt
+    return "\n".join(content for _, content in prompt)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(prompt: Prompt) -> int:
+    text = prompt_text(prompt)
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return max(1, round(len(text) / 4))
+
+
+def token_report(masked: str, theme: str, remaining: Iterable[str], guessed: Iterable[str] = ()) -> Dict[str, Dict[str, int]]:
+    """Prompt tokens per variant for one board: {mode: {"solve": n, "consonant": n}}."""
+    remaining = list(remaining)
+    return {
+        mode: {
+            "solve": count_tokens(solve_prompt(mode, masked, theme, True, guessed)),
+            "consonant": count_tokens(consonant_prompt(mode, masked, remaining, theme, guessed)),
+        }
+        for mode in PROMPT_MODES
+    }
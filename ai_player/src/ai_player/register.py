@@ -1,4 +1,4 @@
 # flake8: noqa
 
 # Import any tools which need to be automatically registered here
-from ai_player import spin, solve, buy_vowel
+from ai_player import spin, solve, buy_vowel, fake_llm
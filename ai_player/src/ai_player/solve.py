@@ -1,5 +1,6 @@
+import asyncio
 import logging
-import json
+from typing import Optional
 
 from pydantic import Field
 
@@ -8,11 +9,56 @@ from nat.builder.function_info import FunctionInfo
 from nat.cli.register_workflow import register_function
 from nat.data_models.function import FunctionBaseConfig
 
+from wof_shared import codec
+from wof_shared.profiling import ProfilingConfig, profiled_from
+from wof_shared.constants import VOWEL_COST
+from ai_player import llm_dispatch, prompts
+from ai_player.pipeline import end_turn
+
 logger = logging.getLogger(__name__)
 
 
-class SolvesPuzzleIfKnowsTheAnswerConfig(FunctionBaseConfig, name="solve_puzzle_if_knows_answer"):
-    pass
+class SolvesPuzzleIfKnowsTheAnswerConfig(
+    FunctionBaseConfig, llm_dispatch.LLMCallConfig, ProfilingConfig, name="solve_puzzle_if_knows_answer"
+):
+    decision_mode: str = Field(
+        default="llm",
+        description="How the turn action is chosen: 'llm' (ask the model) or 'ev' (Monte Carlo expected-value engine over the puzzle corpus, no LLM call).",
+    )
+    ev_rollouts: int = Field(default=2000, description="Spin rollouts per decision in 'ev' mode.")
+    ev_win_value: float = Field(
+        default=5000.0,
+        description="Value of solving the puzzle on top of the player's money in 'ev' mode; higher favours solving early.",
+    )
+    corpus_path: Optional[str] = Field(default=None, description="Puzzle CSV for the 'ev' candidate index (defaults to the bundled corpus).")
+
+
+def guessed_letters(data, turn=None) -> list:
+    """Consonants and vowels guessed so far, from the turn input or else from the turn state."""
+    guessed = list(data.get("guessed_letters") or []) + list(data.get("guessed_vowels") or [])
+    if not guessed and "guessed_letters" not in data and turn is not None:
+        guessed = turn.guessed()
+    return guessed
+
+
+def decide_with_ev(config: SolvesPuzzleIfKnowsTheAnswerConfig, data, turn, player_name, masked_puzzle, theme):
+    """Run the EV engine for the current board; None when it is unavailable (e.g. numpy missing)."""
+    try:
+        from wof_shared.candidates import load_candidate_index
+        from wof_shared.decision import decide
+    except ImportError as e:
+        logger.warning("EV decision mode unavailable (%s); falling back to the LLM", e)
+        return None
+    return decide(
+        masked_puzzle or "",
+        guessed_letters(data, turn),
+        turn.score(player_name),
+        theme=theme,
+        n_rollouts=config.ev_rollouts,
+        win_value=config.ev_win_value,
+        index=load_candidate_index(config.corpus_path),
+    )
+
 
 @register_function(config_type=SolvesPuzzleIfKnowsTheAnswerConfig)
 async def solve_puzzle_if_knows_answer(
@@ -21,25 +67,24 @@ async def solve_puzzle_if_knows_answer(
     # Implement your function logic here
     async def _solve_puzzle_if_knows_answer(input_text: str) -> str:
         # Accept a single text input, parse JSON if present, and evaluate against Redis answer
-        from wof_shared.state import (
-            get_field,
-            set_current_game_status_finished,
-            reveal_all,
-            get_answer,
-            get_player_score,
-            resolve_display_name,
-            update_game_field,
-        )
+        from wof_shared.turn_state import TurnState
 
         llm_guess = None
+        next_action = None
+        decision = None
+        player_name = masked_puzzle = theme = None
         # Parse any provided input for optional context (player, puzzle, theme)
         try:
-            data = json.loads(input_text) if input_text else {}
+            data = codec.loads(input_text) if input_text else {}
             player_name = data.get("player")
             masked_puzzle = data.get("puzzle")
             theme = data.get("theme")
         except Exception:
             data = {}
+        # One snapshot read per turn: carried in the input by the worker, else loaded once here
+        turn = TurnState.from_input(data)
+        masked_puzzle = masked_puzzle or turn.get("puzzle")
+        theme = theme or turn.get("theme")
 
         success = False
         details = "No solution available yet"
@@ -47,77 +92,51 @@ async def solve_puzzle_if_knows_answer(
         # Attempt LLM guess using masked puzzle + theme context
         try:
 
-            llm = await builder.get_llm("openai_llm", wrapper_type="langchain")
-            current_money = get_player_score(player_name)
-            if current_money >= 250:
-                system_preamble = (
-                    "You are playing Wheel of Fortune and have enough money to buy a vowel IF it makes sense to do so. Decide exactly ONE of the following and reply accordingly:\n"
-                    "1) Highest priority is to solve the puzzle but only if you are confident that you can solve the puzzle, reply: 'Solution: <ANSWER>' (UPPERCASE letters and spaces only).\n"
-                    "2) If you want to buy a vowel and it makes sense to do so, reply exactly: 'I would like to buy a vowel'.\n"
-                    "3) If you want to spin, reply exactly: 'I would like to spin'.\n"
-                    "Do not add any extra commentary."
-                )
+            decision = None
+            if config.decision_mode == "ev":
+                decision = decide_with_ev(config, data, turn, player_name, masked_puzzle, theme)
+                logger.info("Solve step: EV decision %s", decision)
+            if decision is not None:
+                next_action = decision["action"]
+                llm_guess = decision["answer"] if next_action == "solve" else None
             else:
-                system_preamble = (
-                    "You are playing Wheel of Fortune and do not have enough money to buy a vowel. Decide exactly ONE of the following and reply accordingly:\n"
-                    "1) Highest priority is to solve the puzzle but only if you are confident that you can solve the puzzle, reply: 'Solution: <ANSWER>' (UPPERCASE letters and spaces only).\n"
-                    "2) If you want to spin, reply exactly: 'I would like to spin'.\n"
-                    "Do not add any extra commentary."
-                )
-            # Replace '*' with spaces to reduce ambiguity for the model
-            masked_for_prompt = (masked_puzzle or "").replace("*", " ")
-            prompt = (
-                f"{system_preamble}\n"
-                f"Masked Puzzle: {masked_for_prompt}\n"
-                f"Theme: {theme}\n"
-                f"Constraints: If choosing Solution, return 'Solution: ' followed by only UPPERCASE letters and spaces."
-            )
-            llm_output = await llm.ainvoke(prompt)
-            # Debug: log raw LLM output for troubleshooting
-            try:
-                logger.info("Solve step: LLM raw output: %r", llm_output)
-            except Exception:
-                pass
-            try:
-                raw_reply = getattr(llm_output, "content", None) or (
-                    llm_output if isinstance(llm_output, str) else str(llm_output)
+                llm = await builder.get_llm("openai_llm", wrapper_type="langchain")
+                current_money = turn.score(player_name)
+                guessed = guessed_letters(data, turn) if config.prompt_mode == "compact" else ()
+                prompt = prompts.solve_prompt(
+                    config.prompt_mode, masked_puzzle, theme, current_money >= VOWEL_COST, guessed
                 )
-            except Exception:
-                raw_reply = str(llm_output)
-
-            # Cleanup proposed solution: keep letters and spaces only, uppercase
-            import re as _re
-            next_action = None
-            llm_guess = None
-            raw_lower = (raw_reply or "").strip().lower()
-            # Parse intent
-            if raw_lower.startswith("solution:"):
-                next_action = "solve"
-                # Extract after 'Solution:' and clean
-                _ans = (raw_reply.split(":", 1)[1] if ":" in (raw_reply or "") else raw_reply)
-                llm_guess = _re.sub(r"[^A-Za-z ]+", "", _ans or "").upper().strip()
-            elif "buy a vowel" in raw_lower:
-                next_action = "buy_vowel"
-            elif "spin" in raw_lower:
-                next_action = "spin"
-            else:
-                # Fallback: treat as a direct guess answer
-                next_action = "solve"
-                llm_guess = _re.sub(r"[^A-Za-z ]+", "", raw_reply or "").upper().strip()
-            # Debug: log cleaned guess and context
-            try:
-                logger.info(
-                    "Solve step: parsed next_action='%s', cleaned guess='%s', masked_puzzle='%s', theme='%s'",
-                    next_action,
-                    llm_guess,
-                    masked_puzzle,
-                    theme,
-                )
-            except Exception:
-                pass
+                try:
+                    llm_output = await llm_dispatch.invoke(
+                        llm, prompt, timeout=config.llm_timeout_s, hedge=config.llm_hedge
+                    )
+                except asyncio.TimeoutError:
+                    # Local deterministic choice: spin (buy_vowel/spin pick their letters locally)
+                    logger.warning("Solve step: LLM exceeded %.1fs budget; falling back to spin", config.llm_timeout_s)
+                    llm_dispatch.record_fallback()
+                    llm_output = "I would like to spin"
+                # Debug: log raw LLM output for troubleshooting
+                try:
+                    logger.info("Solve step: LLM raw output: %r", llm_output)
+                except Exception:
+                    pass
+                raw_reply = prompts.reply_text(llm_output)
+                # Parse intent; proposed solutions keep letters and spaces only, uppercase
+                next_action, llm_guess = prompts.parse_solve_reply(raw_reply)
+                # Debug: log cleaned guess and context
+                try:
+                    logger.info(
+                        "Solve step: parsed next_action='%s', cleaned guess='%s', masked_puzzle='%s', theme='%s'",
+                        next_action,
+                        llm_guess,
+                        masked_puzzle,
+                        theme,
+                    )
+                except Exception:
+                    pass
 
             if next_action == "solve" and llm_guess:
-                true_answer = get_answer()
+                true_answer = turn.answer
                 # Normalize both strings by removing all non-letters so symbols like '&' don't cause mismatches.
                 import re as _re
                 norm_true = "".join(_re.sub(r"[^A-Za-z ]+", "", (true_answer or "")).upper().split())
@@ -132,38 +151,24 @@ async def solve_puzzle_if_knows_answer(
                 # If an incorrect solve was attempted, end the turn (skip downstream)
                 if not success:
                     logger.info("Solve step: incorrect solve attempted; ending turn and skipping downstream steps.")
+                    turn.log("solve", player_name, attempt=str(llm_guess), success=False, end_turn=True)
+                    turn.commit()
                     details = "LLM did not produce a usable guess"
 
             if success:
-                # Mark game finished, record the winner display name, and reveal the puzzle
+                # Mark game finished, record the winner display name, and reveal the puzzle (one write)
                 try:
-                    # Determine the winning player's display name, preferring provided player_name
-                    try:
-                        current_player_id = player_name or (get_field("player") or "")
-                    except Exception:
-                        current_player_id = player_name or ""
-                    winner_name = resolve_display_name(current_player_id)
-                    update_game_field("winner", winner_name)
-                except Exception as e:
-                    logger.warning("Failed to set winner on correct solve: %s", e)
-                try:
-                    set_current_game_status_finished()
-                    reveal_all()
+                    current_player_id = player_name or turn.get("player", "")
+                    turn.finish(turn.display_name(current_player_id))
+                    turn.log("solve", current_player_id, attempt=str(llm_guess), success=True, end_turn=True)
+                    turn.commit()
                 except Exception as e:
                     logger.warning("Failed to finalize game on correct solve: %s", e)
         except Exception as e:
             logger.warning("Failed to solve puzzle: %s", e)
             success = False
 
-        try:
-            import json as _json
-            scores_snapshot = get_field("scores")
-            try:
-                scores_snapshot = _json.loads(scores_snapshot) if scores_snapshot else {}
-            except Exception:
-                pass
-        except Exception:
-            scores_snapshot = None
+        scores_snapshot = codec.scores_of(turn.get("scores")) or {}
 
         # Compose final answer for solve attempt
         if success and llm_guess:
@@ -182,26 +187,32 @@ async def solve_puzzle_if_knows_answer(
             "details": details,
             # Top-level fields to make downstream steps simpler
             "player": player_name,
+            "theme": theme,
             "llm_guess": llm_guess,
             "next_action": next_action,
+            "decision": decision,
             "updates": {
                 "player": player_name,
                 "llm_guess": llm_guess,
                 "answer": true_answer if success else None,
-                "status": get_field("status"),
-                "puzzle": get_field("puzzle"),
+                "status": turn.get("status"),
+                "puzzle": turn.get("puzzle"),
                 "scores": scores_snapshot,
             },
+            "state": turn.payload(),
             # Hint for sequential_executor: when True, downstream steps should no-op/skip
             # End-turn if solved correctly OR if an incorrect solve was attempted
             "skip_next": bool(success) or (next_action == "solve" and not success and llm_guess is not None),
             "final_answer": fa,
         }
-        return json.dumps(solve_output)
+        # Solved or wrong guess ends the turn: exit before buy_vowel/spin run
+        if solve_output["skip_next"]:
+            return end_turn(solve_output)
+        return codec.dumps(solve_output)
 
     try:
         yield FunctionInfo.from_fn(
-            _solve_puzzle_if_knows_answer,
+            profiled_from(config, _solve_puzzle_if_knows_answer, "solve_puzzle_if_knows_answer"),
             description=(
                 "Attempt to solve the puzzle by inferring a solution with the LLM using the masked puzzle and theme; compares with Redis answer, updates status/puzzle on success, and returns structured JSON. "
                 "Outputs include 'success' and 'skip_next' to support sequential execution."
@@ -1,5 +1,6 @@
+import asyncio
 import logging
-import json
+from typing import Optional
 
 from pydantic import Field
 
@@ -8,76 +9,119 @@ from nat.builder.function_info import FunctionInfo
 from nat.cli.register_workflow import register_function
 from nat.data_models.function import FunctionBaseConfig
 
+from wof_shared import codec, metrics
+from wof_shared.profiling import ProfilingConfig, profiled_from
+from ai_player import llm_dispatch, prompts
+from ai_player.pipeline import append_history, passthrough_updates
+
 logger = logging.getLogger(__name__)
 
+# Deterministic consonant preference order (rough English/puzzle frequency)
+CONSONANT_PREFERENCE = [
+    "R","S","T","L","N","D","H","M","C","B","P",
+    "G","Y","K","F","W","V","X","Z","J","Q",
+]
+
 
+def consonant_preference(theme=None):
+    """Preference order for `theme` from the precomputed per-theme tables, else the global order."""
+    if theme:
+        try:
+            from wof_shared.theme_stats import letter_frequencies, letter_order
+            if letter_frequencies(theme):
+                return letter_order(theme, CONSONANT_PREFERENCE)
+        except Exception:
+            pass
+    return list(CONSONANT_PREFERENCE)
+
+
+def choose_consonant_info_gain(masked: str, guessed, remaining, theme=None, objective="reveal", corpus_path=None):
+    """Pick the consonant that best splits / reveals the corpus candidates for this mask.
+
+    Local alternative to the LLM-backed choose_consonant; returns None when numpy
+    is unavailable or no corpus answer matches the mask.
+    """
+    try:
+        from wof_shared.candidates import load_candidate_index
+        index = load_candidate_index(corpus_path)
+        return index.best_letter(masked or "", guessed or [], list(remaining or []), theme=theme, objective=objective)
+    except ImportError as e:
+        logger.warning("info_gain consonant strategy unavailable (%s); using LLM", e)
+    except Exception as e:
+        logger.warning("info_gain consonant pick failed: %s", e)
+    return None
 
-async def choose_consonant(builder: Builder, masked: str, remaining):
+
+def preferred_consonant(remaining, theme=None) -> Optional[str]:
+    """Deterministic pick: first remaining consonant in preference order."""
+    remaining_upper = [str(c).upper() for c in (remaining or [])]
+    for c in consonant_preference(theme):
+        if c in remaining_upper:
+            return c
+    return remaining_upper[0] if remaining_upper else None
+
+
+async def choose_consonant(
+    builder: Builder,
+    masked: str,
+    remaining,
+    theme=None,
+    timeout=None,
+    hedge=False,
+    prompt_mode="verbose",
+    guessed=(),
+    prior_theme=None,
+):
+    """Ask the LLM for a consonant; `theme` goes into the prompt, `prior_theme` orders the fallback."""
     print(f"=================Remaining consonants: {remaining}")
     llm = await builder.get_llm("openai_llm", wrapper_type="langchain")
-    # Normalize masked puzzle for readability
-    masked_for_prompt = (masked or "").replace("*", " ")
-    # Provide valid choices in a simple, copyable form
     remaining_upper = [str(c).upper() for c in (remaining or [])]
-    valid_choices_str = " | ".join(remaining_upper)
-
-    system_preamble = (
-        "You are playing Wheel of Fortune and have just completed your spin. You did not bankrupt or lose turn so it is time to guess a consonant.\n"
-        "Given the masked puzzle and the remaining consonants, choose the best consonant.\n"
-        "YOU MUST follow these rules strictly:\n"
-        "- Choose EXACTLY ONE letter from the list of valid choices.\n"
-        "- Do NOT choose any letter that is not in the list of valid choices.\n"
-        "- Respond in this exact format: 'Letter: <LETTER>' where <LETTER> is one of the valid choices.\n"
-        "- No extra words or punctuation."
-    )
-    prompt = (
-        f"{system_preamble}\n\n"
-        f"Masked Puzzle: {masked_for_prompt}\n"
-        f"Remaining Consonants (valid choices only): {valid_choices_str}\n\n"
-        f"Examples:\n"
-        f"- If you choose S, respond: 'Letter: S'\n"
-        f"- If you choose M, respond: 'Letter: M'\n\n"
-        f"Return only one line with the exact format."
-    )
-    llm_output = await llm.ainvoke(prompt)
-    raw = None
+    prompt = prompts.consonant_prompt(prompt_mode, masked, remaining_upper, theme, guessed)
     try:
-        raw = getattr(llm_output, "content", None) or (
-            llm_output if isinstance(llm_output, str) else str(llm_output)
-        )
-    except Exception:
-        raw = str(llm_output)
+        llm_output = await llm_dispatch.invoke(llm, prompt, timeout=timeout, hedge=hedge)
+    except asyncio.TimeoutError:
+        logger.warning("Spin step: LLM exceeded %.1fs budget; using consonant preference order", timeout)
+        llm_dispatch.record_fallback()
+        metrics.CONSONANT_FALLBACKS.labels("timeout").inc()
+        return preferred_consonant(remaining_upper, prior_theme)
 
-    # Parse "Letter: X" robustly
-    chosen = None
+    # Parse "Letter: X" / {"letter": "X"} robustly
     try:
-        part = (raw or "").strip().split(":", 1)
-        if len(part) == 2:
-            chosen = part[1].strip().upper()
-            # Keep only the first A-Z char in case the model adds junk
-            import re as _re
-            m = _re.search(r"[A-Z]", chosen)
-            if m:
-                chosen = m.group(0)
+        chosen = prompts.parse_letter_reply(prompts.reply_text(llm_output))
     except Exception:
         chosen = None
 
     # Validate against remaining; fallback if invalid
     if not chosen or chosen not in set(remaining_upper):
+        metrics.CONSONANT_FALLBACKS.labels("invalid_letter" if chosen else "parse_failure").inc()
         # Deterministic fallback by consonant preference order
-        pref = [
-            "R","S","T","L","N","D","H","M","C","B","P",
-            "G","Y","K","F","W","V","X","Z","J","Q",
-        ]
-        for c in pref:
-            if c in remaining_upper:
-                return c
-        return remaining_upper[0] if remaining_upper else None
+        return preferred_consonant(remaining_upper, prior_theme)
 
     return chosen
 
-class SpinWheelAndGuessConsonantConfig(FunctionBaseConfig, name="spin_wheel_and_guess_consonant"):
-    pass
+class SpinWheelAndGuessConsonantConfig(
+    FunctionBaseConfig, llm_dispatch.LLMCallConfig, ProfilingConfig, name="spin_wheel_and_guess_consonant"
+):
+    history_limit: int = Field(
+        default=0,
+        description="Max step summaries carried in 'history' between tools; 0 omits history.",
+    )
+    theme_priors: bool = Field(
+        default=False,
+        description="If true, order consonants by precomputed per-theme letter frequencies.",
+    )
+    consonant_strategy: str = Field(
+        default="llm",
+        description="How to pick the consonant: 'llm' (default) or 'info_gain' (corpus candidates, LLM as fallback)",
+    )
+    info_gain_objective: str = Field(
+        default="reveal",
+        description="For 'info_gain': 'reveal' (expected letters revealed) or 'entropy' (candidate-set reduction)",
+    )
+    corpus_path: Optional[str] = Field(
+        default=None,
+        description="Puzzle corpus CSV for 'info_gain'; defaults to pat/src/pat/data/puzzles.csv",
+    )
 
 @register_function(config_type=SpinWheelAndGuessConsonantConfig)
 async def spin_wheel_and_guess_consonant(
@@ -86,62 +130,33 @@ async def spin_wheel_and_guess_consonant(
     # Implement your function logic here
     async def _spin_wheel_and_guess_consonant(buy_vowel_output: str) -> str:
         # Accept a single text input, parse JSON if present, and mutate Redis state accordingly
-        from wof_shared.state import (
-            get_current_game_for_ai_player,
-            get_field,
-            add_guessed_letter,
-            reveal_letter,
-            update_score,
-        )
+        from wof_shared.turn_state import TurnState
 
         player_name = "AI1"
         try:
-            data = json.loads(buy_vowel_output) if buy_vowel_output else {}
+            data = codec.loads(buy_vowel_output) if buy_vowel_output else {}
             player_name = data.get("player") or data.get("turn") or player_name
         except Exception:
             data = {}
 
         next_action = (data.get("next_action") or "").strip().lower() if isinstance(data, dict) else None
 
-        # Sequential skip: if previous step signaled skip or buy_vowel succeeded, no-op
+        # Sequential skip: if previous step signaled skip or buy_vowel succeeded, no-op.
+        # Only echoes the upstream snapshot; no Redis or LLM work.
         try:
             if bool(data.get("skip_next")):
-                if data.get("chosen_vowel") is not None:
-                    skipped_output = {
-                        "action": "spin",
-                        "success": True,
-                        "skipped": True,
-                        "details": data.get("details", ""),
-                        "player": player_name,
-                        "next_action": next_action or "buy_vowel",
-                        "updates": {
-                            "player": player_name,
-                            "puzzle": get_field("puzzle"),
-                            "scores": get_field("scores"),
-                        },
-                    }
-                    try:
-                        hist = data.get("history") or []
-                        hist.append({k: v for k, v in skipped_output.items() if k != "history"})
-                        skipped_output["history"] = hist
-                    except Exception:
-                        pass
-                    return json.dumps(skipped_output)
-                else:
-                    skipped_output = {
-                        "action": "spin",
-                        "success": True,
-                        "skipped": True,
-                        "details": data.get("details", ""),
-                        "player": player_name,
-                        "next_action": next_action or "",
-                        "updates": {
-                            "player": player_name,
-                            "puzzle": get_field("puzzle"),
-                            "scores": get_field("scores"),
-                        },
-                    }
-                    return json.dumps(skipped_output)
+                skipped_output = {
+                    "action": "spin",
+                    "success": True,
+                    "skipped": True,
+                    "details": data.get("details", ""),
+                    "player": player_name,
+                    "next_action": next_action or ("buy_vowel" if data.get("chosen_vowel") is not None else ""),
+                    "updates": passthrough_updates(data, player_name),
+                    "state": data.get("state"),
+                }
+                append_history(data, skipped_output, config.history_limit)
+                return codec.dumps(skipped_output)
         except Exception:
             pass
 
@@ -164,49 +179,38 @@ async def spin_wheel_and_guess_consonant(
                 "updates": {"player": player_name},
                 "final_answer": "Final Answer: Spin failed (no wheel).",
             }
-            return json.dumps(output)
+            return codec.dumps(output)
 
         # Normalize wedge
         wedge_str = str(wedge).strip().upper()
+        metrics.WEDGES.labels(metrics.wedge_outcome(wedge_str)).inc()
         amount = None
         try:
             amount = int(wedge_str)
         except ValueError:
             amount = None
 
-        # Load current state and letters
-        state = get_current_game_for_ai_player(player_name) or {}
-        guessed_cons = set((state.get("guessed_consonants") or []))
-        remaining_cons = [
-            c for c in (
-                [
-                    "R","S","T","L","N","D","H","M","C","B","P",
-                    "G","Y","K","F","W","V","X","Z","J","Q",
-                ]
-            )
-            if c not in guessed_cons
-        ]
+        # Snapshot carried from the upstream steps (no Redis reads)
+        turn = TurnState.from_input(data)
+        guessed_cons = set(turn.get("guessed_consonants", []))
+        prior_theme = turn.get("theme") if config.theme_priors else None
+        remaining_cons = [c for c in consonant_preference(prior_theme) if c not in guessed_cons]
 
         # Handle special wedges
         details = f"{player_name} spun the wheel: {wedge_str}"
         occurrences = 0
         chosen_letter = None
 
-        # Load current masked puzzle for consonant choice
-        try:
-            masked_puzzle = get_field("puzzle")
-        except Exception:
-            masked_puzzle = ""
+        masked_puzzle = turn.get("puzzle", "")
 
         if "BANKRUPT" in wedge_str:
             # Set player's score to 0 by applying negative delta of current score
             try:
-                import json as _json
-                scores_raw = get_field("scores")
-                scores = _json.loads(scores_raw) if scores_raw else {}
-                current_money = int(scores.get(player_name, 0) or 0)
+                current_money = turn.score(player_name)
                 if current_money:
-                    update_score(player_name, -current_money)
+                    turn.add_score(player_name, -current_money)
+                turn.log("spin", player_name, wedge=wedge_str, letter=None, occurrences=0, earned=0, end_turn=True)
+                turn.commit()
             except Exception as e:
                 logger.warning("Failed to apply BANKRUPT: %s", e)
             output = {
@@ -221,14 +225,20 @@ async def spin_wheel_and_guess_consonant(
                     "wheel_wedge": wedge,
                     "chosen_letter": None,
                     "occurrences": 0,
-                    "puzzle": get_field("puzzle"),
-                    "scores": get_field("scores"),
+                    "puzzle": turn.get("puzzle"),
+                    "scores": codec.scores_of(turn.get("scores")),
                 },
+                "state": turn.payload(),
                 "final_answer": "Final Answer: BANKRUPT – score set to 0.",
             }
-            return json.dumps(output)
+            return codec.dumps(output)
 
         if "LOSE" in wedge_str and "TURN" in wedge_str:
+            try:
+                turn.log("spin", player_name, wedge=wedge_str, letter=None, occurrences=0, earned=0, end_turn=True)
+                turn.commit()
+            except Exception as e:
+                logger.warning("Failed to record Lose a Turn: %s", e)
             output = {
                 "action": "spin",
                 "success": True,
@@ -241,39 +251,53 @@ async def spin_wheel_and_guess_consonant(
                     "wheel_wedge": wedge,
                     "chosen_letter": None,
                     "occurrences": 0,
-                    "puzzle": get_field("puzzle"),
-                    "scores": get_field("scores"),
+                    "puzzle": turn.get("puzzle"),
+                    "scores": codec.scores_of(turn.get("scores")),
                 },
+                "state": turn.payload(),
                 "final_answer": "Final Answer: Lose a Turn.",
             }
-            return json.dumps(output)
+            return codec.dumps(output)
 
         # Monetary wedge or free play: attempt a consonant
         if not remaining_cons:
             details += "; no consonants remaining"
         else:
             # chosen_letter = remaining_cons[0]
-            chosen_letter = await choose_consonant(builder, masked_puzzle, remaining_cons)
-            # Reveal and update
+            if config.consonant_strategy == "info_gain":
+                chosen_letter = choose_consonant_info_gain(
+                    masked_puzzle,
+                    turn.guessed(),
+                    remaining_cons,
+                    theme=turn.get("theme"),
+                    objective=config.info_gain_objective,
+                    corpus_path=config.corpus_path,
+                )
+            if not chosen_letter:
+                chosen_letter = await choose_consonant(
+                    builder,
+                    masked_puzzle,
+                    remaining_cons,
+                    theme=turn.get("theme"),
+                    timeout=config.llm_timeout_s,
+                    hedge=config.llm_hedge,
+                    prompt_mode=config.prompt_mode,
+                    guessed=turn.guessed(),
+                    prior_theme=prior_theme,
+                )
+            # Reveal and update, written back in one transaction
             try:
-                occurrences = reveal_letter(chosen_letter)
-                add_guessed_letter(chosen_letter, is_vowel=False)
-                if amount is not None and occurrences > 0:
-                    update_score(player_name, amount * occurrences)
+                occurrences = turn.reveal(chosen_letter)
+                turn.add_guess(chosen_letter, is_vowel=False)
+                earned = amount * occurrences if amount is not None else 0
+                if earned > 0:
+                    turn.add_score(player_name, earned)
+                turn.log("spin", player_name, wedge=wedge_str, letter=chosen_letter, occurrences=occurrences, earned=earned, end_turn=True)
+                turn.commit()
             except Exception as e:
                 logger.warning("Failed to apply letter updates: %s", e)
 
-        # Build output snapshot
-        try:
-            import json as _json
-            scores_snapshot = get_field("scores")
-            try:
-                # Normalize to JSON object for convenience
-                scores_snapshot = _json.loads(scores_snapshot) if scores_snapshot else {}
-            except Exception:
-                pass
-        except Exception:
-            scores_snapshot = None
+        scores_snapshot = codec.scores_of(turn.get("scores")) or {}
 
         # Compose a deterministic final answer line to copy verbatim
         if chosen_letter:
@@ -300,16 +324,17 @@ async def spin_wheel_and_guess_consonant(
                 "chosen_letter": chosen_letter,
                 "occurrences": occurrences,
                 "amount": amount,
-                "puzzle": get_field("puzzle"),
+                "puzzle": turn.get("puzzle"),
                 "scores": scores_snapshot,
             },
+            "state": turn.payload(),
             "final_answer": final_ans,
         }
-        return json.dumps(output)
+        return codec.dumps(output)
 
     try:
         yield FunctionInfo.from_fn(
-            _spin_wheel_and_guess_consonant,
+            profiled_from(config, _spin_wheel_and_guess_consonant, "spin_wheel_and_guess_consonant"),
             description=(
                 "Spin the wheel and propose an unguessed consonant; returns structured JSON with spin result and a state snapshot. "
             )
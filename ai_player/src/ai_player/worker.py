@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Long-lived AI player worker.
+
+Keeps the NAT workflow (LLM clients, tools) and the Redis pool warm and
+takes "take turn for player X in game Y" jobs from a Redis list instead of
+spawning `nat run` per turn. Start several workers (or raise --concurrency)
+to share AI turns across many concurrent games.
+
+    python -m ai_player.worker --config_file ai_player/configs/config.yml --concurrency 4
+
+Jobs are queued with wof_shared.jobs.enqueue_ai_turn(game_id, player) and the
+result is read back with wof_shared.jobs.wait_for_ai_turn(job_id).
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+from wof_shared import codec, metrics
+
+logger = logging.getLogger(__name__)
+
+
+def build_turn_input(player: str, turn=None) -> str:
+    """AI workflow input for the pinned game (see wof_shared.turn_state.build_ai_player_payload)."""
+    from wof_shared.turn_state import build_ai_player_payload
+
+    payload = build_ai_player_payload(player, turn) or {
+        "puzzle": None, "theme": None, "status": None, "guessed_letters": [], "guessed_vowels": [],
+        "scores": {"AI1": 0, "AI2": 0, "Human": 0}, "player": player,
+    }
+    return codec.dumps(payload)
+
+
+async def run_turn(workflow, game_id, player: str) -> str:
+    """Run one AI turn for `player` in `game_id` on an already-loaded workflow.
+
+    Only the player whose turn it is may act. An AI turn is a single action,
+    so the turn passes to the next player afterwards while the game is active.
+    """
+    from wof_shared.constants import STATUS_ACTIVE
+    from wof_shared.state import get_field, next_turn, turn_lease, use_game
+    from wof_shared.turn_state import TurnState
+
+    started = time.perf_counter()
+    with use_game(game_id), metrics.track_redis_commands() as redis_commands:
+        async with turn_lease(game_id):
+            turn = TurnState.load(game_id)
+            if turn is None or not turn.active:
+                return codec.dumps({"action": "none", "success": False, "details": f"game:{game_id} is not active"})
+            if turn.get("player") != player:
+                return codec.dumps({"action": "none", "success": False, "details": f"It is {turn.get('player')}'s turn"})
+            turn_input = build_turn_input(player, turn)
+            async with workflow.run(turn_input) as runner:
+                output = await runner.result(to_type=str)
+            if get_field("status") == STATUS_ACTIVE:
+                next_turn(expected=player)
+    # Includes taking and releasing the turn lease
+    record_turn_metrics(output, time.perf_counter() - started, redis_commands[0])
+    return output
+
+
+def record_turn_metrics(output: str, seconds: float, redis_commands: int) -> None:
+    try:
+        action = codec.loads(output).get("action") or "unknown"
+    except Exception:
+        action = "unknown"
+    metrics.TURNS.labels("ai", action).inc()
+    metrics.TURN_SECONDS.labels("ai").observe(seconds)
+    metrics.REDIS_COMMANDS_PER_TURN.observe(redis_commands)
+
+
+async def _consume(workflow, queue: str, stop: asyncio.Event) -> None:
+    from wof_shared.jobs import pop_ai_turn, publish_ai_turn_result
+
+    while not stop.is_set():
+        # BLPOP blocks a pool connection, not the event loop
+        job = await asyncio.to_thread(pop_ai_turn, 5, queue)
+        if not job:
+            continue
+        job_id = job.get("job_id")
+        started = time.perf_counter()
+        try:
+            output = await run_turn(workflow, job.get("game_id"), job.get("player") or "AI1")
+            result = {"job_id": job_id, "success": True, "output": output}
+        except Exception as e:
+            logger.exception("AI turn job %s failed", job_id)
+            result = {"job_id": job_id, "success": False, "error": f"{type(e).__name__}: {e}"}
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if job_id:
+            await asyncio.to_thread(publish_ai_turn_result, job_id, result)
+
+
+async def _report_llm_dispatch(stop: asyncio.Event, interval: float = 60.0) -> None:
+    from ai_player.llm_dispatch import get_dispatcher
+
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            stats = get_dispatcher().stats()
+            if stats["requests"]:
+                logger.info("LLM dispatch: %s", stats)
+            from wof_shared.state import concurrency_stats
+            logger.info("Game state concurrency: %s", concurrency_stats())
+
+
+async def serve(config_file: str, concurrency: int = 1, queue: str = None) -> None:
+    from nat.runtime.loader import load_workflow
+    from wof_shared.jobs import AI_TURN_QUEUE
+
+    metrics.start_exporters()
+    queue = queue or AI_TURN_QUEUE
+    stop = asyncio.Event()
+    async with load_workflow(config_file, max_concurrency=concurrency) as workflow:
+        logger.info("AI worker ready: %d consumer(s) on '%s'", concurrency, queue)
+        consumers = [asyncio.create_task(_consume(workflow, queue, stop)) for _ in range(max(1, concurrency))]
+        consumers.append(asyncio.create_task(_report_llm_dispatch(stop)))
+        try:
+            await asyncio.gather(*consumers)
+        finally:
+            stop.set()
+            for task in consumers:
+                task.cancel()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AI player worker consuming turn jobs from Redis")
+    parser.add_argument("--config_file", default="ai_player/configs/config.yml")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent turns handled by this worker")
+    parser.add_argument("--queue", default=None, help="Redis list to consume (default: ai_turn_jobs)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.config_file, args.concurrency, args.queue))
+    except KeyboardInterrupt:
+        print("\nWorker stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
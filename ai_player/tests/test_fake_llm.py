@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+
+# Ensure we can import the ai_player src module
+CURRENT_DIR = os.path.dirname(__file__)
+SRC_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from ai_player import prompts  # noqa: E402
+from ai_player.fake_llm import FakeChatModel, FakeLLMConfig, board_from_prompt  # noqa: E402
+
+
+def test_board_recovered_from_both_prompt_variants():
+    masked = "_ E _ * _ _"
+    for mode in prompts.PROMPT_MODES:
+        assert board_from_prompt(prompts.prompt_text(prompts.solve_prompt(mode, masked, "Thing", False))) == masked
+
+
+def test_canned_replies_cycle():
+    llm = FakeChatModel(FakeLLMConfig(latency_ms=0, replies=["I would like to spin", "Letter: T"]))
+
+    async def run():
+        return [(await llm.ainvoke("x")).content for _ in range(3)]
+
+    assert asyncio.run(run()) == ["I would like to spin", "Letter: T", "I would like to spin"]
+
+
+def test_consonant_reply_uses_requested_format():
+    llm = FakeChatModel(FakeLLMConfig(latency_ms=0))
+    prompt = prompts.consonant_prompt("compact", "_ _ _ * _ _", ["T", "S"], "Thing")
+    letter = prompts.parse_letter_reply(asyncio.run(llm.ainvoke(prompt)).content)
+    assert letter in ("T", "S")
+
+
+def test_choose_consonant_prompt_carries_theme_without_priors():
+    from ai_player import spin
+
+    sent = []
+
+    class RecordingLLM:
+        async def ainvoke(self, prompt):
+            sent.append(prompts.prompt_text(prompt))
+            return '{"letter":"T"}'
+
+    class Builder:
+        async def get_llm(self, name, wrapper_type=None):
+            return RecordingLLM()
+
+    letter = asyncio.run(spin.choose_consonant(Builder(), "_ _ _ * _ _", ["T", "S"], theme="Thing", prompt_mode="compact"))
+    assert letter == "T"
+    assert "Theme: Thing" in sent[0]
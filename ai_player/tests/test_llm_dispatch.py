@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+
+# Ensure we can import the ai_player src module
+CURRENT_DIR = os.path.dirname(__file__)
+SRC_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from ai_player.llm_dispatch import LLMDispatcher  # noqa: E402
+
+
+class SlowLLM:
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = []
+        self.batches = []
+        self.running = 0
+        self.peak = 0
+
+    async def ainvoke(self, prompt):
+        self.calls.append(prompt)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(self.delay)
+        self.running -= 1
+        return f"reply:{prompt}"
+
+    async def abatch(self, prompts, return_exceptions=False):
+        self.batches.append(list(prompts))
+        await asyncio.sleep(self.delay)
+        return [f"reply:{p}" for p in prompts]
+
+
+def test_identical_prompts_are_coalesced():
+    llm = SlowLLM()
+    dispatcher = LLMDispatcher(max_concurrency=4)
+
+    async def run():
+        return await asyncio.gather(*(dispatcher.invoke(llm, "same") for _ in range(5)))
+
+    assert asyncio.run(run()) == ["reply:same"] * 5
+    assert llm.calls == ["same"]
+    assert dispatcher.stats()["coalesced"] == 4
+
+
+def test_semaphore_caps_concurrent_calls():
+    llm = SlowLLM()
+    dispatcher = LLMDispatcher(max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(dispatcher.invoke(llm, f"p{i}") for i in range(6)))
+
+    assert asyncio.run(run()) == [f"reply:p{i}" for i in range(6)]
+    assert llm.peak == 2
+    assert dispatcher.stats()["calls"] == 6
+
+
+def test_distinct_prompts_batched_within_window():
+    llm = SlowLLM()
+    dispatcher = LLMDispatcher(batch_window_ms=10, max_batch=8)
+
+    async def run():
+        return await asyncio.gather(*(dispatcher.invoke(llm, f"p{i}") for i in range(3)))
+
+    assert asyncio.run(run()) == ["reply:p0", "reply:p1", "reply:p2"]
+    assert llm.batches == [["p0", "p1", "p2"]]
+    stats = dispatcher.stats()
+    assert stats["batches"] == 1 and stats["in_flight_prompts"] == 0
+
+
+def test_timeout_raises_and_counts():
+    llm = SlowLLM(delay=0.2)
+    dispatcher = LLMDispatcher()
+
+    async def run():
+        try:
+            await dispatcher.invoke(llm, "slow", timeout=0.01)
+        except asyncio.TimeoutError:
+            return "timeout"
+
+    assert asyncio.run(run()) == "timeout"
+    assert dispatcher.stats()["timeouts"] == 1
+
+
+def test_hedge_fires_after_p95_and_first_reply_wins():
+    class StallOnce(SlowLLM):
+        async def ainvoke(self, prompt):
+            if prompt == "stall" and "stall" not in self.calls:
+                self.calls.append(prompt)
+                await asyncio.sleep(1.0)
+                return "late"
+            return await super().ainvoke(prompt)
+
+    llm = StallOnce(delay=0.001)
+    dispatcher = LLMDispatcher()
+
+    async def run():
+        for i in range(25):
+            await dispatcher.invoke(llm, f"warm{i}")
+        return await dispatcher.invoke(llm, "stall", timeout=0.5, hedge=True)
+
+    assert asyncio.run(run()) == "reply:stall"
+    stats = dispatcher.stats()
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1 and stats["timeouts"] == 0
+
+
+def test_cancelled_call_releases_waiters():
+    class StuckLLM(SlowLLM):
+        async def ainvoke(self, prompt):
+            self.calls.append(asyncio.current_task())
+            await asyncio.sleep(60)
+
+    llm = StuckLLM()
+    dispatcher = LLMDispatcher(max_concurrency=1)
+
+    async def run():
+        waiters = [asyncio.ensure_future(dispatcher.invoke(llm, "same")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        llm.calls[0].cancel()
+        return await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), 1)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+    assert dispatcher.stats()["in_flight_prompts"] == 0
@@ -0,0 +1,40 @@
+import json
+import os
+import sys
+import pytest
+
+# Ensure we can import the ai_player src module
+CURRENT_DIR = os.path.dirname(__file__)
+SRC_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from ai_player import pipeline  # noqa: E402
+
+
+def test_history_omitted_by_default():
+    out = {"action": "spin"}
+    pipeline.append_history({"history": [{"action": "solve"}]}, out, 0)
+    assert "history" not in out
+
+
+def test_history_is_capped_and_compact():
+    upstream = {"history": [{"action": "a"}, {"action": "b"}]}
+    out = {"action": "spin", "updates": {"puzzle": "_ _"}}
+    pipeline.append_history(upstream, out, 2)
+    assert out["history"] == [{"action": "b"}, {"action": "spin"}]
+
+
+def test_passthrough_uses_upstream_snapshot():
+    data = {"updates": {"puzzle": "A _", "scores": {"AI1": 5}}}
+    assert pipeline.passthrough_updates(data, "AI1") == {"player": "AI1", "puzzle": "A _", "scores": {"AI1": 5}}
+
+
+def test_end_turn_exits_pipeline_when_supported():
+    output = {"action": "solve", "skip_next": True}
+    if pipeline.SequentialExecutorExit is None:
+        assert json.loads(pipeline.end_turn(output)) == output
+    else:
+        with pytest.raises(pipeline.SequentialExecutorExit) as exc:
+            pipeline.end_turn(output)
+        assert json.loads(exc.value.message) == output
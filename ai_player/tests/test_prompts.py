@@ -0,0 +1,41 @@
+import os
+import sys
+
+# Ensure we can import the ai_player src module
+CURRENT_DIR = os.path.dirname(__file__)
+SRC_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "..", "src"))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from ai_player import prompts  # noqa: E402
+
+
+def test_compact_mask():
+    assert prompts.compact_mask("_ E _ * _ ' _") == "_E_/_'_"
+
+
+def test_compact_prompt_shares_system_message_and_lists_guesses():
+    a = prompts.solve_prompt("compact", "_ E _", "Thing", True, ["E", "S"])
+    b = prompts.solve_prompt("compact", "_ _ _ * _", "Phrase", False, [])
+    assert a[0] == b[0] == ("system", prompts.SOLVE_SYSTEM)
+    assert "Guessed: ES" in a[1][1] and "Vowel: yes" in a[1][1]
+    assert prompts.count_tokens(a) < prompts.count_tokens(prompts.solve_prompt("verbose", "_ E _", "Thing", True))
+
+
+def test_parse_solve_reply_json_and_legacy():
+    assert prompts.parse_solve_reply('{"action":"solve","answer":"Steak knife!"}') == ("solve", "STEAK KNIFE")
+    assert prompts.parse_solve_reply('{"action":"vowel"}') == ("buy_vowel", None)
+    assert prompts.parse_solve_reply("I would like to spin") == ("spin", None)
+    assert prompts.parse_solve_reply("Solution: GREEN BEANS") == ("solve", "GREEN BEANS")
+
+
+def test_parse_solve_reply_json_without_answer_spins():
+    assert prompts.parse_solve_reply('{"action":"solve","answer":""}') == ("spin", None)
+    assert prompts.parse_solve_reply('{"action":"solve","answer":"?!"}') == ("spin", None)
+    assert prompts.parse_solve_reply('{"action":"solve"}') == ("spin", None)
+
+
+def test_parse_letter_reply():
+    assert prompts.parse_letter_reply('{"letter": "t"}') == "T"
+    assert prompts.parse_letter_reply("Letter: S.") == "S"
+    assert prompts.parse_letter_reply("no idea") is None
@@ -44,3 +44,16 @@ def test_handles_no_remaining():
     remaining = []
     chosen = choose_vowel_heuristic(masked, remaining)
     assert chosen is None
+
+
+def test_theme_priors_are_used_when_theme_given():
+    # With no pattern signal the choice follows the theme's most frequent remaining vowel
+    from wof_shared.theme_stats import letter_frequencies
+    freqs = letter_frequencies("Thing")
+    remaining = ["A", "O", "U"]
+    expected = max(remaining, key=lambda v: freqs[v])
+    assert choose_vowel_heuristic("_ _ _", remaining, theme="Thing") == expected
+
+
+def test_unknown_theme_falls_back_to_global_table():
+    assert choose_vowel_heuristic("_ _ _", list("AEIOU"), theme="No Such Theme") == "E"
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Encode/decode cost per AI turn: stdlib json vs wof_shared.codec.
+
+One "turn" is what the AI pipeline serializes today: decode the game hash
+(get_current_game), decode the tool input, and encode three tool outputs
+(solve -> buy_vowel -> spin), each carrying a state snapshot.
+
+    python benchmarks/bench_codec.py [--turns 20000]
+"""
+import argparse
+import json
+import timeit
+
+from wof_shared import codec
+
+SCORES = {"AI1": 1850, "AI2": 600, "Human": 2300}
+RAW_HASH = {
+    "puzzle": "_ E _ E T A R I A _ * _ I _ _ A",
+    "theme": "Food & Drink",
+    "player": "AI1",
+    "status": "active",
+    "winner": "",
+    "guessed_consonants": json.dumps(["R", "S", "T", "L", "N"]),
+    "guessed_vowels": json.dumps(["A", "E", "I"]),
+    "revealed": json.dumps(list(range(0, 16, 2))),
+    "scores": json.dumps(SCORES),
+    "players": json.dumps({"AI1": "AI_Joe", "AI2": "AI_Jane", "Human": "Richard"}),
+}
+
+
+def _tool_output(action: str) -> dict:
+    return {
+        "action": action,
+        "success": True,
+        "skipped": False,
+        "details": f"AI1 ran {action}",
+        "player": "AI1",
+        "next_action": action,
+        "updates": {
+            "player": "AI1",
+            "puzzle": RAW_HASH["puzzle"],
+            "scores": SCORES,
+            "remaining_vowels": ["O", "U"],
+        },
+        "skip_next": False,
+        "final_answer": f"Final Answer: AI1 ran {action}.",
+    }
+
+
+OUTPUTS = [_tool_output(a) for a in ("solve", "buy_vowel", "spin")]
+
+
+def turn_stdlib():
+    data = dict(RAW_HASH)
+    for field in ("revealed", "scores", "guessed_consonants", "guessed_vowels", "players"):
+        data[field] = json.loads(data[field])
+    msg = json.dumps(data)
+    for out in OUTPUTS:
+        json.loads(msg)
+        msg = json.dumps(out)
+    return msg
+
+
+def turn_codec():
+    data = codec.decode_game(RAW_HASH)
+    msg = codec.dumps(data)
+    for out in OUTPUTS:
+        codec.loads(msg)
+        msg = codec.dumps(out)
+    return msg
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"codec backend: {codec.backend()}")
+    for name, fn in (("stdlib json", turn_stdlib), ("wof_shared.codec", turn_codec)):
+        seconds = min(timeit.repeat(fn, number=args.turns, repeat=3))
+        size = len(fn())
+        print(f"{name:18s} {seconds / args.turns * 1e6:8.2f} us/turn   last payload {size} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
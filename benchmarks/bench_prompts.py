@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Prompt tokens (and optionally LLM accuracy) per prompt variant across the corpus.
+
+Every corpus puzzle is turned into a mid-game board (a seeded share of its
+letters revealed) and the solve and consonant prompts are built in each mode
+from ai_player.prompts. Without --model only token counts are reported; with
+--model (needs OPENAI_API_KEY) a sample of boards is sent to the model and
+solve accuracy / consonant hit rate are compared too.
+
+    python benchmarks/bench_prompts.py [--reveal 0.5] [--model gpt-4o --sample 50]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "ai_player" / "src"))
+
+from ai_player import prompts  # noqa: E402
+from wof_shared.constants import VOWELS  # noqa: E402
+from wof_shared.corpus import iter_puzzles  # noqa: E402
+
+CONSONANTS = [c for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ" if c not in VOWELS]
+
+
+def board(answer: str, reveal: float, rng: random.Random):
+    """(state mask, guessed letters) with about `reveal` of the distinct letters shown."""
+    letters = sorted({ch for ch in answer if ch.isalpha()})
+    shown = set(rng.sample(letters, int(len(letters) * reveal)))
+    misses = set(rng.sample([c for c in CONSONANTS if c not in letters], 2))
+    cells = [ch if ch in shown else "_" if ch.isalpha() else "*" if ch == " " else ch for ch in answer]
+    return " ".join(cells), sorted(shown | misses)
+
+
+async def _accuracy(model: str, boards, mode: str):
+    from langchain_openai import ChatOpenAI
+
+    llm = ChatOpenAI(model=model, temperature=0)
+    solved = wrong = hits = valid = 0
+    for answer, theme, masked, guessed in boards:
+        remaining = [c for c in CONSONANTS if c not in guessed]
+        reply = await llm.ainvoke(prompts.solve_prompt(mode, masked, theme, True, guessed))
+        action, guess = prompts.parse_solve_reply(prompts.reply_text(reply))
+        if action == "solve":
+            same = "".join(guess.split()) == "".join(ch for ch in answer.upper() if ch.isalpha())
+            solved += same
+            wrong += not same
+        reply = await llm.ainvoke(prompts.consonant_prompt(mode, masked, remaining, theme, guessed))
+        letter = prompts.parse_letter_reply(prompts.reply_text(reply))
+        valid += letter in remaining
+        hits += bool(letter) and letter in answer.upper()
+    n = len(boards) or 1
+    return {"solved": solved / n, "wrong_solves": wrong / n, "consonant_valid": valid / n, "consonant_hit": hits / n}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=None, help="Puzzle CSV (default: bundled corpus)")
+    parser.add_argument("--reveal", type=float, default=0.5, help="Share of distinct letters revealed per board")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--model", default=None, help="OpenAI model for the accuracy comparison (optional)")
+    parser.add_argument("--sample", type=int, default=50, help="Boards sent to the model per variant")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    boards = []
+    for answer, theme in iter_puzzles(args.csv):
+        masked, guessed = board(answer.upper(), args.reveal, rng)
+        boards.append((answer, theme, masked, guessed))
+
+    tokens = {mode: {"solve": [], "consonant": []} for mode in prompts.PROMPT_MODES}
+    for _, theme, masked, guessed in boards:
+        remaining = [c for c in CONSONANTS if c not in guessed]
+        for mode, counts in prompts.token_report(masked, theme, remaining, guessed).items():
+            for step, n in counts.items():
+                tokens[mode][step].append(n)
+
+    counter = "tiktoken o200k_base" if prompts._encoding() is not None else "~4 chars/token estimate"
+    print(f"{len(boards)} boards, prompt tokens ({counter}):")
+    print(f"{'mode':10s} {'solve mean':>11s} {'consonant mean':>15s} {'per turn':>9s}")
+    for mode, steps in tokens.items():
+        solve, consonant = statistics.mean(steps["solve"]), statistics.mean(steps["consonant"])
+        print(f"{mode:10s} {solve:11.1f} {consonant:15.1f} {solve + consonant:9.1f}")
+
+    if args.model:
+        sample = rng.sample(boards, min(args.sample, len(boards)))
+        for mode in prompts.PROMPT_MODES:
+            result = asyncio.run(_accuracy(args.model, sample, mode))
+            print(f"{mode:10s} " + "  ".join(f"{k} {v:.2f}" for k, v in result.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""End-to-end load test: N concurrent games through the real Pat and AI workflows.
+
+Games are created with the Pat function, then every game plays AI turns in
+PLAYER_ID_ORDER through the AI workflow (ai_player.worker.run_turn) until it
+is solved or --max-turns is reached. The LLM is the local fake from
+ai_player/configs/load_test.yml, so no API key or network is needed. Redis is
+fakeredis by default, or the REDIS_* configured server with --redis local
+(use a scratch DB: games are created there).
+
+    python benchmarks/load_test.py --games 20 [--redis local] [--max-turns 80]
+
+Reports turns/sec, p50/p99 turn latency and Redis commands / round trips per turn.
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+for src in ("ai_player/src", "pat/src"):
+    sys.path.insert(0, str(REPO_ROOT / src))
+
+import wof_shared.redis_client as rc  # noqa: E402
+from wof_shared import metrics  # noqa: E402
+
+OPS = {"commands": 0, "round_trips": 0}
+
+
+class _CountingMixin:
+    """Counts commands and round trips (a pipeline is one round trip), also into wof_shared.metrics."""
+
+    def execute_command(self, *args, **options):
+        OPS["commands"] += 1
+        OPS["round_trips"] += 1
+        metrics.count_redis(1)
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        execute = pipe.execute
+
+        def _execute(raise_on_error=True):
+            OPS["commands"] += len(pipe.command_stack)
+            OPS["round_trips"] += 1
+            metrics.count_redis(len(pipe.command_stack))
+            return execute(raise_on_error)
+
+        pipe.execute = _execute
+        return pipe
+
+
+def make_redis(kind: str):
+    if kind == "fakeredis":
+        import fakeredis
+
+        cls = type("CountingFakeRedis", (_CountingMixin, fakeredis.FakeRedis), {})
+        return cls(decode_responses=True)
+    import redis
+
+    cls = type("CountingRedis", (_CountingMixin, redis.Redis), {})
+    return cls(connection_pool=rc.get_pool())
+
+
+def install_redis(client) -> None:
+    """Point every loaded module's `get_redis` at `client`."""
+    import ai_player.register  # noqa: F401
+    import pat.register  # noqa: F401
+    import wof_shared.jobs  # noqa: F401
+    import wof_shared.state  # noqa: F401
+
+    original = rc.get_redis
+    for module in list(sys.modules.values()):
+        if getattr(module, "get_redis", None) is original:
+            module.get_redis = lambda: client
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+async def create_games(client, count: int):
+    from nat.builder.workflow_builder import WorkflowBuilder
+    from pat.pat_function import PatFunctionConfig
+
+    game_ids = []
+    async with WorkflowBuilder() as builder:
+        pat = await builder.add_function("pat", PatFunctionConfig(force_new=True))
+        for _ in range(count):
+            await pat.ainvoke("create_new_game", to_type=str)
+            game_ids.append(client.get("current_game_id"))
+    return game_ids
+
+
+async def play_game(workflow, game_id, max_turns: int, latencies) -> dict:
+    from ai_player.worker import run_turn
+    from wof_shared.constants import PLAYER_ID_ORDER
+    from wof_shared.state import get_field, use_game
+
+    player = PLAYER_ID_ORDER[0]
+    turns = 0
+    while turns < max_turns:
+        with use_game(game_id):
+            if get_field("status") != "active":
+                break
+        started = time.perf_counter()
+        await run_turn(workflow, game_id, player)
+        latencies.append(time.perf_counter() - started)
+        turns += 1
+        player = PLAYER_ID_ORDER[(PLAYER_ID_ORDER.index(player) + 1) % len(PLAYER_ID_ORDER)]
+    with use_game(game_id):
+        return {"game_id": game_id, "turns": turns, "finished": get_field("status") == "finished"}
+
+
+async def run(args) -> int:
+    from nat.runtime.loader import load_workflow
+    from ai_player.llm_dispatch import get_dispatcher
+
+    client = make_redis(args.redis)
+    install_redis(client)
+    game_ids = await create_games(client, args.games)
+
+    latencies = []
+    async with load_workflow(args.config_file, max_concurrency=args.games) as workflow:
+        OPS.update(commands=0, round_trips=0)
+        started = time.perf_counter()
+        games = await asyncio.gather(*(play_game(workflow, gid, args.max_turns, latencies) for gid in game_ids))
+        elapsed = time.perf_counter() - started
+
+    turns = sum(g["turns"] for g in games) or 1
+    finished = sum(g["finished"] for g in games)
+    print(f"games {len(games)} (finished {finished}), turns {turns}, elapsed {elapsed:.2f}s")
+    print(f"turns/sec        {turns / elapsed:8.1f}")
+    print(f"turn latency     p50 {percentile(latencies, 50) * 1000:7.1f} ms   p99 {percentile(latencies, 99) * 1000:7.1f} ms"
+          f"   mean {statistics.mean(latencies or [0]) * 1000:7.1f} ms")
+    print(f"redis per turn   {OPS['commands'] / turns:8.1f} commands   {OPS['round_trips'] / turns:8.1f} round trips")
+    stats = get_dispatcher().stats()
+    print(f"llm              {stats['requests']} requests, {stats['calls']} calls, {stats['coalesced']} coalesced, "
+          f"{stats['fallbacks']} fallbacks")
+    from wof_shared.state import concurrency_stats
+    cas = concurrency_stats()
+    print(f"game state       {cas['cas_commits']} commits, {cas['cas_conflicts']} conflicts, "
+          f"{cas['lock_contended']} lock waits, {cas['lock_timeouts']} lock timeouts")
+    if args.metrics:
+        metrics.dump(args.metrics)
+        print(f"metrics          written to {args.metrics}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=10, help="Concurrent games")
+    parser.add_argument("--max-turns", type=int, default=80, help="Turn cap per game")
+    parser.add_argument("--redis", choices=("fakeredis", "local"), default="fakeredis")
+    parser.add_argument("--config_file", default=str(REPO_ROOT / "ai_player" / "configs" / "load_test.yml"))
+    parser.add_argument("--metrics", default=None, help="Write the Prometheus metrics text to this file at the end")
+    parser.add_argument("--verbose", action="store_true", help="Keep NAT/tool logging (noisy under load)")
+    args = parser.parse_args(argv)
+    if not args.verbose:
+        # NAT logs every early pipeline exit as an error; keep the report readable
+        logging.getLogger("nat").setLevel(logging.CRITICAL)
+        logging.getLogger("ai_player").setLevel(logging.WARNING)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,17 +1,81 @@
 #!/usr/bin/env python3
-import json
+"""Play a game from the terminal: pick who moves next, or let it play itself.
+
+    uv run human/game_runner.py                       # menu: AI1 / AI2 / Human turns
+    uv run human/game_runner.py --auto --games 0      # unattended soak test until Ctrl-C
+
+In --auto mode turns cycle through PLAYER_ID_ORDER. The AI seats run the AI
+workflow in-process and the Human seat plays a scripted strategy through
+wof_shared.actions. Each game runs until it is finished, then Pat starts the
+next one. Rolling turns/sec and per-phase latency are printed every
+--report-every seconds.
+"""
+import argparse
+import asyncio
+import statistics
 import subprocess
 import sys
 import time
+from collections import defaultdict
 from pathlib import Path
 
+from wof_shared import actions, metrics, state
+from wof_shared.constants import PLAYER_ID_ORDER, STATUS_ACTIVE, VOWEL_COST
 from wof_shared.state import get_field
 
 # Project root (nat_wof_game)
 REPO_ROOT = Path(__file__).resolve().parents[1]
 AI_CONFIG = "ai_player/configs/config.yml"
 PAT_CONFIG = "pat/configs/config.yml"
-PROMPT_PATH = REPO_ROOT / "ai_player" / "data" / "prompt.json"
+
+
+class Workflows:
+    """The AI and Pat workflows, each loaded once and kept warm across turns.
+
+    Each AI turn's input is built in memory from one pipelined read of the game
+    (see ai_player.worker.run_turn), with no prompt file and no `nat run`
+    subprocess. Background tasks of a workflow (e.g. Pat's pool refiller) only
+    run while a call is in progress.
+    """
+
+    def __init__(self, ai_config: str = AI_CONFIG, pat_config: str = PAT_CONFIG):
+        self.configs = {"ai": str(REPO_ROOT / ai_config), "pat": str(REPO_ROOT / pat_config)}
+        self._loop = asyncio.new_event_loop()
+        self._contexts = {}
+        self._workflows = {}
+
+    def _workflow(self, name: str):
+        if name not in self._workflows:
+            from nat.runtime.loader import load_workflow
+
+            context = load_workflow(self.configs[name])
+            self._workflows[name] = self._loop.run_until_complete(context.__aenter__())
+            self._contexts[name] = context
+        return self._workflows[name]
+
+    def play(self, game_id, player: str) -> str:
+        """One AI turn for `player` in `game_id`."""
+        from ai_player.worker import run_turn
+
+        return self._loop.run_until_complete(run_turn(self._workflow("ai"), game_id, player))
+
+    def start_game(self) -> str:
+        """Ask Pat for a new game (resumes the current one while it is active)."""
+        workflow = self._workflow("pat")
+
+        async def _run():
+            async with workflow.run("create_new_game") as runner:
+                return await runner.result(to_type=str)
+
+        return self._loop.run_until_complete(_run())
+
+    def close(self) -> None:
+        for context in reversed(list(self._contexts.values())):
+            self._loop.run_until_complete(context.__aexit__(None, None, None))
+        self._contexts.clear()
+        self._workflows.clear()
+        self._loop.close()
+
 
 def create_new_game():
     return subprocess.run(
@@ -20,49 +84,36 @@ def create_new_game():
         check=False,
     ).returncode
 
+def give_turn(player: str):
+    """Hand the current game's turn to the seat picked in the menu; its id, or None."""
+    game_id = state._get_game_id()
+    if not game_id:
+        print("No current game. Start one with Pat first.")
+        return None
+    with state.use_game(game_id):
+        state.set_turn(player)
+    return game_id
+
 def run_human():
-    subprocess.run(
-        [sys.executable, "pat/src/pat/redis_admin.py", "set_turn", "Human"],
-        cwd=REPO_ROOT,
-        check=False,
-    )
+    if not give_turn("Human"):
+        return 1
     return subprocess.run(
         [sys.executable, "human/human_cli.py"],
         cwd=REPO_ROOT,
         check=False,
     ).returncode
 
-def run_ai(player: str):
-    # Regenerate the AI prompt so it reflects the latest Redis state
-    subprocess.run(
-        [sys.executable, "pat/src/pat/redis_admin.py", "set_turn", player],
-        cwd=REPO_ROOT,
-        check=False,
-    )
-
-    gen = subprocess.run(
-        [sys.executable, "pat/src/pat/redis_admin.py", "generate_ai_player_prompt"],
-        cwd=REPO_ROOT,
-        check=False,
-        capture_output=True,
-        text=True,
-    )
-    if gen.returncode != 0:
-        print("Failed to generate AI prompt:", gen.stderr or gen.stdout)
-        return gen.returncode
-
+def run_ai(ai: Workflows, player: str):
+    game_id = give_turn(player)
+    if not game_id:
+        return 1
     try:
-        prompt_text = PROMPT_PATH.read_text(encoding="utf-8")
+        output = ai.play(game_id, player)
     except Exception as e:
-        print(f"Failed to read prompt.json: {e}")
+        print(f"AI turn failed: {type(e).__name__}: {e}")
         return 1
-
-    # Run the AI workflow with the prompt as input
-    return subprocess.run(
-        ["nat", "run", "--config_file", AI_CONFIG, "--input", prompt_text],
-        cwd=REPO_ROOT,
-        check=False,
-    ).returncode
+    print(output)
+    return 0
 
 def is_game_over():
     return get_field("status") == "finished"
@@ -74,6 +125,13 @@ def main():
     else:
         print("Game is already in progress.")
 
+    ai = Workflows()
+    try:
+        return _menu(ai)
+    finally:
+        ai.close()
+
+def _menu(ai: Workflows):
     while True:
         print("\nChoose action: [1] AI1  [2] AI2  [3] Human  [q] Quit")
         choice = input("> ").strip().lower()
@@ -84,9 +142,9 @@ def main():
             continue
 
         if choice == "1":
-            rc = run_ai("AI1")
+            rc = run_ai(ai, "AI1")
         elif choice == "2":
-            rc = run_ai("AI2")
+            rc = run_ai(ai, "AI2")
         elif choice == "3":
             rc = run_human()
         if rc != 0:
@@ -95,9 +153,162 @@ def main():
             print("Game over.")
             return 0
 
+# --- Unattended play ---
+
+# Consonants by frequency in English text: the scripted player's spin order
+CONSONANT_ORDER = "RSTLNDCMHGPBFYWKVXZJQ"
+# The scripted player solves once at most this many letters are hidden
+SOLVE_AT_HIDDEN = 3
+MAX_TURNS_PER_GAME = 300
+
+
+class PhaseTimer:
+    """Latency samples per phase since the last report, plus lifetime totals."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.turns = self.games = 0
+        self.total_turns = self.total_games = 0
+        self.started = self.window_started = time.perf_counter()
+
+    def time(self, phase: str, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.samples[phase].append(time.perf_counter() - started)
+
+    def turn_done(self) -> None:
+        self.turns += 1
+        self.total_turns += 1
+
+    def game_done(self) -> None:
+        self.games += 1
+        self.total_games += 1
+
+    def report(self) -> str:
+        now = time.perf_counter()
+        window = max(now - self.window_started, 1e-9)
+        lines = [
+            f"[{now - self.started:8.1f}s] games {self.total_games} (+{self.games}), turns {self.total_turns} (+{self.turns}), "
+            f"{self.turns / window:.2f} turns/s now, {self.total_turns / max(now - self.started, 1e-9):.2f} overall"
+        ]
+        for phase, values in sorted(self.samples.items()):
+            values = sorted(values)
+            p95 = values[min(len(values) - 1, int(0.95 * len(values)))]
+            lines.append(
+                f"    {phase:<12} n={len(values):<5} mean {statistics.fmean(values) * 1000:8.1f} ms"
+                f"   p50 {statistics.median(values) * 1000:8.1f} ms   p95 {p95 * 1000:8.1f} ms"
+            )
+        self.samples.clear()
+        self.turns = self.games = 0
+        self.window_started = now
+        return "\n".join(lines)
+
+
+def scripted_move(game, answer: str, player: str):
+    """Next (action, argument) for the scripted human: solve when nearly revealed,
+    buy a vowel when affordable, else spin for the most common unguessed consonant."""
+    puzzle = game.get("puzzle") or ""
+    guessed_consonants = set(game.get("guessed_consonants") or [])
+    vowels_left = [v for v in "EAOIU" if v not in (game.get("guessed_vowels") or [])]
+    consonants_left = [c for c in CONSONANT_ORDER if c not in guessed_consonants]
+    score = int((game.get("scores") or {}).get(player, 0) or 0)
+    if puzzle.count("_") <= SOLVE_AT_HIDDEN or not (consonants_left or vowels_left):
+        return "solve", answer
+    if vowels_left and score >= VOWEL_COST:
+        return "buy_vowel", vowels_left[0]
+    if consonants_left:
+        return "spin", consonants_left[0]
+    return "solve", answer
+
+
+def play_scripted_turn(game_id, player: str, timer: PhaseTimer) -> None:
+    """Play the Human seat's turn through wof_shared.actions until it ends, then pass the turn."""
+    moves = {"spin": actions.spin, "buy_vowel": actions.buy_vowel, "solve": actions.solve}
+    with state.use_game(game_id), state.turn_lock():
+        answer = (state.get_answer() or "").upper()
+        while True:
+            game = timer.time("state_read", state.get_current_game) or {}
+            if game.get("status") != STATUS_ACTIVE or game.get("player") != player:
+                return
+            action, argument = scripted_move(game, answer, player)
+            result = timer.time("human_move", moves[action], player, argument)
+            if result.get("end_turn") or not result.get("success", True):
+                break
+        if not (action == "solve" and result.get("success")):
+            state.next_turn(expected=player)
+
+
+def play_game(workflows: Workflows, game_id, timer: PhaseTimer, max_turns: int, after_turn) -> bool:
+    """Play whoever's turn it is (turns pass in PLAYER_ID_ORDER) until the game is finished.
+
+    Returns False if it is still active after `max_turns` turns.
+    """
+    for turn in range(max_turns + 1):
+        with state.use_game(game_id):
+            game = timer.time("state_read", state.get_current_game) or {}
+        if game.get("status") != STATUS_ACTIVE:
+            return True
+        if turn == max_turns:
+            return False
+        player = game.get("player") or PLAYER_ID_ORDER[0]
+        if player.upper().startswith("AI"):
+            timer.time("ai_turn", workflows.play, game_id, player)
+        else:
+            timer.time("human_turn", play_scripted_turn, game_id, player, timer)
+        timer.turn_done()
+        after_turn()
+    return False
+
+
+def autoplay(workflows: Workflows, games: int = 1, report_every: float = 10.0, max_turns: int = MAX_TURNS_PER_GAME) -> int:
+    """Play games unattended (`games` = 0 keeps going until interrupted)."""
+    timer = PhaseTimer()
+    last_report = [time.perf_counter()]
+
+    def _maybe_report():
+        if time.perf_counter() - last_report[0] >= report_every:
+            print(timer.report(), flush=True)
+            last_report[0] = time.perf_counter()
+
+    try:
+        while not games or timer.total_games < games:
+            if get_field("status") != "active":
+                timer.time("pat_start", workflows.start_game)
+            game_id = state._get_game_id()
+            if not play_game(workflows, game_id, timer, max_turns, _maybe_report):
+                print(f"Game {game_id} still unsolved after {max_turns} turns; finishing it.")
+                with state.use_game(game_id):
+                    state.set_current_game_status_finished()
+            timer.game_done()
+    except KeyboardInterrupt:
+        print("\nStopped by user.")
+    print(timer.report())
+    return 0
+
+
+def cli(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Wheel of Fortune game runner")
+    parser.add_argument("--auto", action="store_true", help="play unattended (AI seats plus a scripted Human)")
+    parser.add_argument("--games", type=int, default=1, help="games to play in --auto mode; 0 = until interrupted")
+    parser.add_argument("--report-every", type=float, default=10.0, help="seconds between throughput reports")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS_PER_GAME, help="give up on a game after this many turns")
+    parser.add_argument("--ai-config", default=AI_CONFIG)
+    parser.add_argument("--pat-config", default=PAT_CONFIG)
+    args = parser.parse_args(argv)
+    if not args.auto:
+        return main()
+    metrics.start_exporters()
+    workflows = Workflows(args.ai_config, args.pat_config)
+    try:
+        return autoplay(workflows, args.games, args.report_every, args.max_turns)
+    finally:
+        workflows.close()
+
 if __name__ == "__main__":
     try:
-        sys.exit(main())
+        sys.exit(cli())
     except KeyboardInterrupt:
         print("\nStopped by user.")
         sys.exit(0)
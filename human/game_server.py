@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Asyncio HTTP/WebSocket game server for human players.
+
+Exposes spin / buy_vowel / solve / state over HTTP and pushes state changes
+to WebSocket subscribers. All clients share the server's Redis pool instead
+of each holding their own connection.
+
+    uv run human/game_server.py --host 127.0.0.1 --port 8765
+
+    GET  /games/{game_id}/state
+    POST /games/{game_id}/spin        {"player": "Human", "consonant": "R"}
+    POST /games/{game_id}/buy_vowel   {"player": "Human", "vowel": "E"}
+    POST /games/{game_id}/solve       {"player": "Human", "attempt": "STEAK KNIFE"}
+    WS   /games/{game_id}/ws
+    GET  /metrics                     Prometheus text (see wof_shared.metrics)
+
+`game_id` may be "current" to follow the global current_game_id.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Set
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+
+from wof_shared import actions, metrics
+from wof_shared.redis_client import get_redis, pool_stats
+from wof_shared.state import TurnLockTimeout, get_current_game, next_turn, turn_lock, use_game
+
+logger = logging.getLogger(__name__)
+
+# How often games with WebSocket subscribers are checked for changes made by
+# other processes (AI workers, the CLI)
+POLL_INTERVAL_SECONDS = 1.0
+
+
+class SpinRequest(BaseModel):
+    player: str
+    consonant: str
+
+
+class BuyVowelRequest(BaseModel):
+    player: str
+    vowel: str
+
+
+class SolveRequest(BaseModel):
+    player: str
+    attempt: str
+
+
+def _resolve_game_id(game_id: str) -> str:
+    if game_id == "current":
+        current = get_redis().get("current_game_id")
+        if not current:
+            raise HTTPException(status_code=404, detail="No current game")
+        return current
+    return game_id
+
+
+def _read_state(game_id: str) -> Optional[dict]:
+    with use_game(game_id):
+        return get_current_game() or None
+
+
+def _apply(game_id: str, player: str, fn, *args) -> dict:
+    """Run one action against `game_id` (in a worker thread) and advance the turn if it ended."""
+    with use_game(game_id):
+        try:
+            # Other orchestrators (AI workers, CLI) may act on the same game
+            with turn_lock(game_id):
+                started = time.perf_counter()
+                with metrics.track_redis_commands() as redis_commands:
+                    result = _apply_locked(game_id, player, fn, *args)
+                metrics.TURNS.labels("human", result.get("action") or "unknown").inc()
+                metrics.TURN_SECONDS.labels("human").observe(time.perf_counter() - started)
+                metrics.REDIS_COMMANDS_PER_TURN.observe(redis_commands[0])
+                return result
+        except TurnLockTimeout:
+            raise HTTPException(status_code=409, detail="Another player is acting on this game")
+
+
+def _apply_locked(game_id: str, player: str, fn, *args) -> dict:
+    game = get_current_game()
+    if not game:
+        raise HTTPException(status_code=404, detail=f"game:{game_id} not found")
+    if game.get("status") != "active":
+        raise HTTPException(status_code=409, detail="Game is finished")
+    if game.get("player") != player:
+        raise HTTPException(status_code=409, detail=f"It is {game.get('player')}'s turn")
+    try:
+        result = fn(player, *args)
+    except actions.InvalidMove as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result.get("end_turn") and not (result.get("action") == "solve" and result.get("success")):
+        result["next_player"] = next_turn()
+    result["state"] = get_current_game()
+    return result
+
+
+class GameHub:
+    """Tracks WebSocket subscribers per game and pushes state snapshots to them."""
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[WebSocket]] = {}
+        self.last_sent: Dict[str, str] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    def lock(self, game_id: str) -> asyncio.Lock:
+        # Serialize actions per game inside this server; different games run concurrently
+        return self.locks.setdefault(game_id, asyncio.Lock())
+
+    def subscribe(self, game_id: str, ws: WebSocket) -> None:
+        self.subscribers.setdefault(game_id, set()).add(ws)
+
+    def unsubscribe(self, game_id: str, ws: WebSocket) -> None:
+        subs = self.subscribers.get(game_id)
+        if subs is not None:
+            subs.discard(ws)
+            if not subs:
+                self.subscribers.pop(game_id, None)
+                self.last_sent.pop(game_id, None)
+
+    async def publish(self, game_id: str, state: Optional[dict]) -> None:
+        if state is None or not self.subscribers.get(game_id):
+            return
+        message = json.dumps({"type": "state", "game_id": game_id, "state": state})
+        if self.last_sent.get(game_id) == message:
+            return
+        self.last_sent[game_id] = message
+        for ws in list(self.subscribers.get(game_id, ())):
+            try:
+                await ws.send_text(message)
+            except Exception:
+                self.unsubscribe(game_id, ws)
+
+    async def poll_forever(self) -> None:
+        while True:
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            for game_id in list(self.subscribers):
+                try:
+                    state = await asyncio.to_thread(_read_state, game_id)
+                    await self.publish(game_id, state)
+                except Exception as e:
+                    logger.warning("State poll failed for game:%s: %s", game_id, e)
+
+
+def create_app() -> FastAPI:
+    hub = GameHub()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        poller = asyncio.create_task(hub.poll_forever())
+        try:
+            yield
+        finally:
+            poller.cancel()
+
+    app = FastAPI(title="Wheel of Fortune game server", lifespan=lifespan)
+    app.state.hub = hub
+
+    async def _run_action(game_id: str, player: str, fn, *args) -> dict:
+        game_id = await asyncio.to_thread(_resolve_game_id, game_id)
+        async with hub.lock(game_id):
+            result = await asyncio.to_thread(_apply, game_id, player, fn, *args)
+        await hub.publish(game_id, result.get("state"))
+        return result
+
+    @app.get("/stats/redis_pool")
+    async def redis_pool():
+        return pool_stats()
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics_text():
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+    @app.get("/games/{game_id}/state")
+    async def state(game_id: str):
+        game_id = await asyncio.to_thread(_resolve_game_id, game_id)
+        data = await asyncio.to_thread(_read_state, game_id)
+        if not data:
+            raise HTTPException(status_code=404, detail=f"game:{game_id} not found")
+        return data
+
+    @app.post("/games/{game_id}/spin")
+    async def spin(game_id: str, req: SpinRequest):
+        return await _run_action(game_id, req.player, actions.spin, req.consonant)
+
+    @app.post("/games/{game_id}/buy_vowel")
+    async def buy_vowel(game_id: str, req: BuyVowelRequest):
+        return await _run_action(game_id, req.player, actions.buy_vowel, req.vowel)
+
+    @app.post("/games/{game_id}/solve")
+    async def solve(game_id: str, req: SolveRequest):
+        return await _run_action(game_id, req.player, actions.solve, req.attempt)
+
+    @app.websocket("/games/{game_id}/ws")
+    async def game_updates(ws: WebSocket, game_id: str):
+        await ws.accept()
+        try:
+            game_id = await asyncio.to_thread(_resolve_game_id, game_id)
+        except HTTPException as e:
+            await ws.close(code=4404, reason=e.detail)
+            return
+        hub.subscribe(game_id, ws)
+        try:
+            data = await asyncio.to_thread(_read_state, game_id)
+            await ws.send_text(json.dumps({"type": "state", "game_id": game_id, "state": data}))
+            # Clients only listen; drain anything they send until they disconnect
+            while True:
+                await ws.receive_text()
+        except WebSocketDisconnect:
+            pass
+        finally:
+            hub.unsubscribe(game_id, ws)
+
+    return app
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Wheel of Fortune HTTP/WebSocket game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    metrics.start_exporters()
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
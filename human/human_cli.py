@@ -3,6 +3,7 @@ import json
 import sys
 from typing import Optional
 
+from wof_shared import metrics
 from wof_shared.wheel import spin_wheel
 from wof_shared.constants import VOWELS, VOWEL_COST
 from wof_shared.state import (
@@ -11,12 +12,21 @@ from wof_shared.state import (
     next_turn,
     reveal_letter,
     update_score,
+    set_score,
+    spend_score,
     add_guessed_letter,
     set_current_game_status_finished,
     get_answer,
     resolve_display_name,
+    turn_lock,
+    TurnLockTimeout,
+    append_event,
+    make_event,
 )
 
+# The lease covers prompts typed mid-action, so it is longer than an AI turn's
+HUMAN_TURN_LOCK_TTL = 300.0
+
 
 def _load_json_field(name: str, default):
     raw = get_field(name)
@@ -62,16 +72,13 @@ def handle_spin(current_player: str) -> bool:
     print(f"You spun: {wedge}")
 
     if wedge.upper() == "BANKRUPT":
-        # Set player's score to 0
-        scores = _load_json_field("scores", {})
-        scores[current_player] = 0
-        # write scores
-        from wof_shared.state import hset_json  # local import to avoid exporting in public API
-        hset_json("scores", scores)
+        set_score(current_player, 0)
+        append_event(make_event("spin", current_player, "human", wedge=wedge, letter=None, occurrences=0, earned=0, end_turn=True))
         print("BANKRUPT! Your score is now 0. Turn ends.")
         return True  # end turn
 
     if wedge.upper() == "LOSE A TURN":
+        append_event(make_event("spin", current_player, "human", wedge=wedge, letter=None, occurrences=0, earned=0, end_turn=True))
         print("Lose a Turn! Turn ends.")
         return True  # end turn
 
@@ -89,8 +96,12 @@ def handle_spin(current_player: str) -> bool:
 
     occurrences = reveal_letter(guess)
     add_guessed_letter(guess, is_vowel=False)
+    amount = int(wedge) if wedge.isdigit() else 0
+    append_event(make_event(
+        "spin", current_player, "human",
+        wedge=wedge, letter=guess, occurrences=occurrences, earned=amount * occurrences, end_turn=occurrences == 0,
+    ))
     if occurrences > 0:
-        amount = int(wedge) if wedge.isdigit() else 0
         update_score(current_player, amount * occurrences)
         print(f"'{guess}' appears {occurrences} time(s). You earn {amount * occurrences}.")
         return False
@@ -100,17 +111,12 @@ def handle_spin(current_player: str) -> bool:
 
 
 def handle_buy_vowel(current_player: str) -> bool:
-    scores = _load_json_field("scores", {})
-    balance = int(scores.get(current_player, 0) or 0)
-    if balance < VOWEL_COST:
+    # Deduct cost (checked and written in one transaction)
+    paid, balance = spend_score(current_player, VOWEL_COST)
+    if not paid:
         print(f"Insufficient funds. You have {balance}, need {VOWEL_COST}.")
         return False  # allow trying another action in this simple CLI
 
-    # Deduct cost
-    scores[current_player] = balance - VOWEL_COST
-    from wof_shared.state import hset_json
-    hset_json("scores", scores)
-
     while True:
         guess = input("Enter a vowel (A/E/I/O/U): ").strip().upper()
         if not _is_vowel(guess):
@@ -124,6 +130,9 @@ def handle_buy_vowel(current_player: str) -> bool:
 
     occurrences = reveal_letter(guess)
     add_guessed_letter(guess, is_vowel=True)
+    append_event(make_event(
+        "buy_vowel", current_player, "human", letter=guess, occurrences=occurrences, cost=VOWEL_COST, end_turn=occurrences == 0,
+    ))
     print(f"Revealed '{guess}' {occurrences} time(s).")
     # After buying a vowel, keep the turn in classic rules, but for simplicity end turn here
     return occurrences == 0
@@ -136,8 +145,10 @@ def handle_solve(current_player: str) -> bool:
     norm_attempt = re.sub(r"[^A-Z]", "", attempt)
     answer = (get_answer() or "").upper()
     norm_answer = re.sub(r"[^A-Z]", "", answer)
+    solved = norm_attempt == norm_answer and bool(answer)
+    append_event(make_event("solve", current_player, "human", attempt=attempt, success=solved, end_turn=True))
 
-    if norm_attempt == norm_answer and answer:
+    if solved:
         print("Correct! You solved the puzzle!")
         # Reveal the full puzzle in Redis so other clients don't see masked letters
         from wof_shared.state import update_game_field, resolve_display_name  # local import to avoid exporting in public API
@@ -146,6 +157,7 @@ def handle_solve(current_player: str) -> bool:
         winner_name = resolve_display_name(current_player)
         update_game_field("winner", winner_name)
         set_current_game_status_finished()
+        metrics.observe_game_finished(get_field("started_at"))
         return True
     else:
         print(f"Incorrect. The attempt '{attempt}' does not match.")
@@ -170,16 +182,21 @@ def main() -> int:
             continue
 
         end_turn = False
-        if choice == "1":
-            end_turn = handle_spin(current_player)
-        elif choice == "2":
-            end_turn = handle_buy_vowel(current_player)
-        elif choice == "3":
-            end_turn = handle_solve(current_player)
+        try:
+            with turn_lock(ttl=HUMAN_TURN_LOCK_TTL):
+                if choice == "1":
+                    end_turn = handle_spin(current_player)
+                elif choice == "2":
+                    end_turn = handle_buy_vowel(current_player)
+                elif choice == "3":
+                    end_turn = handle_solve(current_player)
+                nxt = next_turn() if end_turn else None
+        except TurnLockTimeout:
+            print("Another player is acting on this game. Try again in a moment.")
+            continue
 
         show_state()
         if end_turn:
-            nxt = next_turn()
             print(f"Turn ended. Next player: {nxt}")
             break
 
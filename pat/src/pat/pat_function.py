@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from pydantic import Field
@@ -7,12 +8,14 @@ from nat.builder.function_info import FunctionInfo
 from nat.cli.register_workflow import register_function
 from nat.data_models.function import FunctionBaseConfig
 from typing import Optional, Dict
-import json
+
+from wof_shared import codec
+from wof_shared.profiling import ProfilingConfig, profiled_from
 
 
 logger = logging.getLogger(__name__)
 
-class PatFunctionConfig(FunctionBaseConfig, name="pat"):
+class PatFunctionConfig(FunctionBaseConfig, ProfilingConfig, name="pat"):
     """
     Host setup function (Pat Sajak). Starts a new Wheel of Fortune game in Redis
     with a masked puzzle, answer, theme, and initializes player/scores/guesses.
@@ -22,15 +25,36 @@ class PatFunctionConfig(FunctionBaseConfig, name="pat"):
     players: Optional[Dict[str, str]] = Field(
         default={"ai1": "AI1", "ai2": "AI2", "human": "Rich"}, description="Optional mapping of player names to AI and Human player names"
     )
+    pool_size: int = Field(
+        default=0,
+        description="Prepared games kept ready in Redis by a background refiller; new games are popped from it. 0 disables the pool.",
+    )
+    pool_refill_interval: float = Field(default=0.5, description="Seconds between pool top-ups.")
+    deck: Optional[str] = Field(
+        default="default",
+        description="Namespace of the shuffled puzzle deck in Redis (no repeats until the corpus is dealt); empty samples with replacement.",
+    )
+
+
+def prepared_puzzle(deck: Optional[str] = None):
+    """(masked, answer, theme) for a new game; the refiller's puzzle source."""
+    from pat.puzzle_helper import get_puzzle, mask_puzzle
+
+    puzzle, theme = get_puzzle(deck)
+    return mask_puzzle(puzzle), puzzle, theme
 
 @register_function(config_type=PatFunctionConfig)
 async def pat_function(
     config: PatFunctionConfig, builder: Builder
 ):
+    refiller = None
+    if config.pool_size > 0:
+        from wof_shared.game_pool import keep_filled
+        refiller = asyncio.create_task(keep_filled(config.pool_size, lambda: prepared_puzzle(config.deck), config.pool_refill_interval))
+
     # Implement your function logic here
     async def _response_fn(input_message: str) -> str:
         # Create or resume a game in Redis
-        from pat.puzzle_helper import get_puzzle, mask_puzzle
         from wof_shared.state import start_new_game, get_current_game, get_field
         # Use shared helpers from AI player to ensure consistent fields
         try:
@@ -57,11 +81,9 @@ async def pat_function(
                     "player": current_player_turn,
                 },
             }
-            return json.dumps(output)
+            return codec.dumps(output)
         else:
             # Start a fresh game
-            puzzle, theme = get_puzzle()
-            masked = mask_puzzle(puzzle)
             # Build display-name mapping from config for UI only; keep stable IDs in state
             try:
                 cfg_players = config.players or {}
@@ -72,7 +94,13 @@ async def pat_function(
                 "AI2": cfg_players.get("ai2") or "AI2",
                 "Human": cfg_players.get("human") or "Human",
             }
-            start_new_game(masked, puzzle, theme, players)
+            game_id = None
+            if config.pool_size > 0:
+                from wof_shared.game_pool import claim_game
+                # One pop-and-activate of a prepared game; set up synchronously only when the pool is empty
+                game_id = claim_game(players)
+            if game_id is None:
+                start_new_game(*prepared_puzzle(config.deck), players)
             # Initialize player to AI1 and clear the per-run guard
             if set_turn:
                 try:
@@ -87,11 +115,11 @@ async def pat_function(
                 "details": "New game started by host (Pat)",
                 "updates": state,
             }
-            return json.dumps(output)
+            return codec.dumps(output)
 
     try:
         yield FunctionInfo.from_fn(
-            _response_fn,
+            profiled_from(config, _response_fn, "pat"),
             description=(
                 "Host function to start a new Wheel of Fortune game in Redis. "
                 "Initializes puzzle/answer/theme, sets player to AI1, and clears the per-run turn guard."
@@ -100,4 +128,6 @@ async def pat_function(
     except GeneratorExit:
         logger.warning("Function exited early!")
     finally:
+        if refiller is not None:
+            refiller.cancel()
         logger.info("Cleaning up pat workflow.")
@@ -1,11 +1,14 @@
 import logging
 import random
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 import csv
 
 
-def get_puzzle() -> tuple[str, str]:
-    """Return a random (puzzle, theme) pair from data/puzzles.csv.
+@lru_cache(maxsize=1)
+def load_puzzles() -> tuple[tuple[str, str], ...]:
+    """(puzzle, theme) pairs from data/puzzles.csv, parsed once per process.
 
     The CSV is expected to have rows of the form:
     puzzle, theme, date, episode, round
@@ -34,6 +37,20 @@ def get_puzzle() -> tuple[str, str]:
     if not puzzles:
         raise ValueError("No puzzles loaded from puzzles.csv")
 
+    return tuple(puzzles)
+
+
+def get_puzzle(deck: Optional[str] = None) -> tuple[str, str]:
+    """Return a (puzzle, theme) pair from data/puzzles.csv.
+
+    With a `deck` namespace the puzzle is dealt from that namespace's shuffled
+    deck in Redis (wof_shared.deck), so no puzzle repeats until the whole
+    corpus has been dealt; otherwise it is sampled uniformly with replacement.
+    """
+    puzzles = load_puzzles()
+    if deck:
+        from wof_shared.deck import deal
+        return puzzles[deal(len(puzzles), deck)]
     return random.choice(puzzles)
 
 def mask_puzzle(puzzle: str) -> str:
@@ -1,22 +1,27 @@
-import redis
 import sys
+import time
 from pathlib import Path
 import random
 
-r = redis.Redis(host="localhost", port=6379, decode_responses=True)
+from wof_shared import archive, codec, keys, maintenance, state
+from wof_shared.redis_client import get_game_redis, get_redis, get_shards, pool_stats
+from wof_shared.turn_state import build_ai_player_payload
+
+# Shared pool honours REDIS_HOST/REDIS_PORT/REDIS_DB/REDIS_UNIX_SOCKET etc.
+r = get_redis()
 
 def set_current_game_status_finished():
-    game_id = r.get("current_game_id")
-    r.hset(f"game:{game_id}", "status", "finished")
+    state.set_current_game_status_finished()
 
 def set_turn(player: str):
     """Set the current player's turn (e.g., AI1, AI2, Human)."""
-    game_id = r.get("current_game_id")
+    game_id = r.get(keys.CURRENT_GAME_ID)
     if not game_id:
         print("No current_game_id set")
         return
-    r.hset(f"game:{game_id}", "player", player)
-    print(f"Set player to {player} on game:{game_id}")
+    with state.use_game(game_id):
+        state.set_turn(player)
+    print(f"Set player to {player} on {keys.game_key(game_id)}")
 
 def hello_redis():
     r.set("msg:hello", "Hello Redis!!!")
@@ -24,66 +29,27 @@ def hello_redis():
     print(msg)
 
 def generate_ai_player_prompt():
-    game_id = r.get("current_game_id")
-    if not game_id:
+    """Write the current game's AI input to ai_player/data/prompt.json for a manual `nat run`.
+
+    game_runner and the AI worker build the same payload in memory
+    (wof_shared.turn_state.build_ai_player_payload); this file is only for the CLI.
+    """
+    payload = build_ai_player_payload()
+    if payload is None:
         print("No current_game_id set")
         return
-    import json as _json
-    # Fetch fields from Redis
-    puzzle = r.hget(f"game:{game_id}", "puzzle")
-    theme = r.hget(f"game:{game_id}", "theme")
-    status = r.hget(f"game:{game_id}", "status")
-    # Prefer consonants-specific list if available
-    guessed_consonants_raw = r.hget(f"game:{game_id}", "guessed_consonants")
-    # Backward-compatibility: some games may store all letters in 'guessed_letters'
-    guessed_letters_raw = r.hget(f"game:{game_id}", "guessed_letters")
-    guessed_vowels_raw = r.hget(f"game:{game_id}", "guessed_vowels")
-    scores_raw = r.hget(f"game:{game_id}", "scores")
-    player = r.hget(f"game:{game_id}", "player")
-
-    # Coerce JSON-like fields safely
-    def _coerce_json(s, default):
-        try:
-            return _json.loads(s) if s not in (None, "", "null") else default
-        except Exception:
-            return default
-
-    # guessed_letters should represent consonants used in examples and AI inputs
-    guessed_consonants = _coerce_json(guessed_consonants_raw, None)
-    if guessed_consonants is None:
-        # Fallback to 'guessed_letters' if consonants-specific key isn't present
-        guessed_consonants = _coerce_json(guessed_letters_raw, [])
-    guessed_letters = guessed_consonants
-    guessed_vowels = _coerce_json(guessed_vowels_raw, [])
-    scores = _coerce_json(scores_raw, {"AI1": 0, "AI2": 0, "Human": 0})
-
-    payload = {
-        "puzzle": puzzle,
-        "theme": theme,
-        "status": status,
-        "guessed_letters": guessed_letters,
-        "guessed_vowels": guessed_vowels,
-        "scores": scores,
-        "player": player,
-    }
-    payload_json = _json.dumps(payload)
-
-    # Write payload to file under ai_player data folder
-    import os as _os
-    out_dir = _os.path.join("ai_player", "data")
-    _os.makedirs(out_dir, exist_ok=True)
-    out_path = _os.path.join(out_dir, "prompt.json")
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(payload_json)
+    # The file may be used much later: let the tools read the game fresh
+    payload.pop("state", None)
+
+    out_path = Path("ai_player") / "data" / "prompt.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(codec.dumps(payload), encoding="utf-8")
 
     # Return a command that reads the file
-    cmd = (
-        f"nat run --config_file ai_player/configs/config.yml --input \"$(cat {out_path})\""
-    )
-    return cmd
+    return f"nat run --config_file ai_player/configs/config.yml --input \"$(cat {out_path})\""
 
 def human_turn():
-    game_id = r.get("current_game_id")
+    game_id = r.get(keys.CURRENT_GAME_ID)
     if not game_id:
         print("No current_game_id set")
         return
@@ -105,6 +71,105 @@ def human_turn():
     else:
         print("Invalid action")
 
+def _server_id(client):
+    pool = getattr(client, "connection_pool", None)
+    if pool is None:  # e.g. RedisCluster: one logical server
+        return id(client)
+    kwargs = pool.connection_kwargs
+    return kwargs.get("path") or kwargs.get("host"), kwargs.get("port"), kwargs.get("db", 0)
+
+
+def _copy_key(src, dst, key: str, new_key: str) -> bool:
+    """Copy one hash/string key (with its TTL) from `src` to `dst`."""
+    kind = src.type(key)
+    ttl = src.pttl(key)
+    pipe = dst.pipeline(transaction=True)
+    pipe.delete(new_key)
+    if kind == "hash":
+        pipe.hset(new_key, mapping=src.hgetall(key))
+    elif kind == "string":
+        pipe.set(new_key, src.get(key))
+    else:
+        print(f"Skipping {key}: unsupported type {kind}")
+        return False
+    if ttl and ttl > 0:
+        pipe.pexpire(new_key, ttl)
+    pipe.execute()
+    return True
+
+
+def migrate_keys(dry_run: bool = False):
+    """Move game keys to the hash-tagged layout and onto their shard.
+
+    Untagged keys (game:<id>, game:<id>:answer) are renamed to game:{<id>} /
+    game:{<id>}:answer; with REDIS_SHARDS set, tagged keys found on the primary
+    server are moved to the shard that owns their game. Safe to re-run.
+    """
+    moved = skipped = 0
+    primary = _server_id(r)
+    for key in list(r.scan_iter(match="game:*", count=500)):
+        game_id = keys.legacy_game_id(key)
+        if game_id is not None:
+            new_key = keys.answer_key(game_id) if key.endswith(":answer") else keys.game_key(game_id)
+        elif key.startswith("game:{") and "}" in key:
+            game_id, new_key = key[len("game:{"):key.index("}")], key
+        else:
+            continue
+        target = get_game_redis(game_id)
+        if new_key == key and (not get_shards() or _server_id(target) == primary):
+            skipped += 1
+            continue
+        print(f"{'Would move' if dry_run else 'Moving'} {key} -> {new_key}"
+              f" (shard {_server_id(target)})")
+        if dry_run:
+            moved += 1
+            continue
+        if _copy_key(r, target, key, new_key):
+            if new_key != key or _server_id(target) != primary:
+                r.delete(key)
+            moved += 1
+    print(f"{'Would move' if dry_run else 'Moved'} {moved} key(s); {skipped} already in place")
+    return moved
+
+def _option(args, name: str, default, cast=int):
+    """Value of `--name N` in `args` (converted by `cast`), else `default`."""
+    if name in args and args.index(name) + 1 < len(args):
+        return cast(args[args.index(name) + 1])
+    return default
+
+
+def _progress(records, label: str, every: int = 10000):
+    """Pass `records` through, reporting count and rate on stderr."""
+    started = time.perf_counter()
+    count = 0
+    for record in records:
+        yield record
+        count += 1
+        if count % every == 0:
+            elapsed = time.perf_counter() - started
+            print(f"{label} {count} games ({count / elapsed:.0f}/s)", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    print(f"{label} {count} games in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f}/s)", file=sys.stderr)
+
+
+def export_games(path: str = "-", batch: int = archive.DEFAULT_BATCH) -> int:
+    """Stream every game (hash, answer, event log) to NDJSON at `path` ('-' = stdout, *.gz = gzip)."""
+    with archive.open_ndjson(path, "w") as out:
+        return archive.write_ndjson(_progress(archive.iter_games(batch), "Exported"), out)
+
+
+def import_games(path: str = "-", batch: int = archive.DEFAULT_BATCH) -> int:
+    """Load games from an export, replacing games with the same id."""
+    with archive.open_ndjson(path, "r") as f:
+        return archive.import_games(_progress(archive.read_ndjson(f), "Imported"), batch)
+
+def _print_memory_report(rows) -> None:
+    print(f"{'Pattern':<32} {'Type':<8} {'Keys':>10} {'Bytes':>14} {'Avg':>10}")
+    for row in rows:
+        size = row["bytes"]
+        avg = f"{size / row['keys']:.0f}" if size is not None and row["keys"] else "-"
+        print(f"{row['pattern'][:32]:<32} {row['type']:<8} {row['keys']:>10} {size if size is not None else '-':>14} {avg:>10}")
+
 if __name__ == '__main__':
     if len(sys.argv) > 1:
         if sys.argv[1] == "finished":
@@ -113,9 +178,32 @@ if __name__ == '__main__':
             set_turn(sys.argv[2])
         elif sys.argv[1] == "hello":
             hello_redis()
+        elif sys.argv[1] == "pool_stats":
+            r.ping()
+            print(pool_stats())
         elif sys.argv[1] == "generate_ai_player_prompt":
             print(generate_ai_player_prompt())
         elif sys.argv[1] == "human_turn":
             human_turn()
+        elif sys.argv[1] in ("export_games", "import_games"):
+            args = sys.argv[2:]
+            path = args[0] if args and not args[0].startswith("--") else "-"
+            command = export_games if sys.argv[1] == "export_games" else import_games
+            command(path, _option(args, "--batch", archive.DEFAULT_BATCH))
+        elif sys.argv[1] in ("finish_stale_games", "purge_games", "rebuild_active_index", "memory_report"):
+            args = sys.argv[2:]
+            scan = {"batch": _option(args, "--batch", archive.DEFAULT_BATCH), "pause": _option(args, "--pause", 0.0, float)}
+            if sys.argv[1] == "finish_stale_games":
+                print(maintenance.finish_stale_games(
+                    _option(args, "--idle", 3600.0, float), dry_run="--dry-run" in args, **scan))
+            elif sys.argv[1] == "purge_games":
+                print(maintenance.purge_games(
+                    _option(args, "--older-than", 30 * 86400.0, float), dry_run="--dry-run" in args, **scan))
+            elif sys.argv[1] == "rebuild_active_index":
+                print(f"{maintenance.rebuild_active_index(**scan)} active game(s) indexed in {keys.ACTIVE_GAMES}")
+            else:
+                _print_memory_report(maintenance.memory_report(**scan))
+        elif sys.argv[1] == "migrate_keys":
+            migrate_keys(dry_run="--dry-run" in sys.argv[2:])
         else:
             print("Invalid command")
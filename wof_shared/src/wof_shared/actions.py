@@ -0,0 +1,129 @@
+"""Non-interactive turn actions (spin / buy vowel / solve) on the current game.
+
+These mirror the rules in human/human_cli.py but take the player's choice as an
+argument instead of prompting, so servers and scripted players can share them.
+Each returns a result dict with an 'end_turn' flag and appends the action to
+the game's event log; advancing the turn is left to the caller (see
+state.next_turn).
+"""
+import re
+from typing import Any, Dict, Optional
+
+from . import metrics
+from .constants import VOWELS, VOWEL_COST
+from .wheel import spin_wheel
+from .state import (
+    add_guessed_letter,
+    append_event,
+    get_answer,
+    hget,
+    hget_json,
+    make_event,
+    resolve_display_name,
+    reveal_letter,
+    set_current_game_status_finished,
+    set_score,
+    spend_score,
+    update_game_field,
+    update_score,
+)
+
+
+class InvalidMove(ValueError):
+    """Raised when a requested letter/solution is not a legal move."""
+
+
+def _logged(result: Dict[str, Any], source: str, **fields) -> Dict[str, Any]:
+    append_event(make_event(result["action"], result["player"], source, end_turn=result["end_turn"], **fields))
+    return result
+
+
+def is_consonant(ch: str) -> bool:
+    ch = (ch or "").upper()
+    return len(ch) == 1 and ch.isalpha() and ch not in VOWELS
+
+
+def is_vowel(ch: str) -> bool:
+    ch = (ch or "").upper()
+    return len(ch) == 1 and ch in VOWELS
+
+
+def spin(player: str, consonant: str, wedge: Optional[str] = None, source: str = "human") -> Dict[str, Any]:
+    """Spin the wheel (or use `wedge`) and guess `consonant` for `player`."""
+    consonant = (consonant or "").strip().upper()
+    if not is_consonant(consonant):
+        raise InvalidMove("Please enter a single consonant (A/E/I/O/U are vowels).")
+    if consonant in hget_json("guessed_consonants", []):
+        raise InvalidMove("That consonant was already guessed.")
+
+    wedge = wedge or spin_wheel()
+    metrics.WEDGES.labels(metrics.wedge_outcome(wedge)).inc()
+    result: Dict[str, Any] = {"action": "spin", "player": player, "wedge": wedge, "letter": None, "occurrences": 0, "earned": 0}
+
+    if wedge.upper() == "BANKRUPT":
+        set_score(player, 0)
+        result["end_turn"] = True
+        return _logged(result, source, wedge=wedge, letter=None, occurrences=0, earned=0)
+
+    if wedge.upper() == "LOSE A TURN":
+        result["end_turn"] = True
+        return _logged(result, source, wedge=wedge, letter=None, occurrences=0, earned=0)
+
+    occurrences = reveal_letter(consonant)
+    add_guessed_letter(consonant, is_vowel=False)
+    amount = int(wedge) if wedge.isdigit() else 0
+    if occurrences > 0:
+        update_score(player, amount * occurrences)
+    result.update({
+        "letter": consonant,
+        "occurrences": occurrences,
+        "earned": amount * occurrences,
+        "end_turn": occurrences == 0,
+    })
+    return _logged(result, source, wedge=wedge, letter=consonant, occurrences=occurrences, earned=result["earned"])
+
+
+def buy_vowel(player: str, vowel: str, source: str = "human") -> Dict[str, Any]:
+    """Buy `vowel` for VOWEL_COST; insufficient funds leaves the turn open."""
+    vowel = (vowel or "").strip().upper()
+    if not is_vowel(vowel):
+        raise InvalidMove("Please enter a single vowel (A/E/I/O/U).")
+    if vowel in hget_json("guessed_vowels", []):
+        raise InvalidMove("That vowel was already bought.")
+
+    paid, balance = spend_score(player, VOWEL_COST)
+    if not paid:
+        return {
+            "action": "buy_vowel",
+            "player": player,
+            "success": False,
+            "details": f"Insufficient funds. You have {balance}, need {VOWEL_COST}.",
+            "end_turn": False,
+        }
+
+    occurrences = reveal_letter(vowel)
+    add_guessed_letter(vowel, is_vowel=True)
+    return _logged({
+        "action": "buy_vowel",
+        "player": player,
+        "success": True,
+        "letter": vowel,
+        "occurrences": occurrences,
+        "end_turn": occurrences == 0,
+    }, source, letter=vowel, occurrences=occurrences, cost=VOWEL_COST)
+
+
+def solve(player: str, attempt: str, source: str = "human") -> Dict[str, Any]:
+    """Check `attempt` against the answer; a correct solve finishes the game."""
+    attempt = (attempt or "").strip().upper()
+    answer = (get_answer() or "").upper()
+    norm_attempt = re.sub(r"[^A-Z]", "", attempt)
+    norm_answer = re.sub(r"[^A-Z]", "", answer)
+    solved = bool(answer) and norm_attempt == norm_answer
+    if solved:
+        update_game_field("puzzle", answer)
+        update_game_field("winner", resolve_display_name(player))
+        set_current_game_status_finished()
+        metrics.observe_game_finished(hget("started_at"))
+    result = {"action": "solve", "player": player, "attempt": attempt, "success": solved, "end_turn": True}
+    return _logged(result, source, attempt=attempt, success=solved)
@@ -0,0 +1,240 @@
+"""Offline reports over exported games (see wof_shared.archive).
+
+    python -m wof_shared.analytics games.ndjson.gz [more.ndjson ...]
+    python -m wof_shared.analytics --redis           # live games, read with SCAN
+    python -m wof_shared.analytics games.ndjson --json
+
+Games stream through generators (read line, summarize into one small row,
+aggregate in chunks), so memory stays constant whatever the archive size: the
+aggregate keeps per-theme turn histograms and a few counters, never the games.
+With numpy installed (the 'strategy' extra) each chunk is summed as arrays;
+without it the same totals are computed in pure Python.
+
+Reports:
+    turns to solve by theme   turns with an event-log entry ending them, finished games
+    BANKRUPT frequency        share of logged spins landing on BANKRUPT
+    vowel hit rate            bought vowels present in the answer (from guessed_vowels)
+    win rate                  finished games won by an AI vs a human player
+"""
+import argparse
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO
+
+from . import archive, codec
+from .constants import STATUS_FINISHED
+
+try:
+    import numpy as _np
+except ImportError:  # optional: pure-Python aggregation
+    _np = None
+
+CHUNK_SIZE = 4096
+
+
+class GameRow(NamedTuple):
+    theme: str
+    finished: bool
+    turns: int  # 0 when the game has no event log
+    spins: int
+    bankrupts: int
+    vowel_buys: int
+    vowel_hits: int
+    winner_source: Optional[str]  # "ai", "human" or None
+
+
+def _source_of(player_id: str) -> str:
+    return "ai" if str(player_id).lower().startswith("ai") else "human"
+
+
+def summarize(record: Dict[str, Any]) -> GameRow:
+    """Reduce one exported game to the counters the reports need."""
+    game = codec.decode_game(record.get("game") or {})
+    answer = (record.get("answer") or "").upper()
+    events = record.get("events") or []
+    finished = game.get("status") == STATUS_FINISHED
+
+    vowels = game.get("guessed_vowels") or []
+    spins = [e for e in events if e.get("action") == "spin"]
+    turns = sum(1 for e in events if e.get("end_turn"))
+    if events and not events[-1].get("end_turn"):
+        turns += 1  # the game ended (or the export was taken) mid-turn
+
+    winner_source = None
+    if finished:
+        solves = [e for e in events if e.get("action") == "solve" and e.get("success")]
+        if solves:
+            winner_source = solves[-1].get("source") or _source_of(solves[-1].get("player"))
+        elif game.get("winner"):
+            players = game.get("players") or {}
+            ids = [pid for pid, name in players.items() if name == game["winner"]] or [game["winner"]]
+            winner_source = _source_of(ids[0])
+
+    return GameRow(
+        theme=game.get("theme") or "(none)",
+        finished=finished,
+        turns=turns,
+        spins=len(spins),
+        bankrupts=sum(1 for e in spins if "BANKRUPT" in str(e.get("wedge", "")).upper()),
+        vowel_buys=len(vowels),
+        vowel_hits=sum(1 for v in vowels if v and v.upper() in answer),
+        winner_source=winner_source,
+    )
+
+
+@dataclass
+class Report:
+    games: int = 0
+    finished: int = 0
+    spins: int = 0
+    bankrupts: int = 0
+    vowel_buys: int = 0
+    vowel_hits: int = 0
+    wins: Counter = field(default_factory=Counter)
+    # theme -> {turns: finished games solved in that many turns}
+    turns_by_theme: Dict[str, Counter] = field(default_factory=dict)
+
+    def add_rows(self, rows: List[GameRow]) -> None:
+        for row in rows:
+            self.games += 1
+            self.finished += row.finished
+            self.spins += row.spins
+            self.bankrupts += row.bankrupts
+            self.vowel_buys += row.vowel_buys
+            self.vowel_hits += row.vowel_hits
+            if row.winner_source:
+                self.wins[row.winner_source] += 1
+            if row.finished and row.turns:
+                self.turns_by_theme.setdefault(row.theme, Counter())[row.turns] += 1
+
+    def add_columns(self, rows: List[GameRow]) -> None:
+        """Same as add_rows, summing the chunk as numpy arrays."""
+        cols = GameRow(*(list(c) for c in zip(*rows)))
+        finished = _np.asarray(cols.finished, dtype=bool)
+        turns = _np.asarray(cols.turns, dtype=_np.int64)
+        self.games += len(rows)
+        self.finished += int(finished.sum())
+        self.spins += int(_np.sum(cols.spins))
+        self.bankrupts += int(_np.sum(cols.bankrupts))
+        self.vowel_buys += int(_np.sum(cols.vowel_buys))
+        self.vowel_hits += int(_np.sum(cols.vowel_hits))
+        self.wins.update(s for s in cols.winner_source if s)
+        solved = finished & (turns > 0)
+        if not solved.any():
+            return
+        themes, inverse = _np.unique(_np.asarray(cols.theme, dtype=object)[solved], return_inverse=True)
+        solved_turns = turns[solved]
+        for i, theme in enumerate(themes):
+            values, counts = _np.unique(solved_turns[inverse == i], return_counts=True)
+            hist = self.turns_by_theme.setdefault(str(theme), Counter())
+            for value, count in zip(values.tolist(), counts.tolist()):
+                hist[value] += count
+
+    def rate(self, part: int, whole: int) -> Optional[float]:
+        return part / whole if whole else None
+
+    def theme_rows(self) -> List[Dict[str, Any]]:
+        rows = []
+        for theme, hist in sorted(self.turns_by_theme.items()):
+            n = sum(hist.values())
+            rows.append({
+                "theme": theme,
+                "games": n,
+                "mean_turns": sum(t * c for t, c in hist.items()) / n,
+                "p50_turns": _percentile(hist, 0.5),
+                "p90_turns": _percentile(hist, 0.9),
+            })
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished_wins = sum(self.wins.values())
+        return {
+            "games": self.games,
+            "finished": self.finished,
+            "turns_to_solve_by_theme": self.theme_rows(),
+            "bankrupt_rate": self.rate(self.bankrupts, self.spins),
+            "spins": self.spins,
+            "vowel_hit_rate": self.rate(self.vowel_hits, self.vowel_buys),
+            "vowel_buys": self.vowel_buys,
+            "win_rate": {source: self.rate(self.wins[source], finished_wins) for source in ("ai", "human")},
+        }
+
+
+def _percentile(hist: Counter, q: float) -> int:
+    """Smallest value with at least `q` of the histogram's mass at or below it."""
+    target = q * sum(hist.values())
+    seen = 0
+    for value in sorted(hist):
+        seen += hist[value]
+        if seen >= target:
+            return value
+    return 0
+
+
+def aggregate(records: Iterable[Dict[str, Any]], use_numpy: Optional[bool] = None, chunk_size: int = CHUNK_SIZE) -> Report:
+    """Build a Report from exported game records in one streaming pass."""
+    use_numpy = _np is not None if use_numpy is None else use_numpy and _np is not None
+    report = Report()
+    for chunk in archive._chunks(map(summarize, records), chunk_size):
+        if use_numpy:
+            report.add_columns(chunk)
+        else:
+            report.add_rows(chunk)
+    return report
+
+
+def iter_files(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    for path in paths:
+        with archive.open_ndjson(path) as f:
+            yield from archive.read_ndjson(f)
+
+
+def _pct(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1%}"
+
+
+def print_report(report: Report, out: Optional[TextIO] = None) -> None:
+    summary = report.to_dict()
+    print(f"Games: {summary['games']} ({summary['finished']} finished)", file=out)
+    print("", file=out)
+    print(f"{'Theme':<28} {'Solved':>7} {'Mean turns':>11} {'p50':>5} {'p90':>5}", file=out)
+    for row in summary["turns_to_solve_by_theme"]:
+        print(
+            f"{row['theme'][:28]:<28} {row['games']:>7} {row['mean_turns']:>11.1f} {row['p50_turns']:>5} {row['p90_turns']:>5}",
+            file=out,
+        )
+    print("", file=out)
+    print(f"{'Metric':<28} {'Rate':>7} {'Of':>11}", file=out)
+    print(f"{'BANKRUPT per spin':<28} {_pct(summary['bankrupt_rate']):>7} {summary['spins']:>11}", file=out)
+    print(f"{'Vowel purchase hit':<28} {_pct(summary['vowel_hit_rate']):>7} {summary['vowel_buys']:>11}", file=out)
+    wins = sum(report.wins.values())
+    print(f"{'AI wins':<28} {_pct(summary['win_rate']['ai']):>7} {wins:>11}", file=out)
+    print(f"{'Human wins':<28} {_pct(summary['win_rate']['human']):>7} {wins:>11}", file=out)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Summary tables over exported Wheel of Fortune games.")
+    parser.add_argument("paths", nargs="*", help="NDJSON exports ('-' = stdin, *.gz supported)")
+    parser.add_argument("--redis", action="store_true", help="also read the live games from Redis")
+    parser.add_argument("--batch", type=int, default=archive.DEFAULT_BATCH, help="games per Redis round trip")
+    parser.add_argument("--no-numpy", action="store_true", help="aggregate in pure Python")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+    if not args.paths and not args.redis:
+        parser.error("give export files and/or --redis")
+
+    records = iter_files(args.paths)
+    if args.redis:
+        records = chain(records, archive.iter_games(args.batch))
+    report = aggregate(records, use_numpy=not args.no_numpy)
+    if args.json:
+        print(codec.dumps(report.to_dict()))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Streaming export/import of games as NDJSON (backups, migrations, analytics).
+
+One line per game, with the hash fields exactly as stored:
+
+    {"game_id": "42", "game": {"puzzle": "...", "scores": "{...}", ...}, "answer": "...", "events": [{...}, ...]}
+
+Export walks every game server (each REDIS_SHARDS shard, else the primary)
+with SCAN and reads `batch` games per pipelined round trip (HGETALL, answer
+GET and event LRANGE per game), writing lines as it goes, so memory is bounded
+by one batch however many games there are. SCAN can return a key twice while
+the key space changes; import replaces each game's keys, so a repeated line
+is harmless. Import writes `batch` games per pipeline, then adds that batch's
+active games to the active-game index (and drops the others from it), and
+finally raises the game id counter past the highest imported id.
+
+    python pat/src/pat/redis_admin.py export_games games.ndjson.gz
+    python pat/src/pat/redis_admin.py import_games games.ndjson.gz
+"""
+import gzip
+import io
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+import redis
+from redis.exceptions import WatchError
+
+from . import codec, keys
+from .constants import STATUS_ACTIVE
+from .redis_client import get_redis, get_shards, shard_index
+
+DEFAULT_BATCH = 500
+
+GameRecord = Dict[str, Any]
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[List]:
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def game_servers() -> List[redis.Redis]:
+    """Every server holding game keys: the shards, else the primary."""
+    return list(get_shards()) or [get_redis()]
+
+
+def iter_game_ids(client: redis.Redis, count: int = DEFAULT_BATCH) -> Iterator[str]:
+    """Ids of the game hashes on one server (SCAN, so it never blocks the server)."""
+    for key in client.scan_iter(match="game:{*}", count=count, _type="hash"):
+        if key.endswith("}"):
+            yield key[len("game:{"):-1]
+
+
+def iter_games(batch: int = DEFAULT_BATCH) -> Iterator[GameRecord]:
+    """Every game with its answer and event log, read `batch` games per round trip."""
+    for client in game_servers():
+        for ids in _chunks(iter_game_ids(client, batch), batch):
+            pipe = client.pipeline(transaction=False)
+            for game_id in ids:
+                pipe.hgetall(keys.game_key(game_id))
+                pipe.get(keys.answer_key(game_id))
+                pipe.lrange(keys.events_key(game_id), 0, -1)
+            replies = pipe.execute()
+            for i, game_id in enumerate(ids):
+                game, answer, events = replies[3 * i:3 * i + 3]
+                if game:  # deleted between SCAN and the read
+                    yield {
+                        "game_id": game_id,
+                        "game": game,
+                        "answer": answer,
+                        "events": [codec.loads(e) for e in events],
+                    }
+
+
+@contextmanager
+def open_ndjson(path: str, mode: str = "r"):
+    """Text handle for `path`: '-' is stdin/stdout, '*.gz' is gzip-compressed."""
+    if path == "-":
+        yield sys.stdin if mode == "r" else sys.stdout
+    elif path.endswith(".gz"):
+        with gzip.open(path, mode + "t", encoding="utf-8") as f:
+            yield f
+    else:
+        with open(path, mode, encoding="utf-8", buffering=io.DEFAULT_BUFFER_SIZE * 16) as f:
+            yield f
+
+
+def write_ndjson(records: Iterable[GameRecord], out: TextIO) -> int:
+    count = 0
+    for record in records:
+        out.write(codec.dumps(record))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[GameRecord]:
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield codec.loads(line)
+
+
+def export_games(out: TextIO, batch: int = DEFAULT_BATCH) -> int:
+    """Write every game to `out` as NDJSON; returns the number of games."""
+    return write_ndjson(iter_games(batch), out)
+
+
+def import_games(records: Iterable[GameRecord], batch: int = DEFAULT_BATCH) -> int:
+    """Write `records` (replacing existing games with the same id); returns the number written."""
+    shards = get_shards()
+    primary = get_redis()
+    count = highest = 0
+    for chunk in _chunks(records, batch):
+        pipes: Dict[int, Any] = {}
+        indexed: Dict[bool, List[str]] = {True: [], False: []}
+        for record in chunk:
+            game_id = str(record["game_id"])
+            indexed[(record.get("game") or {}).get("status") == STATUS_ACTIVE].append(game_id)
+            index = shard_index(game_id, len(shards))
+            pipe = pipes.get(index)
+            if pipe is None:
+                pipe = pipes[index] = (shards[index] if shards else primary).pipeline(transaction=False)
+            pipe.delete(keys.game_key(game_id), keys.answer_key(game_id), keys.events_key(game_id))
+            if record.get("game"):
+                pipe.hset(keys.game_key(game_id), mapping=record["game"])
+            if record.get("answer") is not None:
+                pipe.set(keys.answer_key(game_id), record["answer"])
+            if record.get("events"):
+                pipe.rpush(keys.events_key(game_id), *(codec.dumps(e) for e in record["events"]))
+            if game_id.isdigit():
+                highest = max(highest, int(game_id))
+        for pipe in pipes.values():
+            pipe.execute()
+        # The index lives on the primary; update it once the games themselves are written
+        index_pipe = primary.pipeline(transaction=False)
+        if indexed[True]:
+            index_pipe.sadd(keys.ACTIVE_GAMES, *indexed[True])
+        if indexed[False]:
+            index_pipe.srem(keys.ACTIVE_GAMES, *indexed[False])
+        index_pipe.execute()
+        count += len(chunk)
+    _raise_game_id_counter(highest)
+    return count
+
+
+def _raise_game_id_counter(at_least: int) -> None:
+    """Make sure new games get ids above the imported ones."""
+    r = get_redis()
+    with r.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                pipe.watch(keys.GAME_ID_COUNTER)
+                if int(pipe.get(keys.GAME_ID_COUNTER) or 0) >= at_least:
+                    pipe.unwatch()
+                    return
+                pipe.multi()
+                pipe.set(keys.GAME_ID_COUNTER, at_least)
+                pipe.execute()
+                return
+            except WatchError:
+                continue
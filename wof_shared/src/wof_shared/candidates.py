@@ -0,0 +1,171 @@
+"""Candidate-answer index over the puzzle corpus, for letter-picking strategies.
+
+Answers are grouped by their fully-masked shape (word lengths and punctuation),
+and each group is stored as NumPy arrays:
+
+    chars    (N, L) uint8   letter code 0-25 per position, NO_LETTER elsewhere
+    presence (N,)   uint32  bitset of letters present in the answer
+    counts   (N, 26) int16  occurrences of each letter
+
+Given a masked puzzle and the letters already guessed, `candidates()` keeps the
+answers consistent with what is revealed (bitset test for absent letters, then
+position checks), and `score_letters()` scores every unguessed letter over the
+survivors in one vectorized pass. Requires numpy (the 'strategy' extra).
+"""
+import string
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .corpus import iter_puzzles
+
+ALPHABET = string.ascii_uppercase
+NO_LETTER = 255
+
+
+def mask_tokens(masked: str) -> List[str]:
+    """Split a state mask ("_ E _ * _") into one token per answer character (' ' for word breaks)."""
+    tokens = (masked or "").split(" ")
+    return [" " if t == "*" else t for t in tokens if t != ""]
+
+
+def _shape(chars: Sequence[str]) -> str:
+    return "".join("_" if c.isalpha() else c for c in chars)
+
+
+def _bit(letter: str) -> int:
+    return 1 << ALPHABET.index(letter)
+
+
+def letter_codes(letters: Sequence[str]) -> np.ndarray:
+    return np.array([ord(c.upper()) - 65 for c in letters], dtype=np.intp)
+
+
+class CandidateIndex:
+    def __init__(self, puzzles: Iterable[Tuple[str, str]]):
+        grouped: Dict[str, List[Tuple[str, str]]] = {}
+        for answer, theme in puzzles:
+            answer = answer.upper()
+            grouped.setdefault(_shape(answer), []).append((answer, theme))
+
+        self.groups: Dict[str, Dict] = {}
+        for shape, rows in grouped.items():
+            n, length = len(rows), len(shape)
+            chars = np.full((n, length), NO_LETTER, dtype=np.uint8)
+            counts = np.zeros((n, 26), dtype=np.int16)
+            presence = np.zeros(n, dtype=np.uint32)
+            for i, (answer, _) in enumerate(rows):
+                for j, ch in enumerate(answer):
+                    if ch in ALPHABET:
+                        code = ord(ch) - 65
+                        chars[i, j] = code
+                        counts[i, code] += 1
+                        presence[i] |= np.uint32(1 << code)
+            self.groups[shape] = {
+                "answers": [a for a, _ in rows],
+                "themes": np.array([t for _, t in rows], dtype=object),
+                "chars": chars,
+                "counts": counts,
+                "presence": presence,
+            }
+
+    def __len__(self) -> int:
+        return sum(len(g["answers"]) for g in self.groups.values())
+
+    def candidates(self, masked: str, guessed: Iterable[str]):
+        """Return (group, row indices) of answers consistent with `masked` and `guessed`."""
+        tokens = mask_tokens(masked)
+        group = self.groups.get(_shape(["A" if t == "_" else t for t in tokens]))
+        if group is None:
+            return None, np.empty(0, dtype=np.intp)
+
+        revealed = {t for t in tokens if len(t) == 1 and t in ALPHABET}
+        absent = {g.upper() for g in guessed if g and g.upper() in ALPHABET} - revealed
+        absent_bits = 0
+        for letter in absent:
+            absent_bits |= _bit(letter)
+
+        # Bitset pass: drop answers containing a letter already guessed as absent
+        keep = (group["presence"] & np.uint32(absent_bits)) == 0
+        chars = group["chars"]
+        hidden = [j for j, t in enumerate(tokens) if t == "_"]
+        for j, t in enumerate(tokens):
+            if t in revealed:
+                keep &= chars[:, j] == (ord(t) - 65)
+        if hidden and revealed:
+            # Revealing shows every occurrence, so hidden cells cannot hold a revealed letter
+            blocked = np.zeros(256, dtype=bool)
+            blocked[[ord(t) - 65 for t in revealed]] = True
+            keep &= ~blocked[chars[:, hidden]].any(axis=1)
+        return group, np.flatnonzero(keep)
+
+    @staticmethod
+    def weights(group: Dict, rows: np.ndarray, theme: Optional[str] = None, theme_weight: float = 3.0) -> np.ndarray:
+        """Prior probability of each surviving row; same-theme answers weigh `theme_weight`."""
+        weights = np.ones(rows.size)
+        if theme:
+            weights[group["themes"][rows] == theme] = theme_weight
+        return weights / weights.sum()
+
+    @staticmethod
+    def outcome_keys(group: Dict, rows: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """(n, k) uint64 keys: the set of cells letter k reveals in row n.
+
+        Rows with equal keys stay indistinguishable after guessing that letter,
+        so grouping by key gives the candidate split (first 64 cells only).
+        """
+        chars = group["chars"][rows][:, : 64]
+        place = np.left_shift(np.uint64(1), np.arange(chars.shape[1], dtype=np.uint64))
+        return np.einsum("nlk,l->nk", (chars[:, :, None] == codes[None, None, :]).astype(np.uint64), place)
+
+    def score_letters(
+        self,
+        masked: str,
+        guessed: Iterable[str],
+        letters: Sequence[str],
+        theme: Optional[str] = None,
+        objective: str = "reveal",
+        theme_weight: float = 3.0,
+    ) -> Dict[str, float]:
+        """Score each of `letters` over the surviving candidates.
+
+        objective="reveal": expected number of cells the letter reveals.
+        objective="entropy": expected information (bits) from the outcome, i.e.
+        how much it splits the candidate set. Candidates of the same theme are
+        weighted by `theme_weight`. Empty dict when no candidate survives.
+        """
+        group, rows = self.candidates(masked, guessed)
+        if group is None or rows.size == 0:
+            return {}
+        weights = self.weights(group, rows, theme, theme_weight)
+
+        codes = letter_codes(letters)
+        counts = group["counts"][rows][:, codes]  # (n, k)
+        if objective != "entropy":
+            return dict(zip(letters, (weights @ counts).tolist()))
+
+        keys = self.outcome_keys(group, rows, codes)
+        scores: Dict[str, float] = {}
+        for i, letter in enumerate(letters):
+            _, inverse = np.unique(keys[:, i], return_inverse=True)
+            probs = np.bincount(inverse.ravel(), weights=weights)
+            probs = probs[probs > 0]
+            scores[letter] = float(-(probs * np.log2(probs)).sum())
+        return scores
+
+    def best_letter(self, masked: str, guessed: Iterable[str], letters: Sequence[str], **kwargs) -> Optional[str]:
+        """Highest-scoring letter (ties keep `letters` order); None without candidates."""
+        scores = self.score_letters(masked, guessed, letters, **kwargs)
+        if not scores:
+            return None
+        best = max(scores.values())
+        if best <= 0:
+            return None
+        return next(letter for letter in letters if scores.get(letter) == best)
+
+
+@lru_cache(maxsize=4)
+def load_candidate_index(path: Optional[str] = None) -> CandidateIndex:
+    """Build (once per process and path) the index over the corpus CSV."""
+    return CandidateIndex(iter_puzzles(path))
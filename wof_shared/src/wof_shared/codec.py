@@ -0,0 +1,97 @@
+"""Wire format for game state snapshots and AI tool outputs.
+
+Encoding rule: nested values (scores, guessed letters, revealed positions,
+players) are always native dicts/lists inside a snapshot or tool output and
+are JSON-encoded exactly once, at the outer boundary (a Redis hash field or a
+tool's output string). Never embed an already-encoded JSON string.
+
+Output is compact (no whitespace). orjson is used when installed, otherwise
+the stdlib json module; both produce interchangeable JSON.
+"""
+import json
+from typing import Any, Dict, List, Mapping, Optional, TypedDict
+
+try:
+    import orjson as _orjson
+except ImportError:  # optional speedup
+    _orjson = None
+
+
+class GameSnapshot(TypedDict, total=False):
+    """Decoded game hash (the secret answer is never part of a snapshot)."""
+    puzzle: str
+    theme: str
+    player: str
+    status: str
+    winner: str
+    guessed_consonants: List[str]
+    guessed_vowels: List[str]
+    revealed: List[int]
+    scores: Dict[str, int]
+    players: Dict[str, str]
+
+
+# Hash fields stored as JSON, with the value used when a field is missing/corrupt
+JSON_FIELDS: Dict[str, Any] = {
+    "guessed_consonants": [],
+    "guessed_vowels": [],
+    "revealed": [],
+    "scores": {},
+    "players": {},
+}
+
+
+def backend() -> str:
+    return "orjson" if _orjson is not None else "json"
+
+
+def dumps(obj: Any) -> str:
+    """Compact JSON text for `obj`."""
+    if _orjson is not None:
+        # OPT_NON_STR_KEYS keeps parity with json.dumps for int dict keys
+        return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def loads(raw):
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
+
+
+def decode_field(raw: Any, default: Any) -> Any:
+    """Decode one JSON field; values that are already native pass through unchanged."""
+    if raw is None or raw == "":
+        return default
+    if isinstance(raw, (dict, list)):
+        return raw
+    try:
+        return loads(raw)
+    except Exception:
+        return default
+
+
+def decode_game(raw: Mapping[str, Any]) -> GameSnapshot:
+    """Decode a raw HGETALL result into a GameSnapshot."""
+    data: Dict[str, Any] = dict(raw)
+    for field, default in JSON_FIELDS.items():
+        data[field] = decode_field(data.get(field), type(default)())
+    return data  # type: ignore[return-value]
+
+
+def encode_game(snapshot: Mapping[str, Any]) -> Dict[str, str]:
+    """Encode a snapshot (or partial one) into hash field values for HSET."""
+    out: Dict[str, str] = {}
+    for field, value in snapshot.items():
+        if field in JSON_FIELDS:
+            out[field] = value if isinstance(value, str) else dumps(value)
+        else:
+            out[field] = "" if value is None else str(value)
+    return out
+
+
+def scores_of(value: Any) -> Optional[Dict[str, int]]:
+    """Normalize a scores value that may arrive as a JSON string or a dict."""
+    if value is None:
+        return None
+    return decode_field(value, {})
@@ -0,0 +1,19 @@
+import csv
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+# Puzzle corpus shipped with Pat: rows of "puzzle, theme, date, episode, round", no header.
+# Resolved relative to the repo checkout (wof_shared/src/wof_shared -> repo root).
+DEFAULT_CORPUS_PATH = Path(__file__).resolve().parents[3] / "pat" / "src" / "pat" / "data" / "puzzles.csv"
+
+
+def iter_puzzles(path: Union[str, Path, None] = None) -> Iterator[Tuple[str, str]]:
+    """Yield (puzzle, theme) pairs from the corpus CSV, skipping malformed rows."""
+    csv_path = Path(path) if path else DEFAULT_CORPUS_PATH
+    with csv_path.open(newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if not row or len(row) < 2:
+                continue
+            puzzle, theme = row[0].strip(), row[1].strip()
+            if puzzle and theme:
+                yield puzzle, theme
@@ -0,0 +1,133 @@
+"""Expected-value decision engine: solve now, buy a vowel, or spin.
+
+The candidate answers consistent with the board (see candidates.py) give a
+probability for each answer. Each action is valued as the expected bank at
+the end of the turn, counting a solve as `win_value` on top of the player's
+money:
+
+    solve      p_top * (money + win) + (1 - p_top) * future * (money + win)
+    buy_vowel  money - VOWEL_COST, then the turn passes: `future` of the
+               solve value with p_top after the best vowel splits the
+               candidates
+    spin       Monte Carlo over wheel.txt wedges x candidate answers:
+               BANKRUPT -> money 0, turn ends; LOSE A TURN -> turn ends;
+               value    -> money + value * hits of the best consonant,
+                           then the turn passes, so solving with the
+                           sharper p_top is only worth `future` of it
+
+`future` is the share of the prize still reachable when the turn passes to
+another player (an AI turn is a single action). Rollouts are vectorized, so
+a decision takes a few ms. Requires numpy (the 'strategy' extra).
+"""
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .candidates import CandidateIndex, letter_codes, load_candidate_index
+from .constants import VOWEL_COST, VOWELS
+from .wheel import wheel_wedges
+
+CONSONANTS = [c for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ" if c not in VOWELS]
+BANKRUPT = "BANKRUPT"
+LOSE_A_TURN = "LOSE A TURN"
+
+
+def wedge_table():
+    """(values, bankrupt, lose) arrays over wheel.txt wedges; duplicates keep their weight."""
+    wedges = wheel_wedges()
+    values = np.array([int(w) if w.isdigit() else 0 for w in wedges], dtype=np.float64)
+    bankrupt = np.array([w == BANKRUPT for w in wedges])
+    lose = np.array([w == LOSE_A_TURN for w in wedges])
+    return values, bankrupt, lose
+
+
+def _posterior_top(keys: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Per candidate: top answer probability once the letter's outcome for it is seen."""
+    _, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.ravel()
+    mass = np.bincount(inverse, weights=weights)
+    top = np.zeros(mass.size)
+    np.maximum.at(top, inverse, weights)
+    return (top / mass)[inverse]
+
+
+def _solve_value(p: np.ndarray, bank: np.ndarray, win_value: float, future: float) -> np.ndarray:
+    return (p + (1.0 - p) * future) * (bank + win_value)
+
+
+def decide(
+    masked: str,
+    guessed: Iterable[str],
+    money: int,
+    theme: Optional[str] = None,
+    n_rollouts: int = 2000,
+    win_value: float = 1000.0,
+    future_share: float = 1 / 3,
+    index: Optional[CandidateIndex] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Dict:
+    """Pick the action with the highest expected value.
+
+    Returns {"action": "solve"|"buy_vowel"|"spin", "ev": {action: value},
+    "letter": best consonant/vowel for that action, "answer": most likely
+    answer, "p_solve": its probability, "candidates": count}. Falls back to
+    "spin" with empty EVs when no corpus answer fits the board.
+    """
+    index = index or load_candidate_index()
+    rng = rng or np.random.default_rng()
+    guessed = {g.upper() for g in guessed if g}
+    money = max(0, int(money or 0))
+
+    group, rows = index.candidates(masked, guessed)
+    if group is None or rows.size == 0:
+        return {"action": "spin", "ev": {}, "letter": None, "answer": None, "p_solve": 0.0, "candidates": 0}
+
+    weights = index.weights(group, rows, theme)
+    best_row = int(np.argmax(weights))
+    p_top = float(weights[best_row])
+    answer = group["answers"][rows[best_row]]
+    bank = np.array([money], dtype=np.float64)
+
+    ev: Dict[str, float] = {"solve": float(_solve_value(np.array([p_top]), bank, win_value, future_share)[0])}
+    letters: Dict[str, Optional[str]] = {"solve": None}
+
+    counts = group["counts"][rows]
+    vowels = [v for v in VOWELS if v not in guessed]
+    if vowels and money >= VOWEL_COST:
+        codes = letter_codes(vowels)
+        vowel = vowels[int(np.argmax(weights @ counts[:, codes]))]
+        post = _posterior_top(index.outcome_keys(group, rows, letter_codes([vowel]))[:, 0], weights)
+        # As after a spin hit, the sharper solve comes on a later turn
+        ev["buy_vowel"] = float(future_share * (weights @ _solve_value(post, bank - VOWEL_COST, win_value, future_share)))
+        letters["buy_vowel"] = vowel
+
+    consonants = [c for c in CONSONANTS if c not in guessed]
+    if consonants:
+        codes = letter_codes(consonants)
+        consonant = consonants[int(np.argmax(weights @ counts[:, codes]))]
+        code = letter_codes([consonant])
+        post = _posterior_top(index.outcome_keys(group, rows, code)[:, 0], weights)
+        hits = counts[:, code[0]].astype(np.float64)
+
+        values, bankrupt, lose = wedge_table()
+        wedge = rng.integers(0, values.size, size=n_rollouts)
+        row = rng.choice(rows.size, size=n_rollouts, p=weights)
+        new_bank = money + values[wedge] * hits[row]
+        # The solve after a hit comes on a later turn, once the turn has passed
+        outcome = future_share * _solve_value(post[row], new_bank, win_value, future_share)
+        # A miss or LOSE A TURN passes the turn; BANKRUPT also empties the bank
+        passed = future_share * (money + win_value)
+        outcome = np.where((hits[row] == 0) | lose[wedge], passed, outcome)
+        outcome = np.where(bankrupt[wedge], future_share * win_value, outcome)
+        ev["spin"] = float(outcome.mean())
+        letters["spin"] = consonant
+
+    action = max(ev, key=ev.get)
+    return {
+        "action": action,
+        "ev": {k: round(v, 1) for k, v in ev.items()},
+        "letter": letters[action],
+        "answer": answer,
+        "p_solve": round(p_top, 4),
+        "candidates": int(rows.size),
+    }
@@ -0,0 +1,86 @@
+"""No-repeat dealing of corpus indices from a shuffled deck kept in Redis.
+
+Each namespace (e.g. one per player group) has a deck hash `deck:<namespace>`
+holding only the deck size, a shuffle seed, an epoch and a cursor, so it is
+constant-size whatever the corpus size. The i-th card is a keyed pseudo-random
+permutation of i (a small Feistel network over the next power-of-four domain,
+cycle-walked back into range), so dealing is one HINCRBY and O(1) work. Every
+index is dealt once per pass. When the deck runs out, or the corpus size
+changes, the deck is reshuffled with a fresh seed.
+"""
+import hashlib
+import secrets
+from typing import Any, Dict
+
+from redis.exceptions import WatchError
+
+from . import keys
+from .redis_client import get_redis
+
+DEFAULT_NAMESPACE = "default"
+FEISTEL_ROUNDS = 4
+
+
+def _round(value: int, rnd: int, seed: str, mask: int) -> int:
+    digest = hashlib.blake2b(f"{seed}:{rnd}:{value}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & mask
+
+
+def permute(i: int, n: int, seed: str) -> int:
+    """Position `i` of the deck of `n` cards shuffled by `seed` (a bijection on range(n))."""
+    if n <= 1:
+        return 0
+    half = max(1, ((n - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    x = i
+    while True:
+        left, right = x >> half, x & mask
+        for rnd in range(FEISTEL_ROUNDS):
+            left, right = right, left ^ _round(right, rnd, seed, mask)
+        x = (left << half) | right
+        # Cycle-walk: the domain is under 4n, so this loops < 4 times on average
+        if x < n:
+            return x
+
+
+def _reshuffle(namespace: str, size: int, seen_epoch: Any) -> None:
+    """Start a new pass unless another dealer already did (epoch moved on)."""
+    key = keys.deck_key(namespace)
+    with get_redis().pipeline(transaction=True) as pipe:
+        try:
+            pipe.watch(key)
+            if pipe.hget(key, "epoch") != seen_epoch:
+                pipe.unwatch()
+                return
+            pipe.multi()
+            pipe.hset(key, mapping={"size": size, "seed": secrets.token_hex(8), "cursor": 0})
+            pipe.hincrby(key, "epoch", 1)
+            pipe.execute()
+        except WatchError:
+            pass
+
+
+def deal(size: int, namespace: str = DEFAULT_NAMESPACE) -> int:
+    """Next index in range(size) from the namespace's deck, never repeating within a pass."""
+    if size <= 0:
+        raise ValueError("deck size must be positive")
+    key = keys.deck_key(namespace)
+    r = get_redis()
+    while True:
+        pipe = r.pipeline(transaction=True)
+        pipe.hincrby(key, "cursor", 1)
+        pipe.hmget(key, "size", "seed", "epoch")
+        cursor, (stored_size, seed, epoch) = pipe.execute()
+        if seed is not None and int(stored_size) == size and cursor <= size:
+            return permute(cursor - 1, size, seed)
+        _reshuffle(namespace, size, epoch)
+
+
+def deck_status(namespace: str = DEFAULT_NAMESPACE) -> Dict[str, int]:
+    raw = get_redis().hgetall(keys.deck_key(namespace))
+    size = int(raw.get("size") or 0)
+    return {
+        "size": size,
+        "epoch": int(raw.get("epoch") or 0),
+        "dealt": min(size, int(raw.get("cursor") or 0)),
+    }
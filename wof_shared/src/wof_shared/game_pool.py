@@ -0,0 +1,90 @@
+"""Pool of prepared games, so starting a game is one pop instead of a full setup.
+
+A refiller keeps up to `target` games fully written ahead of time: game hash
+(masked puzzle, theme, turn, empty guesses) with status "ready", plus the
+secret answer key. Their ids wait in the `games:ready` list. Starting a game
+pops one id (LPOP hands each id to exactly one caller) and activates it by
+setting the status, players and scores and making it the current game: a
+few small writes, with no CSV parsing or masking in the request path.
+
+    from wof_shared.game_pool import claim_game, refill
+    refill(8, make_puzzle)       # make_puzzle() -> (masked, answer, theme)
+    game_id = claim_game(players) or start_new_game(...)
+"""
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from . import codec, keys
+from .constants import STATUS_ACTIVE
+from .redis_client import get_game_redis, get_redis
+from .state import _initial_game, _initial_scores, _make_current
+
+logger = logging.getLogger(__name__)
+
+STATUS_READY = "ready"
+
+# make_puzzle() -> (masked puzzle, answer, theme)
+PuzzleSource = Callable[[], Tuple[str, str, str]]
+
+
+def prepare_game(masked: str, answer: str, theme: str) -> int:
+    """Write a ready (not yet started) game and queue its id; returns the id."""
+    r = get_redis()
+    game_id = r.incr(keys.GAME_ID_COUNTER)
+    pipe = get_game_redis(game_id).pipeline(transaction=True)
+    pipe.hset(keys.game_key(game_id), mapping=codec.encode_game(_initial_game(masked, theme, None, STATUS_READY)))
+    pipe.set(keys.answer_key(game_id), answer)
+    pipe.execute()
+    r.rpush(keys.READY_GAMES, game_id)
+    return game_id
+
+
+def pool_size() -> int:
+    return int(get_redis().llen(keys.READY_GAMES) or 0)
+
+
+def refill(target: int, make_puzzle: PuzzleSource) -> int:
+    """Top the pool up to `target` ready games; returns how many were added."""
+    added = 0
+    for _ in range(max(0, target - pool_size())):
+        prepare_game(*make_puzzle())
+        added += 1
+    return added
+
+
+def claim_game(players: Optional[Dict[str, str]]) -> Optional[int]:
+    """Pop a ready game, start it for `players` and make it current; None when the pool is empty."""
+    r = get_redis()
+    while True:
+        game_id = r.lpop(keys.READY_GAMES)
+        if game_id is None:
+            return None
+        key = keys.game_key(game_id)
+        pipe = get_game_redis(game_id).pipeline(transaction=True)
+        pipe.exists(key)
+        pipe.hset(key, mapping=codec.encode_game({
+            "status": STATUS_ACTIVE,
+            "players": players,
+            "scores": _initial_scores(players),
+            "started_at": round(time.time(), 3),
+        }))
+        exists, _ = pipe.execute()
+        if exists:
+            _make_current(game_id, players)
+            return int(game_id)
+        # The prepared game was deleted while queued; drop the partial hash and try the next
+        get_game_redis(game_id).delete(key)
+
+
+async def keep_filled(target: int, make_puzzle: PuzzleSource, interval: float = 0.5) -> None:
+    """Refill the pool every `interval` seconds until cancelled (run as a background task)."""
+    while True:
+        try:
+            added = await asyncio.to_thread(refill, target, make_puzzle)
+            if added:
+                logger.debug("Game pool: prepared %d games", added)
+        except Exception as e:
+            logger.warning("Game pool refill failed: %s", e)
+        await asyncio.sleep(interval)
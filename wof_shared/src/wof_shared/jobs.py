@@ -0,0 +1,59 @@
+import json
+import uuid
+from typing import Any, Dict, Optional
+
+from .redis_client import get_redis
+
+# Redis list that AI workers BLPOP "take turn" jobs from
+AI_TURN_QUEUE = "ai_turn_jobs"
+# Results are pushed to a per-job list so the submitter can BLPOP on it
+RESULT_KEY_PREFIX = "ai_turn_result:"
+RESULT_TTL_SECONDS = 3600
+
+
+def _result_key(job_id: str) -> str:
+    return f"{RESULT_KEY_PREFIX}{job_id}"
+
+
+def enqueue_ai_turn(game_id, player: str, queue: str = AI_TURN_QUEUE) -> str:
+    """Queue a "take turn for `player` in game `game_id`" job; returns the job id."""
+    r = get_redis()
+    job_id = uuid.uuid4().hex
+    job = {"job_id": job_id, "game_id": str(game_id), "player": player}
+    r.rpush(queue, json.dumps(job))
+    return job_id
+
+
+def pop_ai_turn(timeout: int = 5, queue: str = AI_TURN_QUEUE) -> Optional[Dict[str, Any]]:
+    """Block up to `timeout` seconds for the next job; None when the queue stayed empty."""
+    r = get_redis()
+    item = r.blpop([queue], timeout=timeout)
+    if not item:
+        return None
+    _, raw = item
+    try:
+        return json.loads(raw)
+    except Exception:
+        return None
+
+
+def publish_ai_turn_result(job_id: str, result: Dict[str, Any]) -> None:
+    r = get_redis()
+    key = _result_key(job_id)
+    pipe = r.pipeline()
+    pipe.rpush(key, json.dumps(result))
+    pipe.expire(key, RESULT_TTL_SECONDS)
+    pipe.execute()
+
+
+def wait_for_ai_turn(job_id: str, timeout: int = 120) -> Optional[Dict[str, Any]]:
+    """Block until a worker publishes the result for `job_id` (or `timeout` expires)."""
+    r = get_redis()
+    item = r.blpop([_result_key(job_id)], timeout=timeout)
+    if not item:
+        return None
+    _, raw = item
+    try:
+        return json.loads(raw)
+    except Exception:
+        return None
@@ -0,0 +1,73 @@
+"""Redis key layout.
+
+Every per-game key carries the game id as a hash tag, so all of a game's keys
+share one Redis Cluster slot (and one shard, see redis_client.get_game_redis)
+and can be used together in MULTI/EXEC transactions and scripts:
+
+    game:{42}            game hash (puzzle, theme, player, status, scores, ...)
+    game:{42}:answer     secret answer (kept out of HGETALL game:{42})
+    game:{42}:lock       turn lease held by the orchestrator acting on the game
+    game:{42}:events     list of JSON action events (spin, buy_vowel, solve), oldest first
+
+Process-wide keys are small single-key counters/pointers and live on the
+primary server:
+
+    game_id_counter      INCR source for new game ids
+    current_game_id      game followed by the single-game CLI tools
+    player_names         default display names (games keep their own in 'players')
+    player_names_version bumped on every display-name write (process-local name caches)
+    games:ready          ids of prepared games waiting to be started (see game_pool)
+    games:{active}       set of active game ids (rebuilt by `redis_admin.py rebuild_active_index`)
+    deck:<namespace>     no-repeat puzzle deck per namespace (see deck)
+
+Games written before this layout used untagged keys (`game:42`,
+`game:42:answer`); `python pat/src/pat/redis_admin.py migrate_keys` moves them.
+"""
+import binascii
+import re
+from typing import Optional
+
+GAME_ID_COUNTER = "game_id_counter"
+CURRENT_GAME_ID = "current_game_id"
+PLAYER_NAMES = "player_names"
+PLAYER_NAMES_VERSION = "player_names_version"
+READY_GAMES = "games:ready"
+# Tagged so the rebuild's temporary set can be renamed over it in a cluster
+ACTIVE_GAMES = "games:{active}"
+ACTIVE_GAMES_REBUILD = "games:{active}:rebuild"
+
+CLUSTER_SLOTS = 16384
+
+# Untagged keys from the previous layout: game:<id> and game:<id>:answer
+LEGACY_GAME_KEY = re.compile(r"^game:(\d+)(:answer)?$")
+
+
+def game_key(game_id) -> str:
+    return f"game:{{{game_id}}}"
+
+
+def answer_key(game_id) -> str:
+    return f"game:{{{game_id}}}:answer"
+
+
+def lock_key(game_id) -> str:
+    return f"game:{{{game_id}}}:lock"
+
+
+def events_key(game_id) -> str:
+    return f"game:{{{game_id}}}:events"
+
+
+def deck_key(namespace: str) -> str:
+    return f"deck:{namespace}"
+
+
+def key_slot(game_id) -> int:
+    """Redis Cluster slot of the game's hash tag (CRC16/XMODEM mod 16384)."""
+    return binascii.crc_hqx(str(game_id).encode(), 0) % CLUSTER_SLOTS
+
+
+def legacy_game_id(key: str) -> Optional[str]:
+    """Game id of an untagged pre-migration key, else None."""
+    match = LEGACY_GAME_KEY.match(key or "")
+    return match.group(1) if match else None
@@ -0,0 +1,225 @@
+"""Bulk maintenance over every game, built on SCAN and pipelined batches.
+
+Each command walks the key space with SCAN (never KEYS), reads and writes
+`batch` games per pipelined round trip, and can sleep `pause` seconds between
+batches, so Redis keeps serving games while a large key space is processed.
+Deletes use UNLINK, so large values are freed off the main thread.
+
+    python pat/src/pat/redis_admin.py finish_stale_games --idle 3600 [--dry-run]
+    python pat/src/pat/redis_admin.py purge_games --older-than 2592000 [--dry-run]
+    python pat/src/pat/redis_admin.py rebuild_active_index
+    python pat/src/pat/redis_admin.py memory_report
+
+A game's last activity is its newest event-log entry, else its 'started_at'.
+Games with neither (written before those existed) are counted as
+'unknown_age' and left alone. A stale game is re-checked under WATCH before it
+is finished, so a move made after the scan keeps it active.
+"""
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from redis.exceptions import WatchError
+
+from . import codec, keys
+from .archive import DEFAULT_BATCH, _chunks, game_servers, iter_game_ids
+from .constants import STATUS_ACTIVE, STATUS_FINISHED
+from .game_pool import STATUS_READY
+from .redis_client import get_game_redis, get_redis, get_shards
+
+# (game id, status, started_at, last activity, version) for one game
+GameMeta = Tuple[str, Optional[str], Optional[float], Optional[float], Optional[str]]
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _pause(seconds: float) -> None:
+    if seconds > 0:
+        time.sleep(seconds)
+
+
+def _last_activity(last_event, started_at: Optional[float]) -> Optional[float]:
+    last = _float(codec.loads(last_event).get("ts")) if last_event else None
+    return last or started_at
+
+
+def iter_game_meta(batch: int = DEFAULT_BATCH, pause: float = 0.0) -> Iterator[Tuple[Any, List[GameMeta]]]:
+    """(server, [game meta]) per batch of scanned games, one pipelined read per batch."""
+    for client in game_servers():
+        for ids in _chunks(iter_game_ids(client, batch), batch):
+            pipe = client.pipeline(transaction=False)
+            for game_id in ids:
+                pipe.hmget(keys.game_key(game_id), "status", "started_at", "version")
+                pipe.lindex(keys.events_key(game_id), -1)
+            replies = pipe.execute()
+            metas = []
+            for i, game_id in enumerate(ids):
+                (status, started_at, version), last_event = replies[2 * i], replies[2 * i + 1]
+                started_at = _float(started_at)
+                metas.append((game_id, status, started_at, _last_activity(last_event, started_at), version))
+            yield client, metas
+            _pause(pause)
+
+
+def _unindex(game_ids: List[str]) -> None:
+    if game_ids:
+        get_redis().srem(keys.ACTIVE_GAMES, *game_ids)
+
+
+def _finish_if_idle(client, game_id: str, version: Optional[str], max_idle: float) -> bool:
+    """Finish the game unless it moved since the scan; True if it was finished.
+
+    The game hash and event log are watched while the status, version and last
+    activity are re-read, so a move landing before EXEC aborts the write.
+    """
+    key, events = keys.game_key(game_id), keys.events_key(game_id)
+    with client.pipeline(transaction=True) as pipe:
+        try:
+            pipe.watch(key, events)
+            status, started_at, current = pipe.hmget(key, "status", "started_at", "version")
+            last = _last_activity(pipe.lindex(events, -1), _float(started_at))
+            if status != STATUS_ACTIVE or current != version or last is None or time.time() - last <= max_idle:
+                pipe.unwatch()
+                return False
+            pipe.multi()
+            pipe.hset(key, "status", STATUS_FINISHED)
+            pipe.hincrby(key, "version", 1)
+            pipe.execute()
+            return True
+        except WatchError:
+            return False
+
+
+def finish_stale_games(
+    max_idle: float, batch: int = DEFAULT_BATCH, dry_run: bool = False, pause: float = 0.0
+) -> Dict[str, int]:
+    """Mark active games with no activity for `max_idle` seconds as finished (no winner).
+
+    'stale' counts the games judged idle by the scan; those that moved before
+    they could be finished are counted as 'changed' and left active.
+    """
+    now = time.time()
+    counts = {"scanned": 0, "stale": 0, "changed": 0, "unknown_age": 0}
+    for client, metas in iter_game_meta(batch, pause):
+        counts["scanned"] += len(metas)
+        stale = []
+        for game_id, status, _, last, version in metas:
+            if status != STATUS_ACTIVE:
+                continue
+            if last is None:
+                counts["unknown_age"] += 1
+            elif now - last > max_idle:
+                stale.append((game_id, version))
+        counts["stale"] += len(stale)
+        if stale and not dry_run:
+            finished = [game_id for game_id, version in stale if _finish_if_idle(client, game_id, version, max_idle)]
+            counts["changed"] += len(stale) - len(finished)
+            _unindex(finished)
+    return counts
+
+
+def purge_games(
+    older_than: float, batch: int = DEFAULT_BATCH, dry_run: bool = False, pause: float = 0.0
+) -> Dict[str, int]:
+    """Delete games (hash, answer, events, lock) started more than `older_than` seconds ago.
+
+    Prepared games waiting in the pool are kept whatever their age.
+    """
+    cutoff = time.time() - older_than
+    counts = {"scanned": 0, "purged": 0, "unknown_age": 0}
+    for client, metas in iter_game_meta(batch, pause):
+        counts["scanned"] += len(metas)
+        old = []
+        for game_id, status, started_at, _, _ in metas:
+            if status == STATUS_READY:
+                continue
+            if started_at is None:
+                counts["unknown_age"] += 1
+            elif started_at < cutoff:
+                old.append(game_id)
+        counts["purged"] += len(old)
+        if old and not dry_run:
+            pipe = client.pipeline(transaction=False)
+            for game_id in old:
+                pipe.unlink(keys.game_key(game_id), keys.answer_key(game_id), keys.events_key(game_id), keys.lock_key(game_id))
+            pipe.execute()
+            _unindex(old)
+    return counts
+
+
+def rebuild_active_index(batch: int = DEFAULT_BATCH, pause: float = 0.0) -> int:
+    """Recreate the active-game set from the game hashes; returns its size.
+
+    The new set is built under a temporary key and renamed over the index.
+    Ids added to the index while the scan ran are kept if their game is still
+    active, so games started during the rebuild are not lost.
+    """
+    r = get_redis()
+    r.delete(keys.ACTIVE_GAMES_REBUILD)
+    found = 0
+    for client, metas in iter_game_meta(batch, pause):
+        active = [game_id for game_id, status, _, _, _ in metas if status == STATUS_ACTIVE]
+        if active:
+            found += r.sadd(keys.ACTIVE_GAMES_REBUILD, *active)
+    with r.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                pipe.watch(keys.ACTIVE_GAMES)
+                late = [game_id for game_id in pipe.sdiff(keys.ACTIVE_GAMES, keys.ACTIVE_GAMES_REBUILD)
+                        if get_game_redis(game_id).hget(keys.game_key(game_id), "status") == STATUS_ACTIVE]
+                pipe.multi()
+                if late:
+                    pipe.sadd(keys.ACTIVE_GAMES_REBUILD, *late)
+                if found or late:
+                    pipe.rename(keys.ACTIVE_GAMES_REBUILD, keys.ACTIVE_GAMES)
+                else:
+                    pipe.delete(keys.ACTIVE_GAMES, keys.ACTIVE_GAMES_REBUILD)
+                pipe.execute()
+                return found + len(late)
+            except WatchError:
+                continue
+
+
+def key_pattern(key: str) -> str:
+    """Group name for a key: hash tags and trailing ids replaced by '*'."""
+    if "{" in key:
+        return re.sub(r"\{[^}]*\}", "{*}", key)
+    if ":" in key:
+        return key.split(":", 1)[0] + ":*"
+    return key
+
+
+def memory_report(batch: int = DEFAULT_BATCH, pause: float = 0.0) -> List[Dict[str, Any]]:
+    """Keys and bytes (MEMORY USAGE) per key pattern and type, on every server, largest first.
+
+    'bytes' is None for groups the server could not measure.
+    """
+    totals: Dict[Tuple[str, str], Dict[str, Any]] = defaultdict(lambda: {"keys": 0, "bytes": 0, "measured": 0})
+    for client in [get_redis(), *get_shards()]:
+        for chunk in _chunks(client.scan_iter(count=batch), batch):
+            pipe = client.pipeline(transaction=False)
+            for key in chunk:
+                pipe.type(key)
+                pipe.memory_usage(key)
+            replies = pipe.execute(raise_on_error=False)
+            for i, key in enumerate(chunk):
+                kind, used = replies[2 * i], replies[2 * i + 1]
+                if isinstance(kind, Exception):
+                    continue
+                group = totals[(key_pattern(key), kind)]
+                group["keys"] += 1
+                if isinstance(used, int):
+                    group["bytes"] += used
+                    group["measured"] += 1
+            _pause(pause)
+    report = [
+        {"pattern": pattern, "type": kind, "keys": t["keys"], "bytes": t["bytes"] if t["measured"] else None}
+        for (pattern, kind), t in totals.items()
+    ]
+    return sorted(report, key=lambda row: (-(row["bytes"] or 0), -row["keys"]))
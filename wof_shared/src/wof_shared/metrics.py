@@ -0,0 +1,321 @@
+"""In-process metrics: counters and histograms with a Prometheus text exporter.
+
+Recording is an attribute increment on a pre-resolved child (plus a bisect
+for histograms): no locks, I/O or allocation on the hot path. Updates from
+several threads may rarely lose an increment under the GIL, which is fine
+for monitoring. Exporting renders the registry on demand:
+
+    METRICS_PORT            serve /metrics (Prometheus text) on 127.0.0.1:<port>
+    METRICS_HOST            bind address for METRICS_PORT (default 127.0.0.1)
+    METRICS_FILE            also write the same text to this file periodically
+    METRICS_DUMP_INTERVAL   seconds between file dumps (default 15)
+
+Entry points call `start_exporters()` once; without the variables it does nothing.
+Stats kept elsewhere (LLM dispatcher, CAS counters) are exported through
+`register_collector` callbacks that run only when metrics are rendered.
+"""
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (metric name, type, help, [(labels, value)]) produced by a collector at render time
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> object:
+        """Child for one label combination (string values); resolve it once for hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _samples(self) -> Iterable[str]:
+        for values, child in list(self._children.items()):
+            yield from self._render_child(values, child)
+
+    def _render_child(self, values, child) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1) -> None:
+        self._default.value += amount
+
+    def _render_child(self, values, child):
+        yield f"{self.name}{_format_labels(self.labelnames, values)} {_number(child.value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def _render_child(self, values, child):
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), child.counts):
+            cumulative += count
+            le = _format_labels(self.labelnames, values, f'le="{_number(bound)}"')
+            yield f"{self.name}_bucket{le} {cumulative}"
+        labels = _format_labels(self.labelnames, values)
+        yield f"{self.name}_sum{labels} {_number(child.sum)}"
+        yield f"{self.name}_count{labels} {child.count}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def _get(self, cls, name: str, *args, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics.setdefault(name, cls(name, *args, **kwargs))
+        if not isinstance(metric, cls):
+            raise ValueError(f"metric {name} is already registered as a {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, collect: Callable[[], Iterable[Family]]) -> None:
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format."""
+        blocks = [metric.render() for metric in list(self._metrics.values())]
+        for collect in list(self._collectors):
+            try:
+                for name, kind, help, samples in collect():
+                    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                    for labels, value in samples:
+                        lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_number(value)}")
+                    blocks.append("\n".join(lines))
+            except Exception as e:
+                logger.warning("Metrics collector %r failed: %s", collect, e)
+        return "\n".join(blocks) + "\n"
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+register_collector = REGISTRY.register_collector
+render = REGISTRY.render
+
+
+# --- Game metrics (shared names for every entry point) ---
+
+TURNS = counter("wof_turns_total", "Turns played, by who drove them and the action taken.", ("source", "action"))
+TURN_SECONDS = histogram("wof_turn_seconds", "Wall time of one turn.", ("source",))
+WEDGES = counter("wof_wedge_outcomes_total", "Wheel spins by wedge outcome.", ("outcome",))
+LLM_CALL_SECONDS = histogram("wof_llm_call_seconds", "Latency of provider LLM calls (single or batched).")
+CONSONANT_FALLBACKS = counter(
+    "wof_consonant_fallbacks_total", "Consonant picks that did not use the LLM's letter, by reason.", ("reason",)
+)
+REDIS_COMMANDS = counter("wof_redis_commands_total", "Redis commands sent by this process.")
+REDIS_ROUND_TRIPS = counter("wof_redis_round_trips_total", "Redis round trips (a pipeline counts once).")
+REDIS_COMMANDS_PER_TURN = histogram(
+    "wof_redis_commands_per_turn", "Redis commands issued while playing one turn.",
+    buckets=(2, 4, 8, 12, 16, 24, 32, 48, 64, 128),
+)
+GAME_SECONDS = histogram(
+    "wof_game_duration_seconds", "Time from game start to a correct solve.",
+    buckets=(10, 30, 60, 120, 300, 600, 1200, 3600),
+)
+
+
+def wedge_outcome(wedge) -> str:
+    text = str(wedge).strip().upper()
+    if "BANKRUPT" in text:
+        return "bankrupt"
+    if "LOSE" in text and "TURN" in text:
+        return "lose_a_turn"
+    return "money" if text.isdigit() else "other"
+
+
+def observe_game_finished(started_at) -> None:
+    """Record a finished game's duration from its 'started_at' epoch seconds (ignored when unknown)."""
+    try:
+        GAME_SECONDS.observe(max(0.0, time.time() - float(started_at)))
+    except (TypeError, ValueError):
+        pass
+
+
+# Per-turn Redis command tally: a mutable cell shared by the turn's tasks and threads
+_turn_commands: ContextVar[Optional[List[int]]] = ContextVar("wof_turn_redis_commands", default=None)
+_redis_commands = REDIS_COMMANDS.labels()
+_redis_round_trips = REDIS_ROUND_TRIPS.labels()
+
+
+def count_redis(commands: int = 1) -> None:
+    """Called by the Redis client for every round trip carrying `commands` commands."""
+    _redis_commands.value += commands
+    _redis_round_trips.value += 1
+    cell = _turn_commands.get()
+    if cell is not None:
+        cell[0] += commands
+
+
+@contextmanager
+def track_redis_commands():
+    """Count Redis commands issued inside the block (yields a one-item list)."""
+    cell = [0]
+    token = _turn_commands.set(cell)
+    try:
+        yield cell
+    finally:
+        _turn_commands.reset(token)
+
+
+# --- Exporters ---
+
+def serve_http(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve the registry as Prometheus text on a daemon thread."""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def dump(path: str) -> None:
+    """Write the registry to `path` atomically (readers never see a partial file)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def start_file_dump(path: str, interval: float = 15.0) -> threading.Thread:
+    def _loop():
+        while True:
+            time.sleep(interval)
+            try:
+                dump(path)
+            except OSError as e:
+                logger.warning("Metrics dump to %s failed: %s", path, e)
+
+    thread = threading.Thread(target=_loop, name="metrics-dump", daemon=True)
+    thread.start()
+    return thread
+
+
+@lru_cache(maxsize=1)
+def start_exporters() -> Dict[str, str]:
+    """Start the exporters configured by METRICS_* (once per process); returns what started."""
+    started: Dict[str, str] = {}
+    port = os.environ.get("METRICS_PORT")
+    if port:
+        host = os.environ.get("METRICS_HOST", "127.0.0.1")
+        serve_http(int(port), host)
+        started["http"] = f"http://{host}:{port}/metrics"
+    path = os.environ.get("METRICS_FILE")
+    if path:
+        start_file_dump(path, float(os.environ.get("METRICS_DUMP_INTERVAL", "15")))
+        started["file"] = path
+    if started:
+        logger.info("Metrics exporters: %s", started)
+    return started
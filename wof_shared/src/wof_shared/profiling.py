@@ -0,0 +1,110 @@
+"""Opt-in sampled profiling of the async tool functions (AI tools, Pat).
+
+`profiled(fn, name, directory, sample_rate, memory)` returns `fn` itself when
+profiling is off (no directory or a zero rate), so a disabled tool pays
+nothing per call. When on, a `sample_rate` share of calls runs under cProfile
+(and tracemalloc with `memory=True`) and writes to `directory`:
+
+    <name>-<time_ns>.pstats        python -m pstats <file>   /   snakeviz <file>
+    <name>-<time_ns>.tracemalloc   tracemalloc.Snapshot.load(<file>).statistics("lineno")
+
+Only the newest `keep` captures per tool are kept. One capture runs at a time
+per process. cProfile follows the event-loop thread, so a capture of an async
+tool also includes whatever other tasks ran while the tool was awaiting.
+
+Tool configs mix in `ProfilingConfig` for the three settings and wrap their
+function with `profiled_from(config, fn, name)`.
+"""
+import cProfile
+import functools
+import logging
+import random
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+MAX_CAPTURES = 20
+TRACEMALLOC_FRAMES = 25
+
+_capturing = threading.Lock()
+
+F = TypeVar("F", bound=Callable[..., Awaitable])
+
+
+class ProfilingConfig(BaseModel):
+    """Profiling settings shared by the tool configs (mix in next to FunctionBaseConfig)."""
+
+    profile_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for sampled cProfile (.pstats) and tracemalloc captures of this tool, newest 20 kept; unset disables profiling.",
+    )
+    profile_sample_rate: float = Field(default=0.01, description="Share of calls captured when profile_dir is set.")
+    profile_memory: bool = Field(default=False, description="Also snapshot allocations with tracemalloc on captured calls (slower).")
+
+
+def profiled_from(config: ProfilingConfig, fn: F, name: str) -> F:
+    """`profiled(fn, name)` with the settings of a tool config that mixes in ProfilingConfig."""
+    return profiled(fn, name, config.profile_dir, config.profile_sample_rate, config.profile_memory)
+
+
+def profiled(
+    fn: F,
+    name: str,
+    directory: Optional[str] = None,
+    sample_rate: float = 0.0,
+    memory: bool = False,
+    keep: int = MAX_CAPTURES,
+) -> F:
+    """Wrap async `fn` with sampled cProfile/tracemalloc capture; `fn` unchanged when disabled."""
+    if not directory or sample_rate <= 0:
+        return fn
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+
+    @functools.wraps(fn)
+    async def _sampled(*args, **kwargs):
+        if random.random() >= sample_rate or not _capturing.acquire(blocking=False):
+            return await fn(*args, **kwargs)
+        try:
+            return await _capture(fn, args, kwargs, out, name, memory, keep)
+        finally:
+            _capturing.release()
+
+    return _sampled  # type: ignore[return-value]
+
+
+async def _capture(fn, args, kwargs, out: Path, name: str, memory: bool, keep: int):
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return await fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+        stem = out / f"{name}-{time.time_ns()}"
+        try:
+            profiler.dump_stats(f"{stem}.pstats")
+            if memory:
+                tracemalloc.take_snapshot().dump(f"{stem}.tracemalloc")
+            rotate(out, name, keep)
+        except OSError as e:
+            logger.warning("Could not write profile for %s: %s", name, e)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+
+def rotate(directory: Path, name: str, keep: int = MAX_CAPTURES) -> None:
+    """Delete all but the newest `keep` captures of each kind for tool `name`."""
+    for suffix in (".pstats", ".tracemalloc"):
+        captures = sorted(directory.glob(f"{name}-*{suffix}"))
+        for old in captures[: max(0, len(captures) - keep)]:
+            old.unlink(missing_ok=True)
@@ -1,11 +1,221 @@
 import os
 import redis
 from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis.cluster import ClusterPipeline, RedisCluster
+
+from . import keys, metrics
+
+# Every entry point (Pat, AI tools/worker, human CLI/server, redis_admin) shares
+# one pool per process, configured from the environment:
+#   REDIS_HOST / REDIS_PORT / REDIS_DB      TCP target (default localhost:6379/0)
+#   REDIS_UNIX_SOCKET                       path to a unix socket; overrides host/port
+#   REDIS_MAX_CONNECTIONS                   pool size (default 64)
+#   REDIS_POOL_TIMEOUT                      seconds to wait for a free connection (default 20)
+#   REDIS_SOCKET_TIMEOUT                    read/write timeout in seconds (default none;
+#                                           must exceed any BLPOP timeout when set)
+#   REDIS_SOCKET_CONNECT_TIMEOUT            connect timeout in seconds (default 5)
+#   REDIS_SOCKET_KEEPALIVE                  1/0, TCP keepalive (default 1)
+#   REDIS_HEALTH_CHECK_INTERVAL             seconds between idle-connection PINGs (default 30)
+#   REDIS_CLUSTER                           1/0, connect to a Redis Cluster at REDIS_HOST/PORT
+#   REDIS_SHARDS                            comma-separated redis:// URLs (nodes or DBs); games
+#                                           are spread across them by hash slot, process-wide
+#                                           keys stay on the server above (see keys.py)
+# The socket, keepalive and health-check settings apply to every client (the
+# pool above, each shard, each cluster node); the pool size to each pool.
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    raw = os.environ.get(name)
+    if raw in (None, ""):
+        return default
+    return float(raw)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.environ.get(name)
+    if raw in (None, ""):
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+class _MeteredPipeline(redis.client.Pipeline):
+    def immediate_execute_command(self, *args, **options):
+        metrics.count_redis(1)
+        return super().immediate_execute_command(*args, **options)
+
+    def execute(self, raise_on_error: bool = True):
+        if self.command_stack:
+            metrics.count_redis(len(self.command_stack))
+        return super().execute(raise_on_error)
+
+
+class MeteredRedis(redis.Redis):
+    """redis.Redis that reports commands and round trips to wof_shared.metrics."""
+
+    def execute_command(self, *args, **options):
+        metrics.count_redis(1)
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return _MeteredPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class _MeteredClusterPipeline(ClusterPipeline):
+    def execute(self, raise_on_error: bool = True):
+        if len(self):
+            metrics.count_redis(len(self))
+        return super().execute(raise_on_error)
+
+
+class MeteredRedisCluster(RedisCluster):
+    """RedisCluster that reports commands and round trips to wof_shared.metrics."""
+
+    def execute_command(self, *args, **kwargs):
+        metrics.count_redis(1)
+        return super().execute_command(*args, **kwargs)
+
+    def pipeline(self, transaction=None, shard_hint=None):
+        pipe = super().pipeline(transaction, shard_hint)
+        # Same pipeline, with execute() counted (the subclass adds no state)
+        pipe.__class__ = _MeteredClusterPipeline
+        return pipe
+
+
+def _connection_kwargs(tcp: bool = True) -> Dict[str, Any]:
+    """Socket and health-check settings shared by every client."""
+    kwargs: Dict[str, Any] = {
+        "decode_responses": True,
+        "socket_timeout": _env_float("REDIS_SOCKET_TIMEOUT", None),
+        "socket_connect_timeout": _env_float("REDIS_SOCKET_CONNECT_TIMEOUT", 5.0),
+        "health_check_interval": int(_env_float("REDIS_HEALTH_CHECK_INTERVAL", 30) or 0),
+    }
+    if tcp:
+        kwargs["socket_keepalive"] = _env_bool("REDIS_SOCKET_KEEPALIVE", True)
+    return kwargs
+
+
+def _max_connections() -> int:
+    return int(os.environ.get("REDIS_MAX_CONNECTIONS", "64"))
+
+
+def _pool_kwargs() -> Dict[str, Any]:
+    """Size and wait time of each BlockingConnectionPool."""
+    return {"max_connections": _max_connections(), "timeout": _env_float("REDIS_POOL_TIMEOUT", 20.0)}
 
 
 @lru_cache(maxsize=1)
-def get_redis() -> redis.Redis:
-    host = os.environ.get("REDIS_HOST", "localhost")
-    port = int(os.environ.get("REDIS_PORT", "6379"))
+def get_pool() -> redis.ConnectionPool:
+    """Return the process-wide connection pool built from REDIS_* settings.
+
+    A BlockingConnectionPool is used so bursts wait for a free connection
+    (up to REDIS_POOL_TIMEOUT) instead of opening unbounded sockets.
+    """
     db = int(os.environ.get("REDIS_DB", "0"))
-    return redis.Redis(host=host, port=port, db=db, decode_responses=True)
+    unix_socket = os.environ.get("REDIS_UNIX_SOCKET")
+    if unix_socket:
+        return redis.BlockingConnectionPool(
+            connection_class=redis.UnixDomainSocketConnection,
+            path=unix_socket,
+            db=db,
+            **_pool_kwargs(),
+            **_connection_kwargs(tcp=False),
+        )
+    return redis.BlockingConnectionPool(
+        host=os.environ.get("REDIS_HOST", "localhost"),
+        port=int(os.environ.get("REDIS_PORT", "6379")),
+        db=db,
+        **_pool_kwargs(),
+        **_connection_kwargs(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_redis() -> redis.Redis:
+    if _env_bool("REDIS_CLUSTER", False):
+        return _cluster_client()
+    return MeteredRedis(connection_pool=get_pool())
+
+
+def _cluster_client() -> RedisCluster:
+    # One pool per cluster node, each capped at REDIS_MAX_CONNECTIONS
+    return MeteredRedisCluster(
+        host=os.environ.get("REDIS_HOST", "localhost"),
+        port=int(os.environ.get("REDIS_PORT", "6379")),
+        max_connections=_max_connections(),
+        **_connection_kwargs(),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_shards() -> Tuple[redis.Redis, ...]:
+    """One client per REDIS_SHARDS URL (empty when sharding is off)."""
+    urls = [u.strip() for u in os.environ.get("REDIS_SHARDS", "").split(",") if u.strip()]
+    return tuple(
+        MeteredRedis(
+            connection_pool=redis.BlockingConnectionPool.from_url(
+                url, **_pool_kwargs(), **_connection_kwargs(tcp=not url.startswith("unix:"))
+            )
+        )
+        for url in urls
+    )
+
+
+def shard_index(game_id, shard_count: int) -> int:
+    return keys.key_slot(game_id) % shard_count if shard_count else 0
+
+
+def get_game_redis(game_id) -> redis.Redis:
+    """Client holding `game_id`'s keys: its shard, or the primary server when unsharded."""
+    shards = get_shards()
+    if not shards:
+        return get_redis()
+    return shards[shard_index(game_id, len(shards))]
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Usage of the pools in use, for sizing REDIS_MAX_CONNECTIONS under load.
+
+    The primary server's pool at the top level (with REDIS_CLUSTER, 'nodes'
+    lists each cluster node's pool instead), plus one entry per REDIS_SHARDS
+    server under 'shards' when sharding is on.
+    """
+    client = get_redis()
+    if isinstance(client, RedisCluster):
+        stats: Dict[str, Any] = {"transport": "cluster", "nodes": _cluster_pools(client)}
+    else:
+        stats = _pool_usage(get_pool())
+    shards = get_shards()
+    if shards:
+        stats["shards"] = [_pool_usage(shard.connection_pool) for shard in shards]
+    return stats
+
+
+def _cluster_pools(client: RedisCluster) -> List[Dict[str, Any]]:
+    return [
+        _pool_usage(node.redis_connection.connection_pool)
+        for node in client.get_nodes()
+        if node.redis_connection is not None
+    ]
+
+
+def _pool_usage(pool: redis.ConnectionPool) -> Dict[str, Any]:
+    kwargs = pool.connection_kwargs
+    created = list(getattr(pool, "_connections", []) or [])
+    queue = getattr(getattr(pool, "pool", None), "queue", None)
+    if queue is not None:
+        # BlockingConnectionPool: idle connections sit in the queue (None = slot not yet opened)
+        idle = sum(1 for conn in queue if conn is not None)
+    else:
+        idle = len(getattr(pool, "_available_connections", []) or [])
+        created = [None] * int(getattr(pool, "_created_connections", 0) or 0)
+    return {
+        "transport": "unix" if "path" in kwargs else "tcp",
+        "target": kwargs.get("path") or f"{kwargs.get('host')}:{kwargs.get('port')}",
+        "db": kwargs.get("db", 0),
+        "max_connections": pool.max_connections,
+        "created_connections": len(created),
+        "idle_connections": idle,
+        "in_use_connections": max(0, len(created) - idle),
+    }
@@ -1,14 +1,33 @@
-import json
-from typing import Any, Dict, List, Optional
-
-from .redis_client import get_redis
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from redis.exceptions import WatchError
+
+from . import codec, keys, metrics
+from .redis_client import get_game_redis, get_redis
 from .constants import VOWELS, VOWEL_COST, PLAYER_ID_ORDER, STATUS_ACTIVE, STATUS_FINISHED
 
 
 def start_new_game(puzzle, answer, theme, players):
     r = get_redis()
-    game_id = r.incr("game_id_counter")
-    key = f"game:{game_id}"
+    game_id = r.incr(keys.GAME_ID_COUNTER)
+    # Hash and answer share the game's hash tag (one slot), so they are written atomically
+    pipe = get_game_redis(game_id).pipeline(transaction=True)
+    pipe.hset(keys.game_key(game_id), mapping=codec.encode_game(_initial_game(puzzle, theme, players)))
+    # Store answer in a separate secret key so HGETALL game:{id} does not expose it
+    pipe.set(keys.answer_key(game_id), answer)
+    pipe.execute()
+    _make_current(game_id, players)
+    return game_id
+
+
+def _initial_scores(players) -> Dict[str, int]:
     # Initialize scores dynamically from provided players (support dict of ids->names or iterable of ids)
     try:
         if isinstance(players, dict) and players:
@@ -20,116 +39,330 @@ def start_new_game(puzzle, answer, theme, players):
             score_keys = ["AI1", "AI2", "Human"]
     except Exception:
         score_keys = ["AI1", "AI2", "Human"]
-    initial_scores = {pid: 0 for pid in score_keys}
-    r.hset(key, mapping={
+    return {pid: 0 for pid in score_keys}
+
+
+def _initial_game(puzzle, theme, players, status: str = STATUS_ACTIVE) -> Dict[str, Any]:
+    return {
         "puzzle": puzzle,
         "theme": theme,
         "player": "AI1",
-        "status": "active",
+        "status": status,
         "winner": "",
-        "guessed_consonants": json.dumps([]),
-        "guessed_vowels": json.dumps([]),
-        "revealed": json.dumps([]),
-        "scores": json.dumps(initial_scores),
-        "players": json.dumps(players)
-    })
-    # Store answer in a separate secret key so HGETALL game:<id> does not expose it
-    r.set(f"game:{game_id}:answer", answer)
-    r.set("current_game_id", game_id)
-    # Save display names mapping globally for UI/console rendering only
+        "guessed_consonants": [],
+        "guessed_vowels": [],
+        "revealed": [],
+        "scores": _initial_scores(players),
+        "players": players,
+        "started_at": round(time.time(), 3),
+    }
+
+
+def _make_current(game_id, players) -> None:
+    """Point current_game_id at the newly started game and add it to the active index."""
+    r = get_redis()
+    pipe = r.pipeline(transaction=False)
+    pipe.set(keys.CURRENT_GAME_ID, game_id)
+    pipe.sadd(keys.ACTIVE_GAMES, game_id)
+    pipe.execute()
+    # Save display names mapping globally as the default for UI/console rendering
     try:
-        if isinstance(players, dict):
-            # Expecting mapping of stable IDs -> display names, e.g. {"AI1": "AI1_guy", "AI2": "AI2_guy", "Human": "Richard"}
-            r.hset("player_names", mapping=players)
+        # Expecting mapping of stable IDs -> display names, e.g. {"AI1": "AI1_guy", "AI2": "AI2_guy", "Human": "Richard"}
+        if isinstance(players, dict) and players:
+            defaults = r.hgetall(keys.PLAYER_NAMES) or {}
+            # Only a real change invalidates other processes' caches; the new
+            # game itself is noticed through current_game_id (see _cached_player_names)
+            if any(defaults.get(pid) != str(name) for pid, name in players.items()):
+                r.hset(keys.PLAYER_NAMES, mapping=players)
+                _bump_names_version()
     except Exception:
         # Non-fatal if we fail to store names
         pass
-    return game_id
 
 def get_current_game():
-    r = get_redis()
-    game_id = r.get("current_game_id")
+    game_id = _get_game_id()
     if not game_id:
         return None
-    data = r.hgetall(f"game:{game_id}")
-    # decode any JSON fields
-    data["revealed"] = json.loads(data["revealed"])
-    data["scores"] = json.loads(data["scores"])
-    data["guessed_consonants"] = json.loads(data["guessed_consonants"])
-    data["guessed_vowels"] = json.loads(data["guessed_vowels"])
-    data["players"] = json.loads(data["players"])
-    return data
+    raw = get_game_redis(game_id).hgetall(keys.game_key(game_id))
+    if not raw:
+        return None
+    # decode any JSON fields (see codec.JSON_FIELDS)
+    return codec.decode_game(raw)
 
 def get_player_score(player_name: str):
     # Load scores from Redis (handle both JSON string and dict)
-    try:
-        import json as _json
-        scores_raw = hget("scores")
-        if isinstance(scores_raw, str):
-            scores = _json.loads(scores_raw) if scores_raw else {}
-        elif isinstance(scores_raw, dict):
-            scores = scores_raw
-        else:
-            scores = {}
-    except Exception as e:
-        logger.warning("Failed to load scores: %s", e)
-        scores = {}
+    scores = hget_json("scores", {})
     return int(scores.get(player_name, 0) or 0)
 
 # --- Helpers to get/set JSON fields ---
 
+# Game id pinned for the current task/thread; when unset, helpers fall back to
+# the global 'current_game_id' key (single-game CLI behaviour).
+_game_id_override: ContextVar[Optional[str]] = ContextVar("wof_game_id", default=None)
+
+
+@contextmanager
+def use_game(game_id):
+    """Scope all state helpers to ``game_id`` instead of 'current_game_id'.
+
+    Lets one process (e.g. the AI worker) act on many games concurrently:
+    each asyncio task sees its own pinned game.
+    """
+    token = _game_id_override.set(str(game_id))
+    try:
+        yield
+    finally:
+        _game_id_override.reset(token)
+
+
 def _get_game_id() -> Optional[str]:
+    pinned = _game_id_override.get()
+    if pinned:
+        return pinned
     r = get_redis()
-    return r.get("current_game_id")
+    return r.get(keys.CURRENT_GAME_ID)
 
 
 def get_answer() -> Optional[str]:
     """Return the secret answer for the current game from the protected key."""
-    r = get_redis()
     game_id = _get_game_id()
     if not game_id:
         return None
-    return r.get(f"game:{game_id}:answer")
+    return get_game_redis(game_id).get(keys.answer_key(game_id))
 
 
 def set_answer(answer: str) -> None:
-    r = get_redis()
     game_id = _get_game_id()
     if not game_id:
         return
-    r.set(f"game:{game_id}:answer", answer)
+    get_game_redis(game_id).set(keys.answer_key(game_id), answer)
 
 
 def hget(field: str) -> Optional[str]:
-    r = get_redis()
     game_id = _get_game_id()
     if not game_id:
         return None
-    return r.hget(f"game:{game_id}", field)
+    return get_game_redis(game_id).hget(keys.game_key(game_id), field)
 
 
 def hset(field: str, value: str) -> None:
-    r = get_redis()
     game_id = _get_game_id()
     if not game_id:
         return
-    r.hset(f"game:{game_id}", field, value)
+    get_game_redis(game_id).hset(keys.game_key(game_id), field, value)
 
 
 def hget_json(field: str, default: Any) -> Any:
     raw = hget(field)
     if raw is None:
         return default
-    if isinstance(raw, (dict, list)):
-        return raw
-    try:
-        return json.loads(raw)
-    except Exception:
-        return default
+    return codec.decode_field(raw, default)
 
 
 def hset_json(field: str, value: Any) -> None:
-    hset(field, json.dumps(value))
+    hset(field, codec.dumps(value))
+
+
+# --- Optimistic concurrency ---
+#
+# Read-modify-write helpers (turns, scores, guesses, reveals) run as
+# WATCH game:{id} / MULTI / EXEC and bump the hash's 'version' field, so two
+# orchestrators acting on one game cannot overwrite each other's changes; a
+# conflicting write is retried against fresh state.
+
+MAX_CAS_RETRIES = 20
+TURN_LOCK_TTL = 60.0
+
+CONCURRENCY_STATS: Dict[str, int] = {
+    "cas_commits": 0,
+    "cas_conflicts": 0,
+    "cas_failures": 0,
+    "lock_acquired": 0,
+    "lock_contended": 0,
+    "lock_timeouts": 0,
+    "lock_lost": 0,
+}
+
+
+class ConcurrentUpdateError(RuntimeError):
+    """A game update kept conflicting with other writers and was abandoned."""
+
+
+class TurnLockTimeout(RuntimeError):
+    """Another orchestrator held the game's turn lock for too long."""
+
+
+def concurrency_stats() -> Dict[str, int]:
+    """Counters for CAS commits/conflicts and turn-lock contention in this process."""
+    return dict(CONCURRENCY_STATS)
+
+
+def _collect_concurrency():
+    yield (
+        "wof_game_state_events_total",
+        "counter",
+        "Game state CAS commits/conflicts/failures and turn-lock events.",
+        [({"event": event}, value) for event, value in CONCURRENCY_STATS.items()],
+    )
+
+
+metrics.register_collector(_collect_concurrency)
+
+
+def _transact(
+    update: Callable[[Dict[str, Any]], Tuple[Dict[str, Any], Any]],
+    default: Any = None,
+    game_id=None,
+    events: Sequence[Dict[str, Any]] = (),
+) -> Any:
+    """Apply `update(snapshot) -> (changed fields, result)` to the game atomically.
+
+    Acts on `game_id`, else the pinned/current game. `events` are appended to
+    the game's event log in the same transaction. Returns `default` without
+    writing when there is no game.
+    """
+    game_id = game_id or _get_game_id()
+    if not game_id:
+        return default
+    key = keys.game_key(game_id)
+    with get_game_redis(game_id).pipeline(transaction=True) as pipe:
+        for _ in range(MAX_CAS_RETRIES):
+            try:
+                pipe.watch(key)
+                raw = pipe.hgetall(key)
+                if not raw:
+                    pipe.unwatch()
+                    return default
+                changes, result = update(codec.decode_game(raw))
+                pipe.multi()
+                if changes:
+                    pipe.hset(key, mapping=codec.encode_game(changes))
+                    pipe.hincrby(key, "version", 1)
+                if events:
+                    pipe.rpush(keys.events_key(game_id), *(codec.dumps(e) for e in events))
+                pipe.execute()
+                CONCURRENCY_STATS["cas_commits"] += 1
+                return result
+            except WatchError:
+                CONCURRENCY_STATS["cas_conflicts"] += 1
+                continue
+    CONCURRENCY_STATS["cas_failures"] += 1
+    raise ConcurrentUpdateError(f"{key}: gave up after {MAX_CAS_RETRIES} conflicting updates")
+
+
+def get_version() -> int:
+    return int(hget("version") or 0)
+
+
+def acquire_turn_lock(game_id=None, ttl: float = TURN_LOCK_TTL) -> Optional[str]:
+    """Try once to take the game's turn lease; returns the owner token or None."""
+    game_id = game_id or _get_game_id()
+    if not game_id:
+        return None
+    token = uuid.uuid4().hex
+    if get_game_redis(game_id).set(keys.lock_key(game_id), token, nx=True, px=int(ttl * 1000)):
+        CONCURRENCY_STATS["lock_acquired"] += 1
+        return token
+    return None
+
+
+def _if_owner(game_id, token: str, apply: Callable) -> bool:
+    """Run `apply(pipe, key)` in a transaction only while `token` still owns the lease."""
+    key = keys.lock_key(game_id)
+    with get_game_redis(game_id).pipeline(transaction=True) as pipe:
+        try:
+            pipe.watch(key)
+            if pipe.get(key) != token:
+                pipe.unwatch()
+                return False
+            pipe.multi()
+            apply(pipe, key)
+            pipe.execute()
+            return True
+        except WatchError:
+            return False
+
+
+def release_turn_lock(game_id, token: str) -> bool:
+    """Release the lease if `token` still owns it (an expired lease is left alone)."""
+    released = _if_owner(game_id, token, lambda pipe, key: pipe.delete(key))
+    if not released:
+        CONCURRENCY_STATS["lock_lost"] += 1
+    return released
+
+
+def renew_turn_lock(game_id, token: str, ttl: float = TURN_LOCK_TTL) -> bool:
+    """Extend a lease still owned by `token` (for turns that outlive the TTL)."""
+    return _if_owner(game_id, token, lambda pipe, key: pipe.pexpire(key, int(ttl * 1000)))
+
+
+def _lease_attempts(game_id, ttl: float, wait: float):
+    """Acquisition loop shared by turn_lock and turn_lease.
+
+    Yields None while another orchestrator holds the lease (the caller sleeps
+    before the next attempt), then the owner token. Raises TurnLockTimeout
+    once `wait` seconds have passed.
+    """
+    deadline = time.monotonic() + wait
+    token = acquire_turn_lock(game_id, ttl)
+    if token is None:
+        CONCURRENCY_STATS["lock_contended"] += 1
+    while token is None:
+        if time.monotonic() >= deadline:
+            CONCURRENCY_STATS["lock_timeouts"] += 1
+            raise TurnLockTimeout(f"{keys.lock_key(game_id)} is held by another orchestrator")
+        yield None
+        token = acquire_turn_lock(game_id, ttl)
+    yield token
+
+
+@contextmanager
+def _holding(game_id, token: str, ttl: float):
+    """Renew the lease every ttl/3 from a daemon thread while the block runs, then release it.
+
+    A turn blocked on slow LLM calls or a slow human keeps its lease; if the
+    holder dies the renewals stop and the lease expires after `ttl`.
+    """
+    stop = threading.Event()
+
+    def _heartbeat():
+        while not stop.wait(ttl / 3):
+            if not renew_turn_lock(game_id, token, ttl):
+                return
+
+    threading.Thread(target=_heartbeat, name=f"turn-lease-{game_id}", daemon=True).start()
+    try:
+        yield token
+    finally:
+        stop.set()
+        release_turn_lock(game_id, token)
+
+
+@contextmanager
+def turn_lock(game_id=None, ttl: float = TURN_LOCK_TTL, wait: float = 10.0, poll: float = 0.05):
+    """Hold the game's turn lease for the duration of the block.
+
+    The lease is renewed while the block runs and expires `ttl` seconds after
+    the holder dies. Raises TurnLockTimeout when it cannot be taken within
+    `wait` seconds.
+    """
+    game_id = game_id or _get_game_id()
+    for token in _lease_attempts(game_id, ttl, wait):
+        if token is None:
+            time.sleep(poll)
+    with _holding(game_id, token, ttl):
+        yield token
+
+
+@asynccontextmanager
+async def turn_lease(game_id=None, ttl: float = TURN_LOCK_TTL, wait: float = 30.0, poll: float = 0.05):
+    """turn_lock for asyncio callers: waits for the lease without blocking the event loop."""
+    game_id = game_id or _get_game_id()
+    for token in _lease_attempts(game_id, ttl, wait):
+        if token is None:
+            await asyncio.sleep(poll)
+    with _holding(game_id, token, ttl):
+        yield token
 
 
 # --- Public API used by apps ---
@@ -140,14 +373,26 @@ def get_field(field: str) -> Optional[str]:
     return hget(field)
 
 
+def _set_fields(fields: Dict[str, Any]) -> None:
+    """Write `fields` as one versioned update, so CAS readers see the change."""
+    _transact(lambda game: (fields, None))
+
+
 def update_game_field(field: str, value: str) -> None:
-    hset(field, value)
+    _set_fields({field: value})
 
 
 # Status helpers
 
 def set_status(status: str) -> None:
-    hset("status", status)
+    _set_fields({"status": status})
+    if status != STATUS_ACTIVE:
+        _remove_active(_get_game_id())
+
+
+def _remove_active(game_id) -> None:
+    if game_id:
+        get_redis().srem(keys.ACTIVE_GAMES, game_id)
 
 
 def set_current_game_status_finished() -> None:
@@ -161,48 +406,150 @@ def get_turn() -> Optional[str]:
 
 
 def set_turn(player: str) -> None:
-    hset("player", player)
+    _set_fields({"player": player})
 
 
-def next_turn() -> Optional[str]:
-    cur = get_turn()
+def _following(cur: Optional[str]) -> str:
     if not cur:
-        nxt = PLAYER_ID_ORDER[0]
-    else:
-        try:
-            idx = PLAYER_ID_ORDER.index(cur)
-            nxt = PLAYER_ID_ORDER[(idx + 1) % len(PLAYER_ID_ORDER)]
-        except ValueError:
-            nxt = PLAYER_ID_ORDER[0]
-    set_turn(nxt)
-    return nxt
+        return PLAYER_ID_ORDER[0]
+    try:
+        idx = PLAYER_ID_ORDER.index(cur)
+        return PLAYER_ID_ORDER[(idx + 1) % len(PLAYER_ID_ORDER)]
+    except ValueError:
+        return PLAYER_ID_ORDER[0]
+
+
+def next_turn(expected: Optional[str] = None) -> Optional[str]:
+    """Pass the turn to the next player in PLAYER_ID_ORDER; returns whose turn it is now.
+
+    With `expected`, the turn only passes while it is still that player's.
+    """
+    def _advance(game):
+        current = game.get("player")
+        if expected is not None and current != expected:
+            return {}, current
+        nxt = _following(current)
+        return {"player": nxt}, nxt
+
+    return _transact(_advance)
+
+
+# --- Game event log ---
+#
+# Every action appends one JSON event to game:{id}:events (see keys.py): who
+# acted ("source" is "ai" or "human"), what they did and whether it ended
+# their turn. The log feeds exports and analytics; game play never reads it.
+
+def make_event(action: str, player: str, source: str, **fields) -> Dict[str, Any]:
+    return {"ts": round(time.time(), 3), "action": action, "player": player, "source": source, **fields}
+
+
+def append_event(event: Dict[str, Any], game_id=None) -> None:
+    game_id = game_id or _get_game_id()
+    if game_id:
+        get_game_redis(game_id).rpush(keys.events_key(game_id), codec.dumps(event))
+
+
+def get_events(game_id=None) -> List[Dict[str, Any]]:
+    game_id = game_id or _get_game_id()
+    if not game_id:
+        return []
+    return [codec.loads(raw) for raw in get_game_redis(game_id).lrange(keys.events_key(game_id), 0, -1)]
 
 
 # --- Player display names (UI only) ---
+#
+# Names are cached per process and per pinned game, for the most recently
+# used MAX_CACHED_NAMES games. Every change of names bumps the
+# 'player_names_version' key; a cached mapping is trusted for NAMES_CACHE_TTL
+# seconds, then revalidated by reading that key and current_game_id (and
+# only re-read when either changed), so resolving a name is normally a dict
+# lookup and starting a game does not invalidate other games' entries.
+
+NAMES_CACHE_TTL = 1.0
+MAX_CACHED_NAMES = 256
+
+# pinned game id (None = current game) -> (version, game id, checked at, names)
+_names_cache: "OrderedDict[Optional[str], Tuple[str, Optional[str], float, Dict[str, str]]]" = OrderedDict()
+
+
+def _bump_names_version() -> None:
+    _names_cache.clear()
+    try:
+        get_redis().incr(keys.PLAYER_NAMES_VERSION)
+    except Exception:
+        pass
+
+
+def invalidate_player_names() -> None:
+    """Drop this process's cached display names (the next lookup reads Redis)."""
+    _names_cache.clear()
+
 
 def set_player_names(names: Dict[str, str]) -> None:
-    """Store display names for players in a global hash 'player_names'.
+    """Store display names for players: defaults in the global hash 'player_names'
+    and, when a game is current, its own 'players' field.
     Keys should be stable player IDs (e.g., 'AI1','AI2','Human').
     """
     r = get_redis()
     if names:
-        r.hset("player_names", mapping=names)
+        r.hset(keys.PLAYER_NAMES, mapping=names)
 
+        def _merge(game):
+            merged = dict(game.get("players") or {})
+            merged.update(names)
+            return {"players": merged}, None
 
-def get_player_names() -> Dict[str, str]:
-    """Return the display names mapping or an empty dict if unset."""
+        _transact(_merge)
+        _bump_names_version()
+
+
+def _load_player_names() -> Dict[str, str]:
     r = get_redis()
+    names = dict(r.hgetall(keys.PLAYER_NAMES) or {})
+    # Per-game names live in the game hash, on the game's own slot
+    game_names = hget_json("players", {}) if _get_game_id() else {}
+    if isinstance(game_names, dict):
+        names.update({k: v for k, v in game_names.items() if v})
+    return names
+
+
+def _cached_player_names() -> Dict[str, str]:
+    scope = _game_id_override.get()
+    now = time.monotonic()
+    cached = _names_cache.get(scope)
+    if cached and now - cached[2] < NAMES_CACHE_TTL:
+        _names_cache.move_to_end(scope)
+        return cached[3]
+    # Two GETs in one round trip (a pipeline, since the keys may sit in different cluster slots)
+    pipe = get_redis().pipeline(transaction=False)
+    pipe.get(keys.PLAYER_NAMES_VERSION)
+    pipe.get(keys.CURRENT_GAME_ID)
+    version, current = pipe.execute()
+    version, game_id = version or "0", scope or current
+    fresh = cached and cached[0] == version and cached[1] == game_id
+    names = cached[3] if fresh else _load_player_names()
+    _names_cache[scope] = (version, game_id, now, names)
+    _names_cache.move_to_end(scope)
+    while len(_names_cache) > MAX_CACHED_NAMES:
+        _names_cache.popitem(last=False)
+    return names
+
+
+def get_player_names() -> Dict[str, str]:
+    """Return the current game's display names (falling back to the global
+    defaults), or an empty dict if unset."""
     try:
-        data = r.hgetall("player_names") or {}
-        # hgetall returns str->str already
-        return dict(data)
+        return dict(_cached_player_names())
     except Exception:
         return {}
 
 
 def resolve_display_name(player_id: str) -> str:
-    names = get_player_names()
-    return names.get(player_id, player_id)
+    try:
+        return _cached_player_names().get(player_id, player_id)
+    except Exception:
+        return player_id
 
 
 # Vowel helpers
@@ -215,10 +562,38 @@ def get_unguessed_vowels() -> List[str]:
 # Scores
 
 def update_score(player: str, delta: int) -> None:
-    scores: Dict[str, int] = hget_json("scores", {})
-    old = int(scores.get(player, 0) or 0)
-    scores[player] = old + int(delta)
-    hset_json("scores", scores)
+    def _add(game):
+        scores: Dict[str, int] = game.get("scores") or {}
+        scores[player] = int(scores.get(player, 0) or 0) + int(delta)
+        return {"scores": scores}, None
+
+    _transact(_add)
+
+
+def set_score(player: str, value: int) -> None:
+    def _set(game):
+        scores: Dict[str, int] = game.get("scores") or {}
+        scores[player] = int(value)
+        return {"scores": scores}, None
+
+    _transact(_set)
+
+
+def spend_score(player: str, cost: int) -> Tuple[bool, int]:
+    """Deduct `cost` from `player`'s score if they can afford it.
+
+    Returns (paid, balance before the purchase); nothing is written when the
+    balance is short.
+    """
+    def _spend(game):
+        scores: Dict[str, int] = game.get("scores") or {}
+        balance = int(scores.get(player, 0) or 0)
+        if balance < cost:
+            return {}, (False, balance)
+        scores[player] = balance - int(cost)
+        return {"scores": scores}, (True, balance)
+
+    return _transact(_spend, default=(False, 0))
 
 
 # Guesses
@@ -227,16 +602,15 @@ def add_guessed_letter(letter: str, is_vowel: bool) -> None:
     letter = (letter or "").upper()
     if not letter:
         return
-    if is_vowel:
-        lst: List[str] = hget_json("guessed_vowels", [])
-        if letter not in lst:
-            lst.append(letter)
-        hset_json("guessed_vowels", lst)
-    else:
-        lst: List[str] = hget_json("guessed_consonants", [])
-        if letter not in lst:
-            lst.append(letter)
-        hset_json("guessed_consonants", lst)
+    field = "guessed_vowels" if is_vowel else "guessed_consonants"
+
+    def _add(game):
+        lst: List[str] = game.get(field) or []
+        if letter in lst:
+            return {}, None
+        return {field: lst + [letter]}, None
+
+    _transact(_add)
 
 
 # Reveal/masking
@@ -254,7 +628,6 @@ def _mask_from_answer_and_revealed(answer: str, revealed_positions: List[int]) -
 
 
 def reveal_letter(letter: str) -> int:
-    r = get_redis()
     game_id = _get_game_id()
     if not game_id:
         return 0
@@ -263,42 +636,39 @@ def reveal_letter(letter: str) -> int:
     if not letter or not answer:
         return 0
 
-    revealed: List[int] = hget_json("revealed", [])
-    newly = 0
-    for idx, ch in enumerate((answer or "").upper()):
-        if ch == letter and idx not in revealed:
-            revealed.append(idx)
-            newly += 1
-    if newly:
+    def _reveal(game):
+        revealed: List[int] = list(game.get("revealed") or [])
+        newly = 0
+        for idx, ch in enumerate(answer.upper()):
+            if ch == letter and idx not in revealed:
+                revealed.append(idx)
+                newly += 1
+        if not newly:
+            return {}, 0
         revealed.sort()
-        hset_json("revealed", revealed)
-        masked = _mask_from_answer_and_revealed(answer, revealed)
-        hset("puzzle", masked)
-    return newly
+        return {"revealed": revealed, "puzzle": _mask_from_answer_and_revealed(answer, revealed)}, newly
+
+    return _transact(_reveal, default=0)
 
 
 def reveal_all() -> None:
     answer = get_answer() or ""
     revealed = [i for i, _ in enumerate(answer)]
-    hset_json("revealed", revealed)
-    masked = _mask_from_answer_and_revealed(answer, revealed)
-    hset("puzzle", masked)
+    _set_fields({"revealed": revealed, "puzzle": _mask_from_answer_and_revealed(answer, revealed)})
 
 
 # Aggregate current game snapshot tailored for AI player
 
 def get_current_game_for_ai_player(player_name: str) -> Optional[Dict[str, Any]]:
-    r = get_redis()
     game_id = _get_game_id()
     if not game_id:
         return None
-    all_data = r.hgetall(f"game:{game_id}")
+    all_data = get_game_redis(game_id).hgetall(keys.game_key(game_id))
     # Decode JSON fields safely
-    revealed = json.loads(all_data.get("revealed", "[]"))
-    guessed_consonants = json.loads(all_data.get("guessed_consonants", "[]"))
-    guessed_vowels = json.loads(all_data.get("guessed_vowels", "[]"))
-    guessed_letters = json.loads(all_data.get("guessed_letters", "[]"))
-    scores = json.loads(all_data.get("scores", "{}"))
+    revealed = codec.decode_field(all_data.get("revealed"), [])
+    guessed_consonants = codec.decode_field(all_data.get("guessed_consonants"), [])
+    guessed_vowels = codec.decode_field(all_data.get("guessed_vowels"), [])
+    guessed_letters = codec.decode_field(all_data.get("guessed_letters"), [])
 
     data = {
         "puzzle": all_data.get("puzzle"),
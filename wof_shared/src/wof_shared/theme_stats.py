@@ -0,0 +1,140 @@
+"""Per-theme letter statistics precomputed from the puzzle corpus.
+
+Build step (re-run whenever puzzles.csv changes):
+
+    python -m wof_shared.theme_stats [path/to/puzzles.csv]
+
+writes the packaged asset assets/theme_stats.json. At runtime the asset is
+loaded once and strategies look up priors per theme without scanning the
+corpus. Themes with fewer than MIN_PUZZLES puzzles fall back to the global
+table ("_all").
+
+Asset layout (integer counts keep it compact and exact):
+
+    {"alphabet": "A..Z",
+     "themes": {"<theme>": {"n": puzzles,
+                            "letters": [26 counts],
+                            "by_len": {"<word length>": [words, 26 counts]},
+                            "endings": ["ING", "ER", ...]}}}
+"""
+import string
+import sys
+from collections import Counter
+from functools import lru_cache
+from importlib import resources as _resources
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import codec
+from .corpus import iter_puzzles
+
+ALPHABET = string.ascii_uppercase
+ALL_THEMES = "_all"
+ASSET_NAME = "theme_stats.json"
+MIN_PUZZLES = 10
+TOP_ENDINGS = 12
+
+
+def build_theme_stats(puzzles: Iterable[Tuple[str, str]], min_puzzles: int = MIN_PUZZLES) -> Dict:
+    """Aggregate letter counts, per-word-length counts and common endings per theme."""
+    acc: Dict[str, Dict] = {}
+
+    def _bucket(theme: str) -> Dict:
+        return acc.setdefault(theme, {"n": 0, "letters": Counter(), "by_len": {}, "endings": Counter()})
+
+    for puzzle, theme in puzzles:
+        for bucket in (_bucket(theme), _bucket(ALL_THEMES)):
+            bucket["n"] += 1
+            for word in puzzle.upper().split():
+                letters = [ch for ch in word if ch in ALPHABET]
+                if not letters:
+                    continue
+                bucket["letters"].update(letters)
+                words, counts = bucket["by_len"].setdefault(len(letters), [0, Counter()])
+                bucket["by_len"][len(letters)][0] = words + 1
+                counts.update(letters)
+                tail = "".join(letters)
+                for size in (2, 3):
+                    if len(tail) > size:
+                        bucket["endings"][tail[-size:]] += 1
+
+    themes = {}
+    for theme, bucket in acc.items():
+        if theme != ALL_THEMES and bucket["n"] < min_puzzles:
+            continue
+        themes[theme] = {
+            "n": bucket["n"],
+            "letters": [bucket["letters"][ch] for ch in ALPHABET],
+            "by_len": {
+                str(length): [words] + [counts[ch] for ch in ALPHABET]
+                for length, (words, counts) in sorted(bucket["by_len"].items())
+            },
+            "endings": [e for e, _ in bucket["endings"].most_common(TOP_ENDINGS)],
+        }
+    return {"alphabet": ALPHABET, "themes": themes}
+
+
+@lru_cache(maxsize=1)
+def load_theme_stats() -> Dict:
+    """Load the packaged table once per process; empty tables if it was never built."""
+    try:
+        raw = _resources.files("wof_shared.assets").joinpath(ASSET_NAME).read_text()
+    except (FileNotFoundError, OSError):
+        return {"alphabet": ALPHABET, "themes": {}}
+    return codec.loads(raw)
+
+
+def _theme_table(theme: Optional[str]) -> Optional[Dict]:
+    themes = load_theme_stats().get("themes", {})
+    return themes.get(theme or "") or themes.get(ALL_THEMES)
+
+
+def letter_frequencies(theme: Optional[str] = None) -> Dict[str, float]:
+    """Relative frequency of each letter among all letters in `theme` puzzles."""
+    table = _theme_table(theme)
+    if not table:
+        return {}
+    total = sum(table["letters"]) or 1
+    return {ch: cnt / total for ch, cnt in zip(ALPHABET, table["letters"])}
+
+
+def expected_count(theme: Optional[str], letter: str, word_lengths: Iterable[int]) -> float:
+    """Expected occurrences of `letter` across words of the given lengths."""
+    table = _theme_table(theme)
+    if not table:
+        return 0.0
+    idx = ALPHABET.find((letter or "").upper())
+    if idx < 0:
+        return 0.0
+    total = 0.0
+    for length in word_lengths:
+        row = table["by_len"].get(str(length))
+        if row and row[0]:
+            total += row[1 + idx] / row[0]
+    return total
+
+
+def common_endings(theme: Optional[str] = None) -> List[str]:
+    table = _theme_table(theme)
+    return list(table["endings"]) if table else []
+
+
+def letter_order(theme: Optional[str], letters: Iterable[str]) -> List[str]:
+    """`letters` ordered by descending frequency for `theme` (stable for ties/unknowns)."""
+    freqs = letter_frequencies(theme)
+    letters = list(letters)
+    return sorted(letters, key=lambda ch: -freqs.get(ch.upper(), 0.0))
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    csv_path = argv[0] if argv else None
+    out_path = Path(argv[1]) if len(argv) > 1 else Path(__file__).resolve().parent / "assets" / ASSET_NAME
+    stats = build_theme_stats(iter_puzzles(csv_path))
+    out_path.write_text(codec.dumps(stats), encoding="utf-8")
+    print(f"Wrote {len(stats['themes'])} theme tables to {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
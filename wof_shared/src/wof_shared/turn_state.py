@@ -0,0 +1,238 @@
+"""Per-turn game state: one Redis read, in-memory changes, one write-back.
+
+An AI turn used to read the game field by field (`get_field("puzzle")`,
+`get_field("scores")`, ...) from every tool. A TurnState is loaded once per
+turn (HGETALL of the game hash plus the secret answer, in one pipeline) and
+travels between the sequential tools as the `"state"` entry of their JSON
+outputs (`payload()` / `from_input()`); the answer never leaves the process.
+
+Changes (scores, guesses, reveals, finishing the game) apply to the in-memory
+copy immediately and are recorded; `commit()` replays them against the latest
+stored state in one WATCH/MULTI transaction (see state._transact), so a tool
+costs O(1) round trips however many fields it touches. Events queued with
+`log()` go to the game's event log in that same transaction.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import codec, keys, metrics, state
+from .constants import STATUS_ACTIVE, STATUS_FINISHED, VOWELS
+from .redis_client import get_game_redis
+
+# Answers of recently loaded games, so downstream tools rebuilt from a payload
+# can reveal letters without another read (answers never leave the process)
+_ANSWERS: "OrderedDict[str, str]" = OrderedDict()
+MAX_CACHED_ANSWERS = 4096
+
+
+def _remember_answer(game_id: str, answer: Optional[str]) -> None:
+    if answer is None:
+        return
+    _ANSWERS[game_id] = answer
+    _ANSWERS.move_to_end(game_id)
+    while len(_ANSWERS) > MAX_CACHED_ANSWERS:
+        _ANSWERS.popitem(last=False)
+
+
+class TurnState:
+    def __init__(self, game_id: Optional[str], game: Dict[str, Any], answer: Optional[str] = None):
+        self.game_id = str(game_id) if game_id else None
+        self.game = game
+        self._answer = answer
+        self._ops: List[Tuple[str, tuple]] = []
+        self._events: List[Dict[str, Any]] = []
+
+    @classmethod
+    def load(cls, game_id=None) -> Optional["TurnState"]:
+        """Read the game hash and answer in one round trip; None when the game does not exist."""
+        game_id = game_id or state._get_game_id()
+        if not game_id:
+            return None
+        pipe = get_game_redis(game_id).pipeline(transaction=False)
+        pipe.hgetall(keys.game_key(game_id))
+        pipe.get(keys.answer_key(game_id))
+        raw, answer = pipe.execute()
+        if not raw:
+            return None
+        _remember_answer(str(game_id), answer)
+        return cls(game_id, dict(codec.decode_game(raw)), answer)
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> Optional["TurnState"]:
+        if not isinstance(payload, dict) or not payload.get("game_id"):
+            return None
+        game = {k: v for k, v in payload.items() if k != "game_id"}
+        for field, default in codec.JSON_FIELDS.items():
+            game[field] = codec.decode_field(game.get(field), type(default)())
+        return cls(payload["game_id"], game)
+
+    @classmethod
+    def from_input(cls, data: Dict[str, Any]) -> "TurnState":
+        """State carried in a tool's input (`data["state"]`), else loaded from Redis.
+
+        Returns an empty, non-committing state when there is no game.
+        """
+        turn = cls.from_payload(data.get("state")) if isinstance(data, dict) else None
+        return turn or cls.load() or cls(None, {})
+
+    def payload(self) -> Dict[str, Any]:
+        """JSON-ready copy for the next tool's input (no answer)."""
+        return {**self.game, "game_id": self.game_id}
+
+    # --- Reads ---
+
+    def get(self, field: str, default: Any = None) -> Any:
+        value = self.game.get(field)
+        return default if value is None else value
+
+    @property
+    def answer(self) -> Optional[str]:
+        if self._answer is None and self.game_id:
+            self._answer = _ANSWERS.get(self.game_id)
+            if self._answer is None:
+                with state.use_game(self.game_id):
+                    self._answer = state.get_answer()
+                _remember_answer(self.game_id, self._answer)
+        return self._answer
+
+    @property
+    def version(self) -> int:
+        return int(self.game.get("version") or 0)
+
+    @property
+    def active(self) -> bool:
+        return self.get("status") == STATUS_ACTIVE
+
+    def score(self, player: str) -> int:
+        return int((self.get("scores", {}) or {}).get(player, 0) or 0)
+
+    def guessed(self) -> List[str]:
+        return list(self.get("guessed_consonants", [])) + list(self.get("guessed_vowels", []))
+
+    def remaining_vowels(self) -> List[str]:
+        guessed = self.get("guessed_vowels", [])
+        return [v for v in VOWELS if v not in guessed]
+
+    def display_name(self, player_id: str) -> str:
+        names = self.get("players", {})
+        if isinstance(names, dict) and names.get(player_id):
+            return names[player_id]
+        with state.use_game(self.game_id):
+            return state.resolve_display_name(player_id)
+
+    # --- Changes (applied now, written by commit) ---
+
+    def add_score(self, player: str, delta: int) -> None:
+        self._record("score", player, int(delta))
+
+    def add_guess(self, letter: str, is_vowel: bool) -> None:
+        self._record("guess", (letter or "").upper(), bool(is_vowel))
+
+    def reveal(self, letter: str) -> int:
+        """Reveal `letter`; returns the number of newly revealed cells."""
+        return self._record("reveal", (letter or "").upper())
+
+    def finish(self, winner: str) -> None:
+        """Mark the game finished with `winner` and reveal the whole puzzle."""
+        self._record("finish", winner)
+
+    def log(self, action: str, player: str, **fields) -> None:
+        """Queue an AI action event for the game's event log (written by commit)."""
+        self._events.append(state.make_event(action, player, "ai", **fields))
+
+    def _record(self, op: str, *args):
+        self._ops.append((op, args))
+        return self._apply(self.game, op, args)[1]
+
+    def _apply(self, game: Dict[str, Any], op: str, args: tuple) -> Tuple[Dict[str, Any], Any]:
+        """Apply one change to `game` in place; returns (changed fields, result)."""
+        if op == "score":
+            player, delta = args
+            scores = dict(game.get("scores") or {})
+            scores[player] = int(scores.get(player, 0) or 0) + delta
+            game["scores"] = scores
+            return {"scores": scores}, None
+        if op == "guess":
+            letter, is_vowel = args
+            field = "guessed_vowels" if is_vowel else "guessed_consonants"
+            guessed = list(game.get(field) or [])
+            if not letter or letter in guessed:
+                return {}, None
+            game[field] = guessed + [letter]
+            return {field: game[field]}, None
+        answer = self.answer or ""
+        if op == "reveal":
+            (letter,) = args
+            revealed = list(game.get("revealed") or [])
+            newly = [i for i, ch in enumerate(answer.upper()) if letter and ch == letter and i not in revealed]
+            if not newly:
+                return {}, 0
+            revealed = sorted(revealed + newly)
+        else:  # finish
+            (winner,) = args
+            revealed = list(range(len(answer)))
+            game["status"] = STATUS_FINISHED
+            game["winner"] = winner
+        game["revealed"] = revealed
+        game["puzzle"] = state._mask_from_answer_and_revealed(answer, revealed)
+        if op == "reveal":
+            return {"revealed": revealed, "puzzle": game["puzzle"]}, len(newly)
+        return {k: game[k] for k in ("revealed", "puzzle", "status", "winner")}, None
+
+    def commit(self) -> bool:
+        """Write pending changes in one transaction; False when there was nothing to write."""
+        if not (self._ops or self._events) or not self.game_id:
+            return False
+        ops, self._ops = self._ops, []
+        events, self._events = self._events, []
+
+        finishing = any(op == "finish" for op, _ in ops)
+
+        def _replay(fresh):
+            fresh = dict(fresh)
+            # Only a finish that ends a still-open game counts toward game durations
+            ends_game = finishing and fresh.get("status") != STATUS_FINISHED
+            changes: Dict[str, Any] = {}
+            for op, args in ops:
+                changes.update(self._apply(fresh, op, args)[0])
+            return changes, (fresh, bool(changes), ends_game)
+
+        fresh, written, ends_game = state._transact(
+            _replay, default=(None, False, False), game_id=self.game_id, events=events
+        )
+        if written and finishing:
+            state._remove_active(self.game_id)
+        if written and ends_game:
+            metrics.observe_game_finished(fresh.get("started_at"))
+        if fresh is not None:
+            if written:
+                fresh["version"] = str(int(fresh.get("version") or 0) + 1)
+            self.game = fresh
+        return written
+
+
+def build_ai_player_payload(player: Optional[str] = None, turn: Optional[TurnState] = None) -> Optional[Dict[str, Any]]:
+    """AI workflow input for the pinned/current game, from one pipelined read.
+
+    Same fields the old prompt.json carried (puzzle, theme, status, guessed
+    letters, scores, player), plus the snapshot as "state" so the tools do not
+    read the game again. `player` defaults to whoever's turn it is. None when
+    there is no game.
+    """
+    turn = turn or TurnState.load()
+    if turn is None:
+        return None
+    # Games from before guessed_consonants stored every letter in 'guessed_letters'
+    consonants = turn.get("guessed_consonants") or [
+        c for c in codec.decode_field(turn.get("guessed_letters"), []) if c.upper() not in VOWELS
+    ]
+    return {
+        "puzzle": turn.get("puzzle"),
+        "theme": turn.get("theme"),
+        "status": turn.get("status"),
+        "guessed_letters": consonants,
+        "guessed_vowels": turn.get("guessed_vowels", []),
+        "scores": turn.get("scores") or {"AI1": 0, "AI2": 0, "Human": 0},
+        "player": player or turn.get("player"),
+        "state": turn.payload(),
+    }
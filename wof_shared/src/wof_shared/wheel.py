@@ -1,5 +1,14 @@
+from functools import lru_cache
 from importlib import resources as _resources
 import random
+from typing import Tuple
+
+
+@lru_cache(maxsize=1)
+def wheel_wedges() -> Tuple[str, ...]:
+    """All wedges from packaged assets/wheel.txt (read once; duplicates encode weight)."""
+    lines = _resources.files("wof_shared.assets").joinpath("wheel.txt").read_text().splitlines()
+    return tuple(ln.strip() for ln in lines if ln.strip())
 
 
 def spin_wheel() -> str:
@@ -9,6 +18,4 @@ def spin_wheel() -> str:
     "BANKRUPT" or "LOSE A TURN". Caller is responsible for interpreting
     the outcome (e.g., bankruptcy or losing a turn).
     """
-    lines = _resources.files("wof_shared.assets").joinpath("wheel.txt").read_text().splitlines()
-    lines = [ln.strip() for ln in lines if ln.strip()]
-    return random.choice(lines)
+    return random.choice(list(wheel_wedges()))
@@ -1,3 +1,5 @@
+import sys
+
 import pytest
 import fakeredis
 
@@ -11,12 +13,18 @@ def redis_client():
 def _patch_shared_redis(monkeypatch, redis_client):
     # Patch wof_shared.redis_client.get_redis to return our fake client
     import wof_shared.redis_client as rc
+    import wof_shared.state  # noqa: F401  (ensure loaded so its bound name is patched too)
 
     def _get():
         return redis_client
 
-    monkeypatch.setattr(rc, "get_redis", _get, raising=True)
-    # Clear DB before each test for isolation
+    real_get = rc.get_redis
+    # Modules (and tests) bind get_redis at import via `from ... import get_redis`; patch every copy
+    for mod in list(sys.modules.values()):
+        if getattr(mod, "get_redis", None) is real_get:
+            monkeypatch.setattr(mod, "get_redis", _get, raising=True)
+    # Clear DB (and process-local caches of it) before each test for isolation
     redis_client.flushdb()
+    wof_shared.state.invalidate_player_names()
     yield
     redis_client.flushdb()
@@ -0,0 +1,63 @@
+import json
+import pytest
+from wof_shared import keys
+from wof_shared.redis_client import get_redis
+from wof_shared import actions
+from wof_shared.state import get_field
+
+
+def seed_game(answer: str = "STEAK KNIFE", scores=None):
+    r = get_redis()
+    r.set("current_game_id", "1")
+    r.hset(keys.game_key(1), mapping={
+        "puzzle": "_ _ _ _ _ * _ _ _ _ _",
+        "theme": "Thing",
+        "player": "Human",
+        "status": "active",
+        "winner": "",
+        "guessed_consonants": json.dumps([]),
+        "guessed_vowels": json.dumps([]),
+        "revealed": json.dumps([]),
+        "scores": json.dumps(scores or {"AI1": 0, "AI2": 0, "Human": 0}),
+    })
+    r.set(keys.answer_key(1), answer)
+
+
+def test_spin_hit_awards_wedge_times_occurrences():
+    seed_game()
+    result = actions.spin("Human", "k", wedge="500")
+    assert result["occurrences"] == 2
+    assert result["earned"] == 1000
+    assert result["end_turn"] is False
+    assert json.loads(get_field("scores"))["Human"] == 1000
+
+
+def test_spin_bankrupt_zeroes_score_and_ends_turn():
+    seed_game(scores={"AI1": 0, "AI2": 0, "Human": 700})
+    result = actions.spin("Human", "K", wedge="BANKRUPT")
+    assert result["end_turn"] is True
+    assert json.loads(get_field("scores"))["Human"] == 0
+
+
+def test_spin_rejects_vowel_and_repeat():
+    seed_game()
+    with pytest.raises(actions.InvalidMove):
+        actions.spin("Human", "E", wedge="500")
+    actions.spin("Human", "K", wedge="500")
+    with pytest.raises(actions.InvalidMove):
+        actions.spin("Human", "K", wedge="500")
+
+
+def test_buy_vowel_requires_funds():
+    seed_game()
+    result = actions.buy_vowel("Human", "E")
+    assert result["success"] is False
+    assert result["end_turn"] is False
+
+
+def test_solve_finishes_game():
+    seed_game()
+    result = actions.solve("Human", "steak knife")
+    assert result["success"] is True
+    assert get_field("status") == "finished"
+    assert get_field("puzzle") == "STEAK KNIFE"
@@ -0,0 +1,52 @@
+import io
+
+import pytest
+
+from wof_shared import actions, analytics, archive, state
+
+
+def play(theme, winner, bankrupt=False):
+    game_id = state.start_new_game("_ _ * _ _", "HI YO", theme, {"AI1": "Joe", "Human": "Rich"})
+    source = "ai" if winner == "AI1" else "human"
+    with state.use_game(game_id):
+        if bankrupt:
+            actions.spin(winner, "T", wedge="BANKRUPT", source=source)
+        actions.spin(winner, "H", wedge="500", source=source)
+        state.update_score(winner, 1000)
+        actions.buy_vowel(winner, "A", source=source)  # miss: ends the turn
+        actions.solve(winner, "HI YO", source=source)
+
+
+@pytest.fixture
+def records():
+    play("Thing", "AI1", bankrupt=True)
+    play("Thing", "Human")
+    play("Place", "AI1")
+    state.start_new_game("_ _", "GO", "Place", {"AI1": "Joe"})  # unfinished
+    out = io.StringIO()
+    archive.export_games(out)
+    return list(archive.read_ndjson(out.getvalue().splitlines()))
+
+
+def test_report_numbers(records):
+    summary = analytics.aggregate(iter(records), use_numpy=False).to_dict()
+    assert summary["games"] == 4 and summary["finished"] == 3
+    thing = next(r for r in summary["turns_to_solve_by_theme"] if r["theme"] == "Thing")
+    assert thing["games"] == 2 and thing["mean_turns"] == 2.5 and thing["p90_turns"] == 3
+    assert summary["bankrupt_rate"] == 1 / 4
+    assert summary["vowel_hit_rate"] == 0.0 and summary["vowel_buys"] == 3
+    assert summary["win_rate"] == {"ai": 2 / 3, "human": 1 / 3}
+
+
+def test_numpy_and_python_aggregation_agree(records):
+    pytest.importorskip("numpy")
+    python = analytics.aggregate(iter(records), use_numpy=False, chunk_size=2).to_dict()
+    assert analytics.aggregate(iter(records), use_numpy=True, chunk_size=2).to_dict() == python
+
+
+def test_cli_prints_tables(records, tmp_path, capsys):
+    path = tmp_path / "games.ndjson"
+    path.write_text("\n".join(map(analytics.codec.dumps, records)))
+    assert analytics.main([str(path)]) == 0
+    out = capsys.readouterr().out
+    assert "Thing" in out and "BANKRUPT per spin" in out and "25.0%" in out
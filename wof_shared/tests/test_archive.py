@@ -0,0 +1,52 @@
+import io
+
+from wof_shared import actions, archive, keys, state
+from wof_shared.redis_client import get_redis
+
+
+def play_games(n):
+    ids = []
+    for _ in range(n):
+        game_id = state.start_new_game("_ _ * _ _", "HI YO", "Thing", {"AI1": "Joe", "Human": "Rich"})
+        with state.use_game(game_id):
+            actions.spin("Human", "H", wedge="500")
+            actions.solve("Human", "HI YO")
+        ids.append(str(game_id))
+    return ids
+
+
+def test_actions_append_events():
+    (game_id,) = play_games(1)
+    events = state.get_events(game_id)
+    assert [e["action"] for e in events] == ["spin", "solve"]
+    assert events[0]["earned"] == 500 and not events[0]["end_turn"]
+    assert events[1]["success"] and events[1]["source"] == "human"
+
+
+def test_export_import_round_trip_in_batches():
+    ids = play_games(7)
+    r = get_redis()
+    before = {gid: r.hgetall(keys.game_key(gid)) for gid in ids}
+
+    out = io.StringIO()
+    assert archive.export_games(out, batch=3) == 7
+    lines = out.getvalue().splitlines()
+    assert sorted(archive.read_ndjson(lines), key=lambda g: int(g["game_id"]))[0]["answer"] == "HI YO"
+
+    r.flushdb()
+    assert archive.import_games(archive.read_ndjson(lines), batch=2) == 7
+    assert {gid: r.hgetall(keys.game_key(gid)) for gid in ids} == before
+    assert [e["action"] for e in state.get_events(ids[-1])] == ["spin", "solve"]
+    assert int(r.get(keys.GAME_ID_COUNTER)) == max(int(g) for g in ids)
+
+
+def test_import_restores_active_index():
+    (done,) = play_games(1)
+    active = str(state.start_new_game("_ _", "GO", "Thing", {"AI1": "Joe"}))
+    out = io.StringIO()
+    archive.export_games(out)
+    r = get_redis()
+    r.flushdb()
+    r.sadd(keys.ACTIVE_GAMES, done)
+    archive.import_games(archive.read_ndjson(out.getvalue().splitlines()))
+    assert r.smembers(keys.ACTIVE_GAMES) == {active}
@@ -0,0 +1,40 @@
+from wof_shared.candidates import CandidateIndex
+
+CORPUS = [
+    ("STEAK KNIFE", "Thing"),
+    ("STEAM IRONS", "Thing"),
+    ("SPEAK UP", "Phrase"),
+    ("GREEN BEANS", "Food & Drink"),
+]
+CONSONANTS = list("RSTLNDHMCBPGYKFWVXZJQ")
+
+
+def test_candidates_filter_by_shape_revealed_and_absent_letters():
+    idx = CandidateIndex(CORPUS)
+    _, rows = idx.candidates("_ _ _ _ _ * _ _ _ _ _", [])
+    assert rows.size == 3  # three 5+5 answers
+    # K revealed at the end of word one -> only STEAK KNIFE fits
+    group, rows = idx.candidates("_ _ _ _ K * K _ _ _ _", ["K"])
+    assert [group["answers"][r] for r in rows] == ["STEAK KNIFE"]
+    # M guessed and absent rules out STEAM IRONS
+    group, rows = idx.candidates("S _ _ _ _ * _ _ _ _ S", ["S", "M"])
+    assert [group["answers"][r] for r in rows] == []
+
+
+def test_reveal_objective_prefers_most_frequent_hidden_letter():
+    idx = CandidateIndex(CORPUS)
+    # GREEN BEANS is the only 5+5 answer starting with G
+    assert idx.best_letter("G _ _ _ _ * _ _ _ _ _", ["G"], CONSONANTS) == "N"
+
+
+def test_entropy_objective_splits_candidates():
+    idx = CandidateIndex(CORPUS)
+    scores = idx.score_letters("_ _ _ _ _ * _ _ _ _ _", [], CONSONANTS, objective="entropy")
+    # K separates STEAK KNIFE from the others; Q appears nowhere so it carries no information
+    assert scores["K"] > 0
+    assert scores["Q"] == 0
+
+
+def test_no_candidates_returns_none():
+    idx = CandidateIndex(CORPUS)
+    assert idx.best_letter("_ _", [], CONSONANTS) is None
@@ -0,0 +1,29 @@
+import json
+from wof_shared import codec
+
+
+def test_dumps_is_compact_and_json_compatible():
+    out = codec.dumps({"scores": {"AI1": 5}, "letters": ["R", "S"]})
+    assert " " not in out
+    assert json.loads(out) == {"scores": {"AI1": 5}, "letters": ["R", "S"]}
+
+
+def test_decode_game_decodes_json_fields_once():
+    raw = {"puzzle": "_ * _", "scores": json.dumps({"AI1": 10}), "guessed_vowels": "[\"E\"]"}
+    snap = codec.decode_game(raw)
+    assert snap["scores"] == {"AI1": 10}
+    assert snap["guessed_vowels"] == ["E"]
+    # missing JSON fields fall back to empty containers
+    assert snap["revealed"] == [] and snap["players"] == {}
+    assert snap["puzzle"] == "_ * _"
+
+
+def test_encode_game_round_trips():
+    snap = {"status": "active", "scores": {"AI1": 0}, "revealed": [1, 2]}
+    assert codec.decode_game(codec.encode_game(snap)) == {**snap, "guessed_consonants": [], "guessed_vowels": [], "players": {}}
+
+
+def test_scores_of_accepts_string_or_dict():
+    assert codec.scores_of('{"AI1": 3}') == {"AI1": 3}
+    assert codec.scores_of({"AI1": 3}) == {"AI1": 3}
+    assert codec.scores_of(None) is None
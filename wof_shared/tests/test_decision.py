@@ -0,0 +1,61 @@
+import numpy as np
+
+from wof_shared.candidates import CandidateIndex
+from wof_shared.decision import decide, wedge_table
+
+CORPUS = [
+    ("STEAK KNIFE", "Thing"),
+    ("STEAM IRONS", "Thing"),
+    ("SPEAK UP", "Phrase"),
+    ("GREEN BEANS", "Food & Drink"),
+]
+
+
+def _decide(masked, guessed, money, **kwargs):
+    return decide(masked, guessed, money, index=CandidateIndex(CORPUS), rng=np.random.default_rng(0), **kwargs)
+
+
+def test_wedge_table_matches_wheel_file():
+    values, bankrupt, lose = wedge_table()
+    assert values.size == bankrupt.size == lose.size
+    assert bankrupt.sum() >= 1 and lose.sum() >= 1
+    assert (values[~(bankrupt | lose)] > 0).all()
+
+
+def test_single_candidate_with_big_prize_solves():
+    result = _decide("_ _ _ _ _ * _ _", [], 0, win_value=100000)
+    assert result["action"] == "solve"
+    assert result["answer"] == "SPEAK UP"
+    assert result["p_solve"] == 1.0
+
+
+def test_certain_answer_solves_at_default_win_value():
+    for money in (0, 3000):
+        result = _decide("_ _ _ _ _ * _ _", [], money, win_value=5000)
+        assert result["action"] == "solve"
+        assert result["ev"]["solve"] > result["ev"]["spin"]
+
+
+def test_vowel_does_not_beat_solving_a_likely_answer():
+    index = CandidateIndex([("CAT", "Animal"), ("COT", "Thing")])
+    result = decide("_ _ T", ["T"], 3000, theme="Animal", win_value=5000, index=index, rng=np.random.default_rng(0))
+    assert result["action"] == "solve" and result["answer"] == "CAT"
+    assert result["ev"]["buy_vowel"] < result["ev"]["solve"]
+
+
+def test_ambiguous_board_spins_and_skips_vowel_without_money():
+    result = _decide("_ _ _ _ _ * _ _ _ _ _", [], 0)
+    assert result["action"] == "spin"
+    assert "buy_vowel" not in result["ev"]
+    assert result["candidates"] == 3
+    assert result["letter"] in "STKNMRB"
+
+
+def test_vowel_considered_when_affordable():
+    result = _decide("_ _ _ _ _ * _ _ _ _ _", [], 1000)
+    assert "buy_vowel" in result["ev"]
+
+
+def test_unknown_board_defaults_to_spin():
+    result = _decide("_ _", [], 500)
+    assert result == {"action": "spin", "ev": {}, "letter": None, "answer": None, "p_solve": 0.0, "candidates": 0}
@@ -0,0 +1,22 @@
+from wof_shared import deck
+
+
+def test_permutation_is_a_bijection():
+    for n in (1, 2, 3, 17, 1000):
+        assert sorted(deck.permute(i, n, "seed") for i in range(n)) == list(range(n))
+    assert [deck.permute(i, 1000, "a") for i in range(10)] != [deck.permute(i, 1000, "b") for i in range(10)]
+
+
+def test_deal_covers_the_corpus_once_per_pass_then_reshuffles():
+    first = [deck.deal(50, "group1") for _ in range(50)]
+    assert sorted(first) == list(range(50))
+    assert deck.deck_status("group1") == {"size": 50, "epoch": 1, "dealt": 50}
+
+    second = [deck.deal(50, "group1") for _ in range(50)]
+    assert sorted(second) == list(range(50)) and second != first
+    assert deck.deck_status("group1")["epoch"] == 2
+
+    # Namespaces are independent; a corpus size change starts a new pass
+    deck.deal(50, "group2")
+    assert deck.deck_status("group2")["dealt"] == 1
+    assert 0 <= deck.deal(60, "group1") < 60 and deck.deck_status("group1")["size"] == 60
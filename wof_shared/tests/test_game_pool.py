@@ -0,0 +1,32 @@
+from wof_shared import game_pool, keys, state
+from wof_shared.redis_client import get_redis
+
+PLAYERS = {"AI1": "Joe", "AI2": "Jane", "Human": "Rich"}
+
+
+def make_puzzle():
+    return "_ _", "HI", "Thing"
+
+
+def test_refill_then_claim_activates_a_prepared_game():
+    assert game_pool.refill(3, make_puzzle) == 3
+    assert game_pool.refill(3, make_puzzle) == 0
+    first = int(get_redis().lindex(keys.READY_GAMES, 0))
+    assert get_redis().hget(keys.game_key(first), "status") == game_pool.STATUS_READY
+
+    game_id = game_pool.claim_game(PLAYERS)
+    assert game_id == first and game_pool.pool_size() == 2
+    assert get_redis().get(keys.CURRENT_GAME_ID) == str(game_id)
+    game = state.get_current_game()
+    assert game["status"] == "active" and game["player"] == "AI1" and game["puzzle"] == "_ _"
+    assert game["scores"] == {"AI1": 0, "AI2": 0, "Human": 0} and game["players"] == PLAYERS
+    assert state.get_answer() == "HI" and state.resolve_display_name("Human") == "Rich"
+
+
+def test_claim_skips_deleted_games_and_reports_empty_pool():
+    game_pool.refill(2, make_puzzle)
+    stale = get_redis().lindex(keys.READY_GAMES, 0)
+    get_redis().delete(keys.game_key(stale))
+    assert game_pool.claim_game(PLAYERS) == int(stale) + 1
+    assert not get_redis().exists(keys.game_key(stale))
+    assert game_pool.claim_game(PLAYERS) is None
@@ -0,0 +1,30 @@
+import json
+from wof_shared import keys
+from wof_shared.redis_client import get_redis
+from wof_shared.jobs import enqueue_ai_turn, pop_ai_turn, publish_ai_turn_result, wait_for_ai_turn
+from wof_shared.state import use_game, get_field, set_turn
+
+
+def test_enqueue_then_pop_round_trips_job():
+    job_id = enqueue_ai_turn(7, "AI2")
+    job = pop_ai_turn(timeout=1)
+    assert job == {"job_id": job_id, "game_id": "7", "player": "AI2"}
+    assert pop_ai_turn(timeout=1) is None
+
+
+def test_result_is_delivered_to_waiter():
+    publish_ai_turn_result("abc", {"success": True, "output": "{}"})
+    assert wait_for_ai_turn("abc", timeout=1) == {"success": True, "output": "{}"}
+
+
+def test_use_game_pins_state_helpers_to_game():
+    r = get_redis()
+    r.set("current_game_id", "1")
+    r.hset(keys.game_key(1), mapping={"player": "AI1", "scores": json.dumps({})})
+    r.hset(keys.game_key(2), mapping={"player": "AI1", "scores": json.dumps({})})
+    with use_game(2):
+        set_turn("Human")
+        assert get_field("player") == "Human"
+    # current game untouched; pin released
+    assert get_field("player") == "AI1"
+    assert r.hget(keys.game_key(2), "player") == "Human"
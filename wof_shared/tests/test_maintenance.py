@@ -0,0 +1,74 @@
+import time
+
+from wof_shared import actions, game_pool, keys, maintenance, state
+from wof_shared.redis_client import get_redis
+
+
+def new_game(age=0.0):
+    game_id = str(state.start_new_game("_ _", "HI", "Thing", {"AI1": "Joe"}))
+    if age:
+        get_redis().hset(keys.game_key(game_id), "started_at", time.time() - age)
+    return game_id
+
+
+def test_active_index_follows_game_lifecycle():
+    game_id = new_game()
+    assert get_redis().smembers(keys.ACTIVE_GAMES) == {game_id}
+    with state.use_game(game_id):
+        actions.solve("AI1", "HI")
+    assert get_redis().smembers(keys.ACTIVE_GAMES) == set()
+
+
+def test_finish_stale_games_uses_last_event():
+    idle, busy = new_game(age=7200), new_game(age=7200)
+    with state.use_game(busy):
+        actions.spin("AI1", "H", wedge="500")
+    assert maintenance.finish_stale_games(3600, batch=1, dry_run=True)["stale"] == 1
+    counts = maintenance.finish_stale_games(3600, batch=1)
+    assert counts == {"scanned": 2, "stale": 1, "changed": 0, "unknown_age": 0}
+    with state.use_game(idle):
+        assert state.get_field("status") == "finished" and state.get_version() == 1
+    assert get_redis().smembers(keys.ACTIVE_GAMES) == {busy}
+
+
+def test_finish_stale_games_skips_games_that_moved_after_the_scan(monkeypatch):
+    spun, turned = new_game(age=7200), new_game(age=7200)
+    scan = maintenance.iter_game_meta
+
+    def moves_after_scan(*args):
+        for client, metas in scan(*args):
+            with state.use_game(spun):
+                actions.spin("AI1", "H", wedge="500")
+            with state.use_game(turned):
+                state.set_turn("AI1")
+            yield client, metas
+
+    monkeypatch.setattr(maintenance, "iter_game_meta", moves_after_scan)
+    counts = maintenance.finish_stale_games(3600)
+    assert counts == {"scanned": 2, "stale": 2, "changed": 2, "unknown_age": 0}
+    for game_id in (spun, turned):
+        assert get_redis().hget(keys.game_key(game_id), "status") == "active"
+    assert get_redis().smembers(keys.ACTIVE_GAMES) == {spun, turned}
+
+
+def test_purge_keeps_recent_and_pool_games():
+    old, recent = new_game(age=90000), new_game()
+    ready = str(game_pool.prepare_game("_ _", "GO", "Thing"))
+    get_redis().hset(keys.game_key(ready), "started_at", 0)
+    assert maintenance.purge_games(86400)["purged"] == 1
+    r = get_redis()
+    assert not r.exists(keys.game_key(old), keys.answer_key(old))
+    assert r.exists(keys.game_key(recent)) and r.exists(keys.game_key(ready))
+    assert r.smembers(keys.ACTIVE_GAMES) == {recent}
+
+
+def test_rebuild_active_index_and_memory_report():
+    active, done = new_game(), new_game()
+    get_redis().hset(keys.game_key(done), "status", "finished")
+    get_redis().sadd(keys.ACTIVE_GAMES, "999")
+    assert maintenance.rebuild_active_index(batch=1) == 1
+    assert get_redis().smembers(keys.ACTIVE_GAMES) == {active}
+
+    rows = {(row["pattern"], row["type"]): row for row in maintenance.memory_report()}
+    assert rows[("game:{*}", "hash")]["keys"] == 2
+    assert rows[("game:{*}:answer", "string")]["keys"] == 2
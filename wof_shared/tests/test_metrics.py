@@ -0,0 +1,33 @@
+from wof_shared import metrics
+
+
+def test_counters_and_histograms_render_as_prometheus_text(tmp_path):
+    registry = metrics.Registry()
+    turns = registry.counter("t_turns_total", "Turns.", ("action",))
+    turns.labels("spin").inc()
+    turns.labels("spin").inc(2)
+    latency = registry.histogram("t_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+    registry.register_collector(lambda: [("t_events_total", "counter", "Events.", [({"event": 'a"b'}, 4)])])
+
+    text = registry.render()
+    assert '# TYPE t_turns_total counter\nt_turns_total{action="spin"} 3' in text
+    assert 't_seconds_bucket{le="0.1"} 1\nt_seconds_bucket{le="1"} 2\nt_seconds_bucket{le="+Inf"} 3' in text
+    assert "t_seconds_sum 5.55\nt_seconds_count 3" in text
+    assert 't_events_total{event="a\\"b"} 4' in text
+    assert registry.counter("t_turns_total", "Turns.", ("action",)) is turns
+
+
+def test_redis_commands_are_tallied_per_block(tmp_path):
+    before = metrics.REDIS_COMMANDS.labels().value
+    with metrics.track_redis_commands() as cell:
+        metrics.count_redis(3)
+        metrics.count_redis()
+    metrics.count_redis()
+    assert cell == [4] and metrics.REDIS_COMMANDS.labels().value == before + 5
+
+    assert metrics.wedge_outcome("LOSE A TURN") == "lose_a_turn" and metrics.wedge_outcome("650") == "money"
+    path = tmp_path / "metrics.prom"
+    metrics.dump(str(path))
+    assert "wof_redis_commands_total" in path.read_text()
@@ -0,0 +1,51 @@
+from wof_shared import keys, state
+from wof_shared.redis_client import get_redis
+
+
+def test_names_are_cached_until_a_write_bumps_the_version(monkeypatch):
+    game_id = state.start_new_game("_ _", "HI", "Thing", {"AI1": "Joe", "AI2": "Jane", "Human": "Rich"})
+    r = get_redis()
+    with state.use_game(game_id):
+        assert state.resolve_display_name("AI1") == "Joe"
+        # A raw write without a version bump is not seen: the lookup is served locally
+        r.hset(keys.PLAYER_NAMES, "Human", "Ann")
+        r.hdel(keys.game_key(game_id), "players")
+        assert state.resolve_display_name("Human") == "Rich"
+
+        state.set_player_names({"AI1": "Max"})
+        assert state.resolve_display_name("AI1") == "Max"
+        assert state.get_player_names()["Human"] == "Ann"
+
+        # Another process bumps the version: picked up once the TTL has passed
+        monkeypatch.setattr(state, "NAMES_CACHE_TTL", 0.0)
+        r.hset(keys.PLAYER_NAMES, "AI2", "Kim")
+        r.incr(keys.PLAYER_NAMES_VERSION)
+        assert state.resolve_display_name("AI2") == "Kim"
+    assert state.resolve_display_name("Nobody") == "Nobody"
+
+
+def test_starting_a_game_keeps_other_games_cached_and_the_cache_is_bounded(monkeypatch):
+    players = {"AI1": "Joe", "AI2": "Jane", "Human": "Rich"}
+    first = state.start_new_game("_ _", "HI", "Thing", players)
+    r = get_redis()
+    with state.use_game(first):
+        assert state.resolve_display_name("AI1") == "Joe"
+    assert state.resolve_display_name("AI1") == "Joe"
+    version = r.get(keys.PLAYER_NAMES_VERSION)
+    second = state.start_new_game("_ _", "HO", "Thing", {**players, "AI1": "Zed"})
+    assert r.get(keys.PLAYER_NAMES_VERSION) != version
+    monkeypatch.setattr(state, "NAMES_CACHE_TTL", 0.0)
+    assert state.resolve_display_name("AI1") == "Zed"
+    version = r.get(keys.PLAYER_NAMES_VERSION)
+    state.start_new_game("_ _", "HA", "Thing", {**players, "AI1": "Zed"})
+    # Same names as the stored defaults: no version bump
+    assert r.get(keys.PLAYER_NAMES_VERSION) == version
+    # The unpinned scope still follows current_game_id
+    r.hset(keys.game_key(r.get(keys.CURRENT_GAME_ID)), "players", '{"AI1": "Max"}')
+    assert state.resolve_display_name("AI1") == "Max"
+
+    monkeypatch.setattr(state, "MAX_CACHED_NAMES", 2)
+    for game_id in (first, second, "999"):
+        with state.use_game(game_id):
+            state.resolve_display_name("AI1")
+    assert list(state._names_cache) == [str(second), "999"]
@@ -0,0 +1,35 @@
+import asyncio
+import pstats
+import tracemalloc
+
+from wof_shared.profiling import ProfilingConfig, profiled, profiled_from
+
+
+async def work(x: str) -> str:
+    return "".join(sorted(x * 100))
+
+
+def test_disabled_returns_function_unchanged(tmp_path):
+    assert profiled(work, "work") is work
+    assert profiled(work, "work", str(tmp_path), sample_rate=0) is work
+
+
+def test_sampled_calls_write_captures_and_rotate(tmp_path):
+    fn = profiled(work, "work", str(tmp_path), sample_rate=1.0, memory=True, keep=2)
+    for _ in range(4):
+        assert asyncio.run(fn("ba")) == "a" * 100 + "b" * 100
+
+    stats = sorted(tmp_path.glob("work-*.pstats"))
+    snapshots = sorted(tmp_path.glob("work-*.tracemalloc"))
+    assert len(stats) == 2 and len(snapshots) == 2
+    assert pstats.Stats(str(stats[-1])).total_calls > 0
+    tracemalloc.Snapshot.load(str(snapshots[-1]))
+    assert not tracemalloc.is_tracing()
+
+
+def test_profiled_from_reads_the_config_mixin(tmp_path):
+    assert profiled_from(ProfilingConfig(), work, "work") is work
+    fn = profiled_from(ProfilingConfig(profile_dir=str(tmp_path), profile_sample_rate=1.0), work, "work")
+    asyncio.run(fn("a"))
+    assert len(list(tmp_path.glob("work-*.pstats"))) == 1
+    assert not list(tmp_path.glob("work-*.tracemalloc"))
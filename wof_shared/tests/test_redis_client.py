@@ -0,0 +1,70 @@
+import redis
+import pytest
+import wof_shared.redis_client as rc
+
+
+@pytest.fixture
+def fresh_pool():
+    rc.get_pool.cache_clear()
+    yield
+    rc.get_pool.cache_clear()
+
+
+def test_pool_reads_settings_from_env(monkeypatch, fresh_pool):
+    monkeypatch.setenv("REDIS_HOST", "redis.internal")
+    monkeypatch.setenv("REDIS_PORT", "6380")
+    monkeypatch.setenv("REDIS_DB", "3")
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "8")
+    monkeypatch.setenv("REDIS_SOCKET_TIMEOUT", "2.5")
+    monkeypatch.setenv("REDIS_HEALTH_CHECK_INTERVAL", "10")
+    pool = rc.get_pool()
+    assert pool.max_connections == 8
+    kw = pool.connection_kwargs
+    assert (kw["host"], kw["port"], kw["db"]) == ("redis.internal", 6380, 3)
+    assert kw["socket_timeout"] == 2.5
+    assert kw["health_check_interval"] == 10
+    assert kw["socket_keepalive"] is True
+
+
+def test_unix_socket_transport(monkeypatch, fresh_pool):
+    monkeypatch.setenv("REDIS_UNIX_SOCKET", "/tmp/redis.sock")
+    pool = rc.get_pool()
+    assert pool.connection_class is redis.UnixDomainSocketConnection
+    stats = rc.pool_stats()
+    assert stats["transport"] == "unix"
+    assert stats["target"] == "/tmp/redis.sock"
+
+
+def test_pool_stats_counts_connections(fresh_pool):
+    stats = rc.pool_stats()
+    assert stats["created_connections"] == 0
+    assert stats["in_use_connections"] == 0
+    assert stats["max_connections"] == 64
+
+
+def test_shards_and_cluster_share_the_connection_settings(monkeypatch, fresh_pool):
+    monkeypatch.setenv("REDIS_SOCKET_TIMEOUT", "2.5")
+    monkeypatch.setenv("REDIS_HEALTH_CHECK_INTERVAL", "10")
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "8")
+    monkeypatch.setenv("REDIS_SHARDS", "redis://node-a:6379/0,redis://node-b:6379/1")
+    rc.get_shards.cache_clear()
+    try:
+        shards = rc.get_shards()
+        for shard in shards:
+            kw = shard.connection_pool.connection_kwargs
+            assert kw["socket_timeout"] == 2.5 and kw["health_check_interval"] == 10
+            assert kw["socket_keepalive"] is True
+            assert shard.connection_pool.max_connections == 8
+        stats = rc.pool_stats()
+        assert [s["target"] for s in stats["shards"]] == ["node-a:6379", "node-b:6379"]
+        assert [s["db"] for s in stats["shards"]] == [0, 1]
+    finally:
+        monkeypatch.delenv("REDIS_SHARDS")
+        rc.get_shards.cache_clear()
+
+    created = {}
+    monkeypatch.setattr(rc, "MeteredRedisCluster", lambda **kwargs: created.update(kwargs))
+    rc._cluster_client()
+    assert created["max_connections"] == 8
+    assert created["socket_timeout"] == 2.5 and created["health_check_interval"] == 10
+    assert created["socket_keepalive"] is True and created["decode_responses"] is True
@@ -0,0 +1,117 @@
+import time
+
+import pytest
+
+from wof_shared import keys, state
+from wof_shared.redis_client import get_redis
+
+
+def new_game():
+    return state.start_new_game("_ _", "HI", "Thing", {"AI1": "Joe", "AI2": "Jane", "Human": "Rich"})
+
+
+def test_conflicting_write_is_retried_against_fresh_state():
+    game_id = new_game()
+    before = dict(state.CONCURRENCY_STATS)
+    calls = []
+
+    def _add(game):
+        calls.append(game["scores"]["AI1"])
+        if len(calls) == 1:
+            # Another orchestrator commits between our read and our write
+            get_redis().hset(keys.game_key(game_id), "scores", '{"AI1": 500, "AI2": 0, "Human": 0}')
+        scores = dict(game["scores"], AI1=game["scores"]["AI1"] + 100)
+        return {"scores": scores}, scores["AI1"]
+
+    with state.use_game(game_id):
+        assert state._transact(_add) == 600
+        assert state.get_version() == 1
+    assert calls == [0, 500]
+    assert state.CONCURRENCY_STATS["cas_conflicts"] == before["cas_conflicts"] + 1
+
+
+def test_updates_bump_version_and_advance_turn():
+    game_id = new_game()
+    with state.use_game(game_id):
+        state.update_score("AI1", 250)
+        state.add_guessed_letter("h", False)
+        assert state.reveal_letter("H") == 1
+        assert state.next_turn() == "AI2"
+        assert state.get_version() == 4
+        assert state.get_current_game()["puzzle"] == "H _"
+
+
+def test_missing_game_is_not_created():
+    with state.use_game("999"):
+        assert state.next_turn() is None
+    assert not get_redis().exists(keys.game_key("999"))
+
+
+def test_turn_lock_is_exclusive_and_expires():
+    game_id = new_game()
+    token = state.acquire_turn_lock(game_id, ttl=0.3)
+    assert token and state.acquire_turn_lock(game_id) is None
+    with pytest.raises(state.TurnLockTimeout):
+        with state.turn_lock(game_id, wait=0.01, poll=0.01):
+            pass
+    time.sleep(0.35)
+    with state.turn_lock(game_id, wait=0.01) as held:
+        # The expired holder can no longer release or renew someone else's lease
+        assert not state.release_turn_lock(game_id, token)
+        assert not state.renew_turn_lock(game_id, token)
+        assert state.renew_turn_lock(game_id, held)
+    assert not get_redis().exists(keys.lock_key(game_id))
+
+
+def test_bankrupt_and_vowel_purchase_are_versioned_writes():
+    from wof_shared import actions
+
+    game_id = new_game()
+    with state.use_game(game_id):
+        state.update_score("Human", 300)
+        assert state.spend_score("Human", 250) == (True, 300)
+        assert state.spend_score("Human", 250) == (False, 50)
+        actions.spin("Human", "K", wedge="BANKRUPT")
+        assert state.get_current_game()["scores"]["Human"] == 0
+        # update, spend, set (the short-funded spend writes nothing)
+        assert state.get_version() == 3
+
+
+def test_held_lease_is_renewed_until_released():
+    game_id = new_game()
+    with state.turn_lock(game_id, ttl=0.3) as token:
+        time.sleep(0.5)
+        # Past the original TTL, the heartbeat has kept the lease ours
+        assert get_redis().get(keys.lock_key(game_id)) == token
+        assert state.acquire_turn_lock(game_id) is None
+    assert not get_redis().exists(keys.lock_key(game_id))
+
+
+def test_async_lease_waits_for_the_holder():
+    import asyncio
+
+    game_id = new_game()
+
+    async def _take():
+        async with state.turn_lease(game_id, wait=0.05, poll=0.01):
+            pass
+
+    with state.turn_lock(game_id):
+        with pytest.raises(state.TurnLockTimeout):
+            asyncio.run(_take())
+    asyncio.run(_take())
+
+
+def test_field_writes_are_versioned_and_turns_pass_only_from_their_owner():
+    game_id = new_game()
+    with state.use_game(game_id):
+        state.set_turn("AI2")
+        state.update_game_field("theme", "Place")
+        state.reveal_all()
+        assert state.get_version() == 3
+        assert state.next_turn(expected="AI1") == "AI2"
+        assert state.get_version() == 3
+        assert state.next_turn(expected="AI2") == "Human"
+        state.set_current_game_status_finished()
+        assert state.get_version() == 5
+    assert str(game_id) not in get_redis().smembers(keys.ACTIVE_GAMES)
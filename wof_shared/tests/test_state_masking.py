@@ -1,4 +1,5 @@
 import json
+from wof_shared import keys
 from wof_shared.redis_client import get_redis
 from wof_shared.state import update_game_field, reveal_letter, reveal_all, get_field
 
@@ -6,7 +7,7 @@ from wof_shared.state import update_game_field, reveal_letter, reveal_all, get_f
 def seed_game(answer: str = "STEAK KNIFE"):
     r = get_redis()
     r.set("current_game_id", "1")
-    key = "game:1"
+    key = keys.game_key(1)
     r.hset(key, mapping={
         "puzzle": "",  # will be overwritten by reveal helpers
         "theme": "Thing",
@@ -18,7 +19,7 @@ def seed_game(answer: str = "STEAK KNIFE"):
         "scores": json.dumps({"AI1": 0, "AI2": 0, "Human": 0}),
     })
     # Store answer in secret key to match production behavior
-    r.set("game:1:answer", answer)
+    r.set(keys.answer_key(1), answer)
 
 
 def test_reveal_letter_updates_puzzle_and_count():
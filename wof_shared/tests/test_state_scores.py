@@ -1,4 +1,5 @@
 import json
+from wof_shared import keys
 from wof_shared.redis_client import get_redis
 from wof_shared.state import update_score, get_field
 
@@ -6,7 +7,7 @@ from wof_shared.state import update_score, get_field
 def seed_scores():
     r = get_redis()
     r.set("current_game_id", "1")
-    key = "game:1"
+    key = keys.game_key(1)
     r.hset(key, mapping={
         "scores": json.dumps({"AI1": 100, "AI2": 0, "Human": 0}),
     })
@@ -27,3 +28,14 @@ def test_update_score_initializes_missing_player():
     scores_raw = get_field("scores")
     scores = json.loads(scores_raw)
     assert scores["Human"] == 400
+
+
+def test_game_keys_share_a_hash_tag_slot():
+    from wof_shared import state
+
+    game_id = state.start_new_game("_ _", "HI", "Thing", {"AI1": "Joe", "AI2": "Jane", "Human": "Rich"})
+    r = get_redis()
+    assert r.exists(keys.game_key(game_id)) and r.get(keys.answer_key(game_id)) == "HI"
+    assert keys.game_key(game_id) == f"game:{{{game_id}}}"
+    assert keys.key_slot("123456789") == 12739  # Redis Cluster reference vector
+    assert keys.legacy_game_id("game:7:answer") == "7" and keys.legacy_game_id(keys.game_key(7)) is None
@@ -0,0 +1,26 @@
+from wof_shared import theme_stats
+
+
+def test_build_counts_letters_lengths_and_endings():
+    stats = theme_stats.build_theme_stats(
+        [("BAKING BREAD", "Food"), ("EATING CAKE", "Food"), ("JOHN", "Person")],
+        min_puzzles=2,
+    )
+    themes = stats["themes"]
+    # Person has only one puzzle: folded into the global table
+    assert set(themes) == {"Food", theme_stats.ALL_THEMES}
+    food = themes["Food"]
+    assert food["n"] == 2
+    assert food["letters"][theme_stats.ALPHABET.index("B")] == 2
+    words, *counts = food["by_len"]["6"]
+    assert words == 2  # BAKING, EATING
+    assert counts[theme_stats.ALPHABET.index("G")] == 2
+    assert food["endings"][0] in ("NG", "ING")
+    assert themes[theme_stats.ALL_THEMES]["n"] == 3
+
+
+def test_packaged_table_lookups():
+    freqs = theme_stats.letter_frequencies("Phrase")
+    assert abs(sum(freqs.values()) - 1.0) < 1e-9
+    assert theme_stats.letter_order("Phrase", ["Q", "T"]) == ["T", "Q"]
+    assert theme_stats.expected_count("Phrase", "E", [5]) > 0
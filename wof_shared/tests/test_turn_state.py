@@ -0,0 +1,80 @@
+from wof_shared import keys, metrics, state
+from wof_shared.redis_client import get_redis
+from wof_shared.turn_state import TurnState
+
+
+def new_game():
+    return state.start_new_game("_ _ * _ _", "HI YO", "Thing", {"AI1": "Joe", "AI2": "Jane", "Human": "Rich"})
+
+
+def test_changes_apply_locally_and_commit_once():
+    game_id = new_game()
+    turn = TurnState.load(game_id)
+    turn.add_score("AI1", -250)
+    assert turn.reveal("o") == 1
+    turn.add_guess("o", is_vowel=True)
+    assert turn.score("AI1") == -250 and turn.get("puzzle") == "_ _ * _ O"
+    assert get_redis().hget(keys.game_key(game_id), "puzzle") == "_ _ * _ _"
+
+    assert turn.commit() and not turn.commit()
+    with state.use_game(game_id):
+        game = state.get_current_game()
+        assert state.get_version() == 1 == turn.version
+    assert game["puzzle"] == "_ _ * _ O" and game["guessed_vowels"] == ["O"]
+
+
+def test_payload_round_trip_replays_on_fresh_state():
+    game_id = new_game()
+    turn = TurnState.from_input({"state": TurnState.load(game_id).payload()})
+    assert turn.remaining_vowels() == ["A", "E", "I", "O", "U"]
+    # Another writer changed the score after the snapshot was taken
+    with state.use_game(game_id):
+        state.update_score("AI1", 500)
+    turn.add_score("AI1", 100)
+    turn.finish(turn.display_name("AI1"))
+    turn.commit()
+    assert turn.score("AI1") == 600
+    assert turn.get("puzzle") == "H I * Y O" and turn.get("winner") == "Joe" and not turn.active
+
+
+def test_missing_game_yields_empty_state():
+    with state.use_game("999"):
+        turn = TurnState.from_input({})
+    turn.add_score("AI1", 100)
+    assert turn.game_id is None and not turn.commit()
+
+
+def test_logged_events_are_written_with_the_commit():
+    game_id = new_game()
+    turn = TurnState.load(game_id)
+    turn.log("spin", "AI1", wedge="LOSE A TURN", end_turn=True)
+    assert state.get_events(game_id) == []
+    turn.commit()
+    (event,) = state.get_events(game_id)
+    assert event["source"] == "ai" and event["wedge"] == "LOSE A TURN" and turn.version == 0
+
+
+def test_ai_player_payload_from_one_read():
+    from wof_shared.turn_state import build_ai_player_payload
+
+    game_id = new_game()
+    with state.use_game(game_id):
+        state.add_guessed_letter("H", is_vowel=False)
+        payload = build_ai_player_payload("AI2")
+    assert payload["player"] == "AI2" and payload["guessed_letters"] == ["H"]
+    assert payload["state"]["game_id"] == str(game_id) and "answer" not in payload["state"]
+    with state.use_game("999"):
+        assert build_ai_player_payload() is None
+
+
+def test_game_duration_recorded_only_when_commit_ends_the_game():
+    finished = metrics.GAME_SECONDS.labels()
+    game_id = new_game()
+    turn, late = TurnState.load(game_id), TurnState.load(game_id)
+    before = finished.count
+    turn.finish("Joe")
+    assert finished.count == before
+    assert turn.commit() and finished.count == before + 1
+    late.finish("Jane")
+    late.commit()
+    assert finished.count == before + 1